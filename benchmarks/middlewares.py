@@ -0,0 +1,83 @@
+"""
+Micro-benchmark of the middleware overhead: ASGI round trips against an in-process app, no network.
+
+The previous stack, a `BaseHTTPMiddleware` adding the secure headers and an `@app.middleware("http")` request logger
+reading every body, is rebuilt here for comparison. Run from the repository root:
+
+    python -m benchmarks.middlewares
+"""
+
+import asyncio
+import logging
+import time
+
+import secure
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.interface.wsgi.middlewares import request_logging
+from src.interface.wsgi.middlewares.setup import setup_middleware
+
+logger = logging.getLogger(__name__)
+
+
+class BaseHTTPSecureHeadersMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, secure_headers: secure.Secure) -> None:
+        super().__init__(app)
+        self.secure_headers = secure_headers
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        self.secure_headers.set_headers(response)
+        return response
+
+
+def setup_base_http_middleware(app: FastAPI) -> None:
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        if request.url.path not in ["/healthcheck", "/startup", "/readiness"]:
+            logger.debug(f"Endpoint called: {request.url.path}, Body: {await request.body()}")
+        return await call_next(request)
+
+    app.add_middleware(BaseHTTPSecureHeadersMiddleware, secure_headers=secure.Secure.with_default_headers())
+
+
+def build(setup=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/bench")
+    async def bench():
+        return PlainTextResponse("ok")
+
+    if setup is not None:
+        setup(app)
+    return app
+
+
+async def run(app: FastAPI, n: int = 5000, body: bytes = b"x" * 64_000) -> float:
+    scope = {"type": "http", "method": "POST", "path": "/bench", "query_string": b"", "headers": []}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+if __name__ == "__main__":
+    for label, setup, level in [
+        ("bare app", None, logging.INFO),
+        ("middlewares, INFO", setup_middleware, logging.INFO),
+        ("middlewares, DEBUG", setup_middleware, logging.DEBUG),
+        ("BaseHTTPMiddleware, INFO", setup_base_http_middleware, logging.INFO),
+    ]:
+        for bench_logger in (request_logging.logger, logger):
+            bench_logger.setLevel(level)
+            bench_logger.disabled = level != logging.DEBUG
+        print(f"{label:<26} {asyncio.run(run(build(setup))):8.1f} us/request")
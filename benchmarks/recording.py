@@ -0,0 +1,224 @@
+"""
+Benchmarks of the recording repository, all but `hydration` run against the database on temporary tables that
+shadow the real ones for their session. Run from the repository root:
+
+    python -m benchmarks.recording [participants|search [n_rows]]
+"""
+
+import json
+import random
+import sys
+from datetime import datetime, timezone
+from time import perf_counter
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.db import RecordingTable
+from src.db.engine import engines
+from src.repository.base import LIST_DEFAULT_LIMIT
+from src.repository.recording import RecordingRepository
+from src.schema.recording import RecordingSchema
+
+
+def hydration() -> None:
+    # trusted hydration of 10k rows vs the validating path (EmailStr checks every participant)
+    n_rows = 10_000
+    now = datetime.now(timezone.utc)
+    values = [
+        {
+            "id": f"recording_{i}",
+            "org_id": "org_1",
+            "deal_id": None,
+            "url": f"https://example.com/{i}.mp4",
+            "title": "Weekly sync",
+            "description": None,
+            "participants": [f"user_{i}@example.com", "sales@example.com", "lead@customer.com"],
+            "status": "completed",
+            "video_path": f"s3://recordings/org_1/recording_{i}.mp4",
+            "duration": 1834.5,
+            "meta": {},
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(n_rows)
+    ]
+    keys = list(values[0])
+    rows = [tuple(row.values()) for row in values]
+    db_records = [RecordingTable(**row) for row in values]
+
+    start = perf_counter()
+    validated = [RecordingSchema.model_validate(record) for record in db_records]
+    validate_s = perf_counter() - start
+
+    start = perf_counter()
+    trusted = RecordingSchema.from_rows(keys, rows)
+    trusted_s = perf_counter() - start
+
+    assert [model.model_dump_json() for model in validated] == [model.model_dump_json() for model in trusted]
+    print(f"model_validate: {validate_s:.3f}s ({validate_s / n_rows * 1e6:.1f}us/row)")
+    print(
+        f"from_rows:      {trusted_s:.3f}s ({trusted_s / n_rows * 1e6:.1f}us/row), {validate_s / trusted_s:.0f}x faster"
+    )
+
+
+def explain(db: Session, statement) -> str:
+    compiled = statement.compile(db.get_bind())
+    parameters = {
+        key: json.dumps(value) if isinstance(value, list) else value for key, value in compiled.params.items()
+    }
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {compiled}", parameters)
+    return "\n".join(row[0] for row in plan)
+
+
+def load_temporary_recordings(db: Session, rows_select: str, n_rows: int) -> None:
+    """
+    Fill a temporary `recording` table (same columns, generated ones included, and indexes) with the rows of
+    `rows_select`. It shadows the real table for the session only, nothing is written to the real one.
+    """
+    start = perf_counter()
+    db.execute(text("CREATE TEMPORARY TABLE recording (LIKE public.recording INCLUDING DEFAULTS INCLUDING GENERATED)"))
+    db.execute(
+        text(
+            f"INSERT INTO recording (id, org_id, url, title, description, participants, status, meta, created_at, "
+            f"updated_at) {rows_select}"
+        ),
+        {"n_rows": n_rows},
+    )
+    # the model's indexes, built after the load, resolve to the temporary table
+    db.execute(text("ALTER TABLE recording ADD PRIMARY KEY (id)"))
+    for index in RecordingTable.__table__.indexes:
+        index.create(db.connection())
+    db.execute(text("ANALYZE recording"))
+    print(f"{n_rows} rows loaded in {perf_counter() - start:.1f}s")
+
+
+def participants(n_rows: int = 5_000_000) -> None:
+    """`find_by_participant` on a synthetic `n_rows` table, with and without the participants GIN index."""
+
+    def time_pages(repository: RecordingRepository, org_id: str, email: str, pages: int = 5) -> tuple[float, int]:
+        rows, after = 0, None
+        start = perf_counter()
+        for _ in range(pages):
+            page = repository.find_by_participant(org_id, email, after=after)
+            rows += len(page.items)
+            after = page.next_cursor
+            if after is None:
+                break
+        return (perf_counter() - start) * 1000, rows
+
+    engines.register()
+    with engines.get().context_session() as db:
+        # 50 orgs of 100k recordings, 20k people, 3 participants per recording, one of them the org's sales rep
+        load_temporary_recordings(
+            db,
+            """
+            SELECT
+                'recording_' || g,
+                'org_' || (g % 50),
+                'https://example.com/' || g || '.mp4',
+                NULL,
+                NULL,
+                jsonb_build_array(
+                    'user_' || (g % 20000) || '@example.com',
+                    'user_' || ((g::bigint * 7919) % 20000) || '@example.com',
+                    'sales_' || (g % 50) || '@example.com'
+                ),
+                'completed',
+                '{}',
+                now() - g * interval '1 second',
+                now()
+            FROM generate_series(1, :n_rows) AS g
+            """,
+            n_rows,
+        )
+
+        repository = RecordingRepository(db)
+        # a person in a few hundred recordings of the org, and the sales rep in all of them
+        cases = [("org_7", "user_1007@example.com"), ("org_7", "sales_7@example.com")]
+        for org_id, email in cases:
+            print(f"\n--- {email} in {org_id}, with ix_recording_participants")
+            print(explain(db, repository._participant_statement(org_id, email, LIST_DEFAULT_LIMIT)))
+            with_index_ms, rows = time_pages(repository, org_id, email)
+            print(f"5 pages ({rows} rows): {with_index_ms:.1f}ms")
+
+        db.execute(text("DROP INDEX pg_temp.ix_recording_participants"))
+        for org_id, email in cases:
+            print(f"\n--- {email} in {org_id}, without ix_recording_participants")
+            print(explain(db, repository._participant_statement(org_id, email, LIST_DEFAULT_LIMIT)))
+            without_index_ms, rows = time_pages(repository, org_id, email)
+            print(f"5 pages ({rows} rows): {without_index_ms:.1f}ms")
+        db.rollback()
+
+
+def search(n_rows: int = 1_000_000) -> None:
+    """
+    `search` latency over the vocabulary of a synthetic org of `n_rows` recordings, whose words follow a skewed
+    distribution: from `word1` in ~80% of the recordings down to `word5000` in ~0.2%.
+    """
+    engines.register()
+    with engines.get().context_session() as db:
+        # titles of 1 word and descriptions of 25 drawn from 5000 words, the descriptions cycle through 50k sentences
+        load_temporary_recordings(
+            db,
+            """
+            WITH sentences AS MATERIALIZED (
+                SELECT s, (
+                    SELECT string_agg('word' || (1 + floor(5000 * power(random(), 3)))::int, ' ')
+                    FROM generate_series(1, 25 + 0 * s)
+                ) AS sentence
+                FROM generate_series(0, 49999) AS s
+            )
+            SELECT
+                'recording_' || g,
+                'org_1',
+                'https://example.com/' || g || '.mp4',
+                'Weekly sync word' || (1 + (g::bigint * 7919) % 5000),
+                sentence,
+                '[]',
+                'completed',
+                '{}',
+                now() - g * interval '1 second',
+                now()
+            FROM generate_series(1, :n_rows) AS g
+            JOIN sentences ON s = g % 50000
+            """,
+            n_rows,
+        )
+
+        repository = RecordingRepository(db)
+        random.seed(1)
+        workloads = {
+            "1 word": [f"word{i}" for i in range(1, 5001, 50)],
+            "2 words": [f"word{random.randint(1, 5000)} word{random.randint(1, 5000)}" for _ in range(50)],
+            "phrase": [f'"sync word{random.randint(1, 5000)}"' for _ in range(20)],
+        }
+        for name, queries in workloads.items():
+            timings = []
+            for query in queries:
+                repository.search("org_1", query)
+                start = perf_counter()
+                page = repository.search("org_1", query)
+                timings.append(((perf_counter() - start) * 1000, query, len(page.items)))
+            timings.sort()
+            p50, p95, worst = timings[len(timings) // 2], timings[int(len(timings) * 0.95)], timings[-1]
+            print(
+                f"{name:8} p50 {p50[0]:6.1f}ms  p95 {p95[0]:6.1f}ms  max {worst[0]:6.1f}ms "
+                f"({worst[1]!r}, {worst[2]} results)"
+            )
+
+        page = repository.search("org_1", "word300", limit=5)
+        print(f"\n--- word300, page 1: {[(item.id, round(item.rank, 4)) for item in page.items]}")
+        print(page.items[0].title_highlight, "|", page.items[0].description_highlight)
+        page = repository.search("org_1", "word300", limit=5, after=page.next_cursor)
+        print(f"--- word300, page 2: {[(item.id, round(item.rank, 4)) for item in page.items]}")
+        print(explain(db, repository._search_statement("org_1", "word300", LIST_DEFAULT_LIMIT)))
+        db.rollback()
+
+
+if __name__ == "__main__":
+    benchmarks = {"participants": participants, "search": search}
+    if sys.argv[1:2] and sys.argv[1] in benchmarks:
+        benchmarks[sys.argv[1]](*(int(arg) for arg in sys.argv[2:3]))
+    else:
+        hydration()
@@ -0,0 +1,90 @@
+"""
+Benchmark of the transcript chunks against the Recall.ai JSON kept in a recording's `meta`, on temporary tables that
+shadow the real ones for their session. Run from the repository root:
+
+    python -m benchmarks.transcript [hours]
+"""
+
+import json
+import random
+import sys
+from time import perf_counter
+
+from sqlalchemy import text
+
+from src.db.engine import engines
+from src.repository.transcript import TranscriptRepository
+from src.schema.transcript import recallai_segments
+
+
+def benchmark(hours: float = 3.0) -> None:
+    """
+    A synthetic `hours`-long meeting stored as Recall.ai JSON in a recording's `meta` against the transcript chunks:
+    size, and reading the whole transcript or one minute of it.
+    """
+
+    def timed(function, runs: int = 20) -> tuple[float, object]:
+        function()
+        start = perf_counter()
+        for _ in range(runs):
+            value = function()
+        return (perf_counter() - start) * 1000 / runs, value
+
+    random.seed(1)
+    vocabulary = [f"word{index}" for index in range(3000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    speakers = [f"Speaker {index}" for index in range(6)]
+    transcript, clock = [], 0.0
+    while clock < hours * 3600:
+        words = []
+        for word in random.choices(vocabulary, weights, k=random.randint(3, 60)):
+            words.append({"text": word, "start_time": round(clock, 3), "end_time": round(clock + 0.3, 3)})
+            clock += 0.4
+        transcript.append({"speaker": random.choice(speakers), "words": words})
+        clock += random.uniform(0.2, 2.0)
+    segments = recallai_segments(transcript)
+    document = json.dumps({"transcript": transcript})
+    print(f"{hours}h meeting: {len(segments)} segments, {sum(len(turn['words']) for turn in transcript)} words")
+
+    engines.register()
+    with engines.get().context_session() as db:
+        db.execute(text("CREATE TEMPORARY TABLE recording_meta (id text PRIMARY KEY, meta jsonb)"))
+        db.execute(
+            text("INSERT INTO recording_meta VALUES ('recording_1', CAST(:document AS jsonb))"), {"document": document}
+        )
+        db.execute(text("CREATE TEMPORARY TABLE transcript_chunk (LIKE public.transcript_chunk INCLUDING ALL)"))
+        meta_bytes = db.execute(text("SELECT pg_column_size(meta) FROM recording_meta")).scalar()
+
+        def from_meta(start: float = None, end: float = None) -> list:
+            meta = db.execute(text("SELECT meta FROM recording_meta WHERE id = 'recording_1'")).scalar()
+            return [
+                segment
+                for segment in recallai_segments(meta["transcript"])
+                if (start is None or segment.end > start) and (end is None or segment.start < end)
+            ]
+
+        meta_all_ms, _ = timed(from_meta, runs=5)
+        meta_minute_ms, minute = timed(lambda: from_meta(3600, 3660), runs=5)
+        print(f"meta jsonb:    {meta_bytes / 1024:7.0f}KB  all {meta_all_ms:6.1f}ms  1 minute {meta_minute_ms:6.1f}ms")
+
+        repository = TranscriptRepository(db)
+        for chunk_seconds in (60, 300, 900):
+            chunks = repository.save("recording_1", segments, chunk_seconds=chunk_seconds)
+            chunk_bytes = db.execute(
+                text("SELECT sum(pg_column_size(transcript_chunk.*)) FROM transcript_chunk")
+            ).scalar()
+            all_ms, everything = timed(lambda: repository.segments("recording_1"))
+            minute_ms, sliced = timed(lambda: repository.segments("recording_1", 3600, 3660))
+            assert everything == segments and sliced == minute
+            print(
+                f"{chunks:3} chunks of {chunk_seconds:3}s: {chunk_bytes / 1024:5.0f}KB  all {all_ms:6.1f}ms  "
+                f"1 minute {minute_ms:6.1f}ms"
+            )
+
+        streamed = sum(len(batch) for batch in repository.stream_segments("recording_1"))
+        assert streamed == len(segments)
+        db.rollback()
+
+
+if __name__ == "__main__":
+    benchmark(*(float(arg) for arg in sys.argv[1:2]))
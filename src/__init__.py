@@ -86,14 +86,40 @@ class ProjectEnvs(BaseSettings):
     ENV_STATE: str = os.environ.get("ENV_STATE", "LOCAL").upper()
     DD_AGENT_HOST: str = os.environ.get("DD_AGENT_HOST", "127.0.0.1")
     DD_TRACE_AGENT_PORT: int = os.environ.get("DD_TRACE_AGENT_PORT", 8126)
+    DD_DOGSTATSD_PORT: int = os.environ.get("DD_DOGSTATSD_PORT", 8125)
     GCP_SERVICE_ACCOUNT_JSON: str = os.environ.get("GCP_SERVICE_ACCOUNT_JSON", "")
     DD_LOGS_INJECTION: bool = os.environ.get("DD_LOGS_INJECTION", "False") == "True"
 
+    DB_POOL_SIZE: int = os.environ.get("DB_POOL_SIZE", 5)
+    DB_MAX_OVERFLOW: int = os.environ.get("DB_MAX_OVERFLOW", 10)
+    DB_POOL_RECYCLE: int = os.environ.get("DB_POOL_RECYCLE", 1800)
+    DB_POOL_TIMEOUT: int = os.environ.get("DB_POOL_TIMEOUT", 30)
+    DB_SLOW_QUERY_MS: float = os.environ.get("DB_SLOW_QUERY_MS", 200)
+
+    CACHE_MAX_ENTRIES: int = os.environ.get("CACHE_MAX_ENTRIES", 10_000)
+    CACHE_TTL: float = os.environ.get("CACHE_TTL", 30)
+    CACHE_SHARED_TTL: float = os.environ.get("CACHE_SHARED_TTL", 300)
+
+    RECORDINGS_BUCKET: str = os.environ.get("RECORDINGS_BUCKET", "recordings")
+
+    JOB_POLL_INTERVAL: float = os.environ.get("JOB_POLL_INTERVAL", 1.0)
+    JOB_VISIBILITY_TIMEOUT: float = os.environ.get("JOB_VISIBILITY_TIMEOUT", 300)
+    JOB_MAX_ATTEMPTS: int = os.environ.get("JOB_MAX_ATTEMPTS", 5)
+
+    # recording search matches ranked per query, bounds the cost of the common terms
+    SEARCH_MAX_CANDIDATES: int = os.environ.get("SEARCH_MAX_CANDIDATES", 500)
+
+    WEBHOOK_BUFFER_SIZE: int = os.environ.get("WEBHOOK_BUFFER_SIZE", 10_000)
+    WEBHOOK_DEDUP_ENTRIES: int = os.environ.get("WEBHOOK_DEDUP_ENTRIES", 100_000)
+    WEBHOOK_DEDUP_TTL: float = os.environ.get("WEBHOOK_DEDUP_TTL", 3600)
+
 
 PROJECT_PATHS = ProjectPaths()
 PROJECT_ENVS = ProjectEnvs()
 API_KEYS = ApiKeys()
 DATABASE_URI = f"postgresql://{API_KEYS.POSTGRES_DATABASE_USERNAME}:{API_KEYS.POSTGRES_DATABASE_PASSWORD}@{API_KEYS.POSTGRES_DATABASE_URL}/{API_KEYS.POSTGRES_DATABASE_NAME}{'?sslmode=require' if PROJECT_ENVS.ENV_STATE not in [Envs.LOCAL.value, Envs.DEV.value] else ''}"
+# asyncpg takes `ssl` where libpq takes `sslmode`
+ASYNC_DATABASE_URI = DATABASE_URI.replace("postgresql://", "postgresql+asyncpg://", 1).replace("?sslmode=", "?ssl=")
 
 
 def get_handler():
@@ -20,5 +20,6 @@ class Statues(Enum):
     ACTIVE = "active"
     INACTIVE = "inactive"
     PENDING = "pending"
+    RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
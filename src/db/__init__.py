@@ -1,7 +1,9 @@
 from src.db.db import Base
 from src.db.deal import DealTable
+from src.db.job import JobTable
 from src.db.org import OrgTable
 from src.db.recording import RecordingTable
+from src.db.transcript import TranscriptChunkTable
 from src.db.user import UserTable
 
-__ALL__ = [Base, OrgTable, DealTable, RecordingTable, UserTable]
+__ALL__ = [Base, OrgTable, DealTable, RecordingTable, UserTable, JobTable, TranscriptChunkTable]
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
-from contextlib import contextmanager
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
 
 import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base
 
-from src import DATABASE_URI
+from src import ASYNC_DATABASE_URI, DATABASE_URI
 
 Base = declarative_base()
 UTC_TIMESTAMP = sa.text("timezone('utc', now())")
@@ -19,7 +20,7 @@ class FastAPISessionMaker:
     Intended for use creating ORM sessions injected into endpoint functions by FastAPI.
     """
 
-    def __init__(self, database_uri: str):
+    def __init__(self, database_uri: str, **engine_kwargs):
         """
         `database_uri` should be any sqlalchemy-compatible database URI.
 
@@ -30,8 +31,11 @@ class FastAPISessionMaker:
             "<scheme>://<user>:<password>@<host>:<port>/<database>"
 
         A concrete example looks like "postgresql://db_user:password@db:5432/app"
+
+        Any extra `engine_kwargs` (pool sizing, poolclass, ...) are forwarded to `sqlalchemy.create_engine`.
         """
         self.database_uri = database_uri
+        self.engine_kwargs = engine_kwargs
         self._cached_engine: sa.engine.Engine | None = None
         self._cached_sessionmaker: sa.orm.sessionmaker | None = None
 
@@ -61,7 +65,7 @@ class FastAPISessionMaker:
         """
         Returns a new sqlalchemy engine using the instance's database_uri.
         """
-        return get_engine(self.database_uri)
+        return get_engine(self.database_uri, **self.engine_kwargs)
 
     def get_new_sessionmaker(self, engine: sa.engine.Engine | None) -> sa.orm.sessionmaker:
         """
@@ -106,14 +110,104 @@ class FastAPISessionMaker:
         self._cached_engine = None
         self._cached_sessionmaker = None
 
+    def dispose(self) -> None:
+        """
+        Closes every pooled connection of the cached engine (if any) and resets the caches.
+        """
+        if self._cached_engine is not None:
+            self._cached_engine.dispose()
+        self.reset_cache()
+
 
-def get_engine(uri: str = DATABASE_URI) -> sa.engine.Engine:
+class AsyncFastAPISessionMaker:
+    """
+    The asyncio counterpart of `FastAPISessionMaker`, backed by a (cached) asyncpg `AsyncEngine`.
+
+    Intended for use creating `AsyncSession`s injected into `async def` endpoint functions by FastAPI.
+    """
+
+    def __init__(self, database_uri: str, **engine_kwargs):
+        """
+        `database_uri` should be an async sqlalchemy URI, e.g. "postgresql+asyncpg://db_user:password@db:5432/app"
+
+        Any extra `engine_kwargs` are forwarded to `sqlalchemy.ext.asyncio.create_async_engine`.
+        """
+        self.database_uri = database_uri
+        self.engine_kwargs = engine_kwargs
+        self._cached_engine: AsyncEngine | None = None
+        self._cached_sessionmaker: async_sessionmaker | None = None
+
+    @property
+    def cached_engine(self) -> AsyncEngine:
+        """
+        Returns a lazily-cached async engine for the instance's database_uri.
+        """
+        if self._cached_engine is None:
+            self._cached_engine = get_async_engine(self.database_uri, **self.engine_kwargs)
+        return self._cached_engine
+
+    @property
+    def cached_sessionmaker(self) -> async_sessionmaker:
+        """
+        Returns a lazily-cached async sessionmaker using the instance's (lazily-cached) engine.
+        """
+        if self._cached_sessionmaker is None:
+            self._cached_sessionmaker = get_async_sessionmaker_for_engine(self.cached_engine)
+        return self._cached_sessionmaker
+
+    async def get_db(self) -> AsyncIterator[AsyncSession]:
+        """
+        An async generator that yields an `AsyncSession` and cleans it up once resumed after yielding.
+
+        Can be used directly as a FastAPI dependency.
+        """
+        async for session in _get_async_db(self.cached_sessionmaker):
+            yield session
+
+    @asynccontextmanager
+    async def context_session(self) -> AsyncIterator[AsyncSession]:
+        """
+        An async-context-manager wrapped version of the `get_db` method.
+
+        Usage looks like:
+
+            session_maker = AsyncFastAPISessionMaker(database_uri)
+            async with session_maker.context_session() as session:
+                await session.execute(...)
+        """
+        async for session in self.get_db():
+            yield session
+
+    def reset_cache(self) -> None:
+        """
+        Resets the engine and sessionmaker caches.
+        """
+        self._cached_engine = None
+        self._cached_sessionmaker = None
+
+    async def dispose(self) -> None:
+        """
+        Closes every pooled connection of the cached engine (if any) and resets the caches.
+        """
+        if self._cached_engine is not None:
+            await self._cached_engine.dispose()
+        self.reset_cache()
+
+
+def get_engine(uri: str = DATABASE_URI, **kwargs) -> sa.engine.Engine:
     """
     Returns a sqlalchemy engine with pool_pre_ping enabled.
 
     This function may be updated over time to reflect recommended engine configuration for use with FastAPI.
     """
-    return sa.create_engine(uri, pool_pre_ping=True)
+    return sa.create_engine(uri, pool_pre_ping=True, **kwargs)
+
+
+def get_async_engine(uri: str = ASYNC_DATABASE_URI, **kwargs) -> AsyncEngine:
+    """
+    Returns an async sqlalchemy engine with pool_pre_ping enabled.
+    """
+    return create_async_engine(uri, pool_pre_ping=True, **kwargs)
 
 
 def get_sessionmaker_for_engine(engine: sa.engine.Engine) -> sa.orm.sessionmaker:
@@ -125,6 +219,15 @@ def get_sessionmaker_for_engine(engine: sa.engine.Engine) -> sa.orm.sessionmaker
     return sa.orm.sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def get_async_sessionmaker_for_engine(engine: AsyncEngine) -> async_sessionmaker:
+    """
+    Returns an async sessionmaker for the provided engine.
+
+    `expire_on_commit` is disabled so ORM instances stay readable after commit without an implicit (awaitable) reload.
+    """
+    return async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
 @contextmanager
 def context_session(engine: sa.engine.Engine) -> Iterator[Session]:
     """
@@ -159,3 +262,18 @@ def _get_db(sessionmaker: sa.orm.sessionmaker) -> Iterator[Session]:
         raise exc
     finally:
         session.close()
+
+
+async def _get_async_db(sessionmaker: async_sessionmaker) -> AsyncIterator[AsyncSession]:
+    """
+    An async generator that yields an `AsyncSession` using the provided sessionmaker, and cleans it up when resumed.
+    """
+    session = sessionmaker()
+    try:
+        yield session
+        await session.commit()
+    except Exception as exc:
+        await session.rollback()
+        raise exc
+    finally:
+        await session.close()
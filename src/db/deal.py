@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, String
+from sqlalchemy import Column, ForeignKey, Index, String
 
 from src.db.base import BaseColumns
 from src.db.db import Base
@@ -6,6 +6,7 @@ from src.db.db import Base
 
 class DealTable(BaseColumns, Base):
     __tablename__ = "deal"
+    __table_args__ = (Index("ix_deal_org_id_created_at_id", "org_id", "created_at", "id"),)
 
     id = Column(String, primary_key=True)
     org_id = Column(String, ForeignKey("org.id"), index=True)
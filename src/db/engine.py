@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Dict, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src import ASYNC_DATABASE_URI, DATABASE_URI, PROJECT_ENVS
+from src.db.db import AsyncFastAPISessionMaker, FastAPISessionMaker
+from src.infrastructure.metrics import instrumentation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENGINE = "default"
+
+
+@dataclass
+class PoolMetrics:
+    """Counters collected by `MeteredQueuePool` for a single engine."""
+
+    checkouts: int = 0
+    checkins: int = 0
+    timeouts: int = 0
+    wait_total_s: float = 0.0
+    wait_max_s: float = 0.0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait_s: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total_s += wait_s
+            self.wait_max_s = max(self.wait_max_s, wait_s)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["wait_avg_s"] = self.wait_total_s / self.checkouts if self.checkouts else 0.0
+        return data
+
+
+class _MeteredPoolMixin:
+    """Records how long callers wait to check out a connection from a QueuePool."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            conn = super()._do_get()
+        except sa.exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        if self.metrics is not None:
+            self.metrics.record_checkout(perf_counter() - start)
+        return conn
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        if self.metrics is not None:
+            self.metrics.record_checkin()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    """QueuePool that records checkout wait time in a `PoolMetrics`."""
+
+
+class MeteredAsyncAdaptedQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool (used by `AsyncEngine`) that records checkout wait time in a `PoolMetrics`."""
+
+
+class EngineRegistry:
+    """Process-wide registry of warm engines / sessionmakers, initialized once per worker."""
+
+    _sessionmakers: Dict[str, FastAPISessionMaker] = {}
+    _async_sessionmakers: Dict[str, AsyncFastAPISessionMaker] = {}
+    _metrics: Dict[str, PoolMetrics] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(
+        cls,
+        name: str = DEFAULT_ENGINE,
+        database_uri: str = DATABASE_URI,
+        pool_size: int = PROJECT_ENVS.DB_POOL_SIZE,
+        max_overflow: int = PROJECT_ENVS.DB_MAX_OVERFLOW,
+        pool_recycle: int = PROJECT_ENVS.DB_POOL_RECYCLE,
+        pool_timeout: int = PROJECT_ENVS.DB_POOL_TIMEOUT,
+    ) -> FastAPISessionMaker:
+        """Create (or return the existing) pooled sessionmaker registered under `name`."""
+        with cls._lock:
+            if name in cls._sessionmakers:
+                return cls._sessionmakers[name]
+
+            session_maker = FastAPISessionMaker(
+                database_uri,
+                poolclass=MeteredQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=pool_recycle,
+                pool_timeout=pool_timeout,
+            )
+            metrics = PoolMetrics()
+            session_maker.cached_engine.pool.metrics = metrics
+            instrumentation.instrument_engine(session_maker.cached_engine)
+            cls._sessionmakers[name] = session_maker
+            cls._metrics[name] = metrics
+            logger.info(
+                f"Engine '{name}' registered [pool_size={pool_size} max_overflow={max_overflow} "
+                f"pool_recycle={pool_recycle} pool_timeout={pool_timeout}]"
+            )
+            return session_maker
+
+    @classmethod
+    def register_async(
+        cls,
+        name: str = DEFAULT_ENGINE,
+        database_uri: str = ASYNC_DATABASE_URI,
+        pool_size: int = PROJECT_ENVS.DB_POOL_SIZE,
+        max_overflow: int = PROJECT_ENVS.DB_MAX_OVERFLOW,
+        pool_recycle: int = PROJECT_ENVS.DB_POOL_RECYCLE,
+        pool_timeout: int = PROJECT_ENVS.DB_POOL_TIMEOUT,
+    ) -> AsyncFastAPISessionMaker:
+        """Create (or return the existing) pooled async sessionmaker registered under `name`."""
+        with cls._lock:
+            if name in cls._async_sessionmakers:
+                return cls._async_sessionmakers[name]
+
+            session_maker = AsyncFastAPISessionMaker(
+                database_uri,
+                poolclass=MeteredAsyncAdaptedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=pool_recycle,
+                pool_timeout=pool_timeout,
+            )
+            metrics = PoolMetrics()
+            session_maker.cached_engine.sync_engine.pool.metrics = metrics
+            instrumentation.instrument_engine(session_maker.cached_engine.sync_engine)
+            cls._async_sessionmakers[name] = session_maker
+            cls._metrics[f"{name}:async"] = metrics
+            logger.info(
+                f"Async engine '{name}' registered [pool_size={pool_size} max_overflow={max_overflow} "
+                f"pool_recycle={pool_recycle} pool_timeout={pool_timeout}]"
+            )
+            return session_maker
+
+    @classmethod
+    def get(cls, name: str = DEFAULT_ENGINE) -> FastAPISessionMaker:
+        """Get the sessionmaker registered under `name`, lazily registering the default one."""
+        session_maker = cls._sessionmakers.get(name)
+        if session_maker is None:
+            if name != DEFAULT_ENGINE:
+                raise KeyError(f"No engine registered under '{name}'")
+            session_maker = cls.register(name)
+        return session_maker
+
+    @classmethod
+    def get_async(cls, name: str = DEFAULT_ENGINE) -> AsyncFastAPISessionMaker:
+        """Get the async sessionmaker registered under `name`, lazily registering the default one."""
+        session_maker = cls._async_sessionmakers.get(name)
+        if session_maker is None:
+            if name != DEFAULT_ENGINE:
+                raise KeyError(f"No async engine registered under '{name}'")
+            session_maker = cls.register_async(name)
+        return session_maker
+
+    @classmethod
+    def stats(cls) -> dict[str, dict]:
+        """Pool checkout/wait counters and the current pool status of every registered engine."""
+        stats = {
+            name: cls._metrics[name].to_dict() | {"status": session_maker.cached_engine.pool.status()}
+            for name, session_maker in cls._sessionmakers.items()
+        }
+        for name, session_maker in cls._async_sessionmakers.items():
+            stats[f"{name}:async"] = cls._metrics[f"{name}:async"].to_dict() | {
+                "status": session_maker.cached_engine.sync_engine.pool.status()
+            }
+        return stats
+
+    @classmethod
+    def dispose_all(cls) -> None:
+        """Close every pooled connection of the sync engines and remove them from the registry."""
+        with cls._lock:
+            for name, session_maker in cls._sessionmakers.items():
+                logger.info(f"Disposing engine '{name}'", extra={"pool": cls._metrics[name].to_dict()})
+                session_maker.dispose()
+            cls._sessionmakers.clear()
+            for name in [name for name in cls._metrics if not name.endswith(":async")]:
+                del cls._metrics[name]
+
+    @classmethod
+    async def dispose_all_async(cls) -> None:
+        """Close every pooled connection of the async engines and remove them from the registry."""
+        session_makers = list(cls._async_sessionmakers.items())
+        cls._async_sessionmakers.clear()
+        for name, session_maker in session_makers:
+            metrics = cls._metrics.pop(f"{name}:async", None)
+            logger.info(f"Disposing async engine '{name}'", extra={"pool": metrics.to_dict() if metrics else {}})
+            await session_maker.dispose()
+
+
+engines = EngineRegistry()
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from src.db.base import BaseColumns
+from src.db.db import Base
+
+
+class JobTable(BaseColumns, Base):
+    """
+    Background job, claimed by the workers with `SELECT ... FOR UPDATE SKIP LOCKED`.
+
+    `run_at` is when the job can next be claimed: its schedule while `pending`, the end of its visibility timeout
+    while `running`, so a job whose worker died is claimable again once `run_at` passes.
+    """
+
+    __tablename__ = "job"
+    __table_args__ = (
+        Index(
+            "ix_job_queue_priority_run_at",
+            "queue",
+            "priority",
+            "run_at",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    id = Column(String, primary_key=True)
+    queue = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    payload = Column(JSONB, server_default=text("'{}'"), default={})
+    # lower runs first
+    priority = Column(Integer, nullable=False, server_default=text("0"))
+    status = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_by = Column(String, nullable=True)
+    last_error = Column(String, nullable=True)
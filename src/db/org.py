@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 
 from src.db.base import BaseColumns
 from src.db.db import Base
@@ -6,6 +6,7 @@ from src.db.db import Base
 
 class OrgTable(BaseColumns, Base):
     __tablename__ = "org"
+    __table_args__ = (Index("ix_org_created_at_id", "created_at", "id"),)
 
     id = Column(String, primary_key=True)
 
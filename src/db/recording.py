@@ -1,12 +1,26 @@
-from sqlalchemy import Column, Float, ForeignKey, String
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Computed, Float, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 
 from src.db.base import BaseColumns
 from src.db.db import Base
 
+# text search configuration of `search_vector` and of the queries matching it
+SEARCH_CONFIG = "english"
+
 
 class RecordingTable(BaseColumns, Base):
     __tablename__ = "recording"
+    __table_args__ = (
+        Index("ix_recording_org_id_created_at_id", "org_id", "created_at", "id"),
+        # `participants @> '["email"]'` lookups, jsonb_path_ops is smaller and faster than the default for containment
+        Index(
+            "ix_recording_participants",
+            "participants",
+            postgresql_using="gin",
+            postgresql_ops={"participants": "jsonb_path_ops"},
+        ),
+        Index("ix_recording_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(String, primary_key=True)
     org_id = Column(String, ForeignKey("org.id"), index=True)
@@ -16,5 +30,16 @@ class RecordingTable(BaseColumns, Base):
     title = Column(String, nullable=True)
     description = Column(String, nullable=True)
     participants = Column(JSONB, nullable=True)
+    status = Column(String, nullable=True)
     video_path = Column(String, nullable=True)
     duration = Column(Float, nullable=True)
+
+    # kept up to date by Postgres, title matches rank above description matches
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    )
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, LargeBinary, SmallInteger, String
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from src.db.base import BaseColumns
+from src.db.db import Base
+
+
+class TranscriptChunkTable(BaseColumns, Base):
+    """
+    Transcript of a recording, stored apart from the recording row in chunks of consecutive segments, so reading a
+    time range only fetches and decodes the chunks overlapping it.
+
+    The segments of a chunk are stored column-wise: each distinct speaker once in `speakers`, then per segment the
+    index of its speaker, its start and end in milliseconds, and all the texts as one zstd-compressed JSON list.
+    """
+
+    __tablename__ = "transcript_chunk"
+    __table_args__ = (Index("ix_transcript_chunk_recording_id_seq", "recording_id", "seq", unique=True),)
+
+    id = Column(String, primary_key=True)
+    recording_id = Column(String, ForeignKey("recording.id", ondelete="CASCADE"), nullable=False)
+    # position of the chunk in the transcript, chunks are in start order
+    seq = Column(Integer, nullable=False)
+    # span of the chunk: the start of its first segment and the latest end of its segments
+    start_ms = Column(Integer, nullable=False)
+    end_ms = Column(Integer, nullable=False)
+
+    speakers = Column(ARRAY(String), nullable=False)
+    segment_speakers = Column(ARRAY(SmallInteger), nullable=False)
+    segment_starts = Column(ARRAY(Integer), nullable=False)
+    segment_ends = Column(ARRAY(Integer), nullable=False)
+    texts = Column(LargeBinary, nullable=False)
@@ -0,0 +1,22 @@
+from src.infrastructure.cache._lru import LRUCache
+from src.infrastructure.cache._memory import InMemoryCacheBackend
+from src.infrastructure.cache.app_cache import AppCache, app_cache, cached
+from src.infrastructure.cache.base import CacheBackend, CacheStats
+from src.infrastructure.cache.invalidation import (
+    CACHE_INVALIDATION_CHANNEL,
+    CacheInvalidationListener,
+    notify_payloads,
+)
+
+__ALL__ = [
+    AppCache,
+    CacheBackend,
+    CacheInvalidationListener,
+    CacheStats,
+    InMemoryCacheBackend,
+    LRUCache,
+    app_cache,
+    cached,
+    notify_payloads,
+    CACHE_INVALIDATION_CHANNEL,
+]
@@ -0,0 +1,49 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Optional
+
+from src.infrastructure.cache.base import CacheStats
+
+
+class LRUCache:
+    """Thread-safe in-process cache bounded to `maxsize` entries, each one expiring `ttl` seconds after being set."""
+
+    def __init__(self, maxsize: int, ttl: float, stats: Optional[CacheStats] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = stats or CacheStats()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= monotonic():
+                del self._entries[key]
+                self.stats.incr("expirations")
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = (monotonic() + (ttl or self.ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.incr("evictions")
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._entries.pop(key, None) is not None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,33 @@
+import threading
+from time import monotonic
+from typing import Optional
+
+from src.infrastructure.cache.base import CacheBackend
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local stand-in for a shared cache backend, for local runs and benchmarks."""
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (monotonic() + ttl, value)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
@@ -0,0 +1,119 @@
+import functools
+import logging
+from typing import Callable, Optional, Type
+
+from pydantic import BaseModel
+
+from src import PROJECT_ENVS
+from src.infrastructure.cache._lru import LRUCache
+from src.infrastructure.cache.base import CacheBackend, CacheStats
+
+logger = logging.getLogger(__name__)
+
+
+class AppCache:
+    """
+    Two-tier read cache for pydantic models, keyed by `<namespace>:<id>`.
+
+    The in-process LRU tier holds the model instances for `ttl` seconds. The optional shared tier holds their
+    JSON for `shared_ttl` seconds, so a worker can warm its LRU from what another worker already loaded.
+    Repository writes call `invalidate`, which drops the key from both tiers.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = PROJECT_ENVS.CACHE_MAX_ENTRIES,
+        ttl: float = PROJECT_ENVS.CACHE_TTL,
+        shared: Optional[CacheBackend] = None,
+        shared_ttl: float = PROJECT_ENVS.CACHE_SHARED_TTL,
+    ):
+        self.stats = CacheStats()
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl, stats=self.stats)
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+
+    @staticmethod
+    def key(namespace: str, _id: str) -> str:
+        return f"{namespace}:{_id}"
+
+    def set_shared_backend(self, shared: Optional[CacheBackend]) -> None:
+        self.shared = shared
+
+    def get(self, namespace: str, _id: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+        key = self.key(namespace, _id)
+        value = self.local.get(key)
+        if value is not None:
+            self.stats.incr("hits")
+            return value
+        self.stats.incr("misses")
+        if self.shared is None:
+            return None
+
+        try:
+            raw = self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"Shared cache read failed for {key}: {e}", exc_info=PROJECT_ENVS.DEBUG)
+            return None
+        if raw is None:
+            self.stats.incr("shared_misses")
+            return None
+        self.stats.incr("shared_hits")
+        value = schema.model_validate_json(raw)
+        self.local.set(key, value)
+        return value
+
+    def set(self, namespace: str, _id: str, value: BaseModel) -> None:
+        key = self.key(namespace, _id)
+        self.local.set(key, value)
+        if self.shared is None:
+            return
+        try:
+            self.shared.set(key, value.model_dump_json().encode(), self.shared_ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed for {key}: {e}", exc_info=PROJECT_ENVS.DEBUG)
+
+    def invalidate(self, namespace: str, *ids: str) -> None:
+        keys = [self.key(namespace, _id) for _id in ids]
+        if not keys:
+            return
+        self.stats.incr("invalidations", self.local.delete(*keys))
+        if self.shared is None:
+            return
+        try:
+            self.shared.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Shared cache invalidation failed for {keys}: {e}", exc_info=PROJECT_ENVS.DEBUG)
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def to_dict(self) -> dict:
+        return self.stats.to_dict() | {"size": len(self.local), "maxsize": self.local.maxsize}
+
+
+app_cache = AppCache()
+
+
+def cached(namespace: str, key: str, schema: Type[BaseModel], cache: Optional[AppCache] = None) -> Callable:
+    """
+    Cache the model returned by an async read route, looked up by its `key` path parameter.
+
+    Only models are stored: a `None` result or a raised `HTTPException` (e.g. 404) is never cached.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrap_func(*args, **kwargs):
+            target = cache or app_cache
+            _id = kwargs[key]
+            value = target.get(namespace, _id, schema)
+            if value is not None:
+                return value
+            value = await func(*args, **kwargs)
+            if isinstance(value, BaseModel):
+                target.set(namespace, _id, value)
+            return value
+
+        return wrap_func
+
+    return decorator
@@ -0,0 +1,43 @@
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+
+@dataclass
+class CacheStats:
+    """Counters collected by `AppCache` across its in-process and shared tiers."""
+
+    hits: int = 0
+    misses: int = 0
+    shared_hits: int = 0
+    shared_misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def incr(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        lookups = self.hits + self.misses
+        data["hit_ratio"] = self.hits / lookups if lookups else 0.0
+        return data
+
+
+class CacheBackend(ABC):
+    """Shared cache tier (Redis, Memcached, ...) storing serialized values, visible to every worker."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None: ...
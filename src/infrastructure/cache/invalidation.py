@@ -0,0 +1,98 @@
+import asyncio
+import json
+import logging
+from typing import Optional
+
+import asyncpg
+
+from src import DATABASE_URI, PROJECT_ENVS
+from src.infrastructure.cache.app_cache import AppCache, app_cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_INVALIDATION_CHANNEL = "cache_invalidation"
+# NOTIFY payloads are limited to 8000 bytes, ids are sent in batches well under it
+NOTIFY_BATCH_SIZE = 100
+LISTENER_KEEPALIVE = 10.0
+LISTENER_BACKOFF = 1.0
+LISTENER_MAX_BACKOFF = 30.0
+
+
+def notify_payloads(namespace: str, ids: list[str]) -> list[str]:
+    """`NOTIFY` payloads telling the other workers to drop the cached rows `ids` of `namespace`."""
+    return [
+        json.dumps({"table": namespace, "ids": ids[start : start + NOTIFY_BATCH_SIZE]})
+        for start in range(0, len(ids), NOTIFY_BATCH_SIZE)
+    ]
+
+
+class CacheInvalidationListener:
+    """
+    Keeps the in-process cache of a worker consistent with the writes of every other worker and pod.
+
+    Repository writes send `NOTIFY cache_invalidation` in their transaction, so a notification is delivered exactly
+    when the write commits. This listener holds a dedicated connection `LISTEN`ing to the channel and evicts the
+    notified keys. Notifications sent while it is disconnected are lost, so the whole cache is flushed every time
+    it (re)connects. A keepalive query detects dead connections, reconnecting with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        cache: AppCache = app_cache,
+        dsn: str = DATABASE_URI,
+        channel: str = CACHE_INVALIDATION_CHANNEL,
+        keepalive: float = LISTENER_KEEPALIVE,
+    ):
+        self.cache = cache
+        self.dsn = dsn
+        self.channel = channel
+        self.keepalive = keepalive
+        self.connected = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            self.cache.invalidate(message["table"], *message["ids"])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Invalid cache invalidation payload {payload!r}: {e}")
+
+    async def _run(self) -> None:
+        backoff = LISTENER_BACKOFF
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.add_listener(self.channel, self._on_notification)
+                # anything may have changed while no one was listening
+                self.cache.clear()
+                self.connected = True
+                backoff = LISTENER_BACKOFF
+                logger.info(f"Listening to '{self.channel}', cache flushed")
+                while True:
+                    await asyncio.sleep(self.keepalive)
+                    await asyncio.wait_for(connection.execute("SELECT 1"), timeout=self.keepalive)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Cache invalidation listener disconnected, reconnecting in {backoff:.0f}s: {e}",
+                    exc_info=PROJECT_ENVS.DEBUG,
+                )
+            finally:
+                self.connected = False
+                if connection is not None:
+                    connection.terminate()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, LISTENER_MAX_BACKOFF)
@@ -1,4 +1,5 @@
 from src.infrastructure.email._mailgun import EmailMailgun
 from src.infrastructure.email._smtp import EmailSMTP
+from src.infrastructure.email.outbox import EmailOutbox
 
-__ALL__ = [EmailMailgun, EmailSMTP]
+__ALL__ = [EmailMailgun, EmailSMTP, EmailOutbox]
@@ -1,44 +1,199 @@
+import json
 import logging
+import mimetypes
+from functools import partial
+from pathlib import Path
+from time import sleep
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import uuid4
 
 import requests
-from requests.exceptions import RequestException
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, ConnectTimeout, RequestException
 
 from src import PROJECT_ENVS
 from src.infrastructure.email.base import EmailManager, EmailMessage
 
 logger = logging.getLogger(__name__)
 
+MAILGUN_API_URL = "https://api.mailgun.net/v3"
+MAILGUN_BATCH_SIZE = 1000
+MAILGUN_POOL_SIZE = 10
+MAILGUN_TIMEOUT = 30
+MAILGUN_MAX_RETRIES = 3
+MAILGUN_BACKOFF = 1.0
+READ_SIZE = 64 * 1024
+
+
+class _MultipartStream:
+    """`multipart/form-data` body of known length, reading files from disk chunk by chunk as it is sent."""
+
+    def __init__(self, fields: List[Tuple[str, str | Path]]):
+        self.boundary = uuid4().hex
+        self._parts: List[bytes | Path] = []
+        for name, value in fields:
+            if isinstance(value, Path):
+                content_type = mimetypes.guess_type(value.name)[0] or "application/octet-stream"
+                self._parts += [
+                    (
+                        f"--{self.boundary}\r\n"
+                        f'Content-Disposition: form-data; name="{name}"; filename="{value.name}"\r\n'
+                        f"Content-Type: {content_type}\r\n\r\n"
+                    ).encode(),
+                    value,
+                    b"\r\n",
+                ]
+            else:
+                self._parts.append(
+                    f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+                )
+        self._parts.append(f"--{self.boundary}--\r\n".encode())
+        self.length = sum(part.stat().st_size if isinstance(part, Path) else len(part) for part in self._parts)
+        self._chunks = self._iter_chunks()
+        self._buffer = b""
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        for part in self._parts:
+            if isinstance(part, Path):
+                with open(part, "rb") as f:
+                    yield from iter(partial(f.read, READ_SIZE), b"")
+            else:
+                yield part
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def __len__(self) -> int:
+        return self.length
+
 
 class EmailMailgun(EmailManager):
-    def __init__(self, api_key: str, domain: str):
+    """
+    Mailgun transport over a pooled keep-alive session.
+
+    Request bodies are streamed, so attachments are never read whole into memory. `send_batch` sends one
+    personalised message to up to `MAILGUN_BATCH_SIZE` recipients per API call with recipient variables.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        domain: str,
+        api_url: str = MAILGUN_API_URL,
+        pool_size: int = MAILGUN_POOL_SIZE,
+        timeout: float = MAILGUN_TIMEOUT,
+        max_retries: int = MAILGUN_MAX_RETRIES,
+    ):
         self.api_key = api_key
         self.domain = domain
-        self.base_url = f"https://api.mailgun.net/v3/{domain}"
+        self.base_url = f"{api_url}/{domain}"
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        self.session = requests.Session()
+        self.session.auth = ("api", api_key)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @staticmethod
+    def _fields(message: EmailMessage) -> List[Tuple[str, str | Path]]:
+        fields = [(key, value) for key, value in message.to_dict().items()]
+        if message.attachment_path:
+            if message.attachment_path.exists():
+                fields.append(("attachment", message.attachment_path))
+            else:
+                logger.warning(f"Attachment not found: {message.attachment_path}")
+        return fields
+
+    def _post(self, fields: List[Tuple[str, str | Path]]) -> requests.Response:
+        """
+        POST `fields` to the messages endpoint, retrying on 429 and connection errors with exponential backoff.
+
+        5xx responses and read timeouts are not retried, since Mailgun may already have accepted the message.
+        """
+        for attempt in range(self.max_retries + 1):
+            # a streamed body is consumed by a send, rebuild it for every attempt
+            body = _MultipartStream(fields)
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/messages",
+                    data=body,
+                    headers={"Content-Type": body.content_type},
+                    timeout=self.timeout,
+                )
+                if response.status_code != 429 or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response
+            except (ConnectionError, ConnectTimeout):
+                if attempt == self.max_retries:
+                    raise
+            delay = MAILGUN_BACKOFF * 2**attempt
+            logger.warning(f"Retrying Mailgun request in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            sleep(delay)
 
     def send_email(self, message: EmailMessage) -> bool:
         try:
-            files = None
-            if message.attachment_path:
-                if not message.attachment_path.exists():
-                    logger.warning(f"Attachment not found: {message.attachment_path}")
-                else:
-                    with open(message.attachment_path, "rb") as f:
-                        files = [("attachment", f)]
-
-            response = requests.post(
-                f"{self.base_url}/messages",
-                auth=("api", self.api_key),
-                data=message.to_dict(),
-                files=files,
-            )
-            response.raise_for_status()
-            logger.info("Email sent successfully", extra={"message": message.to_dict()})
+            self._post(self._fields(message))
+            logger.info("Email sent successfully", extra={"email": message.to_dict()})
             return True
 
         except RequestException as e:
             logger.error(
                 "Failed to send email",
-                extra={"error": str(e), "message": message.to_dict()},
+                extra={"error": str(e), "email": message.to_dict()},
                 exc_info=PROJECT_ENVS.DEBUG,
             )
             return False
+
+    def send_batch(
+        self,
+        message: EmailMessage,
+        recipient_variables: Optional[Dict[str, dict]] = None,
+        batch_size: int = MAILGUN_BATCH_SIZE,
+    ) -> int:
+        """
+        Send `message` to each of its `to_emails` individually, `batch_size` recipients per API call.
+
+        `recipient_variables[email]` fills the `%recipient.<key>%` placeholders of that recipient's copy. `cc`
+        and `bcc` are not supported in batch sends and are ignored.
+
+        Returns:
+            int: Number of recipients Mailgun accepted.
+        """
+        recipient_variables = recipient_variables or {}
+        fields = [(key, value) for key, value in self._fields(message) if key not in ("to", "cc", "bcc")]
+        accepted = 0
+        for start in range(0, len(message.to_emails), batch_size):
+            recipients = message.to_emails[start : start + batch_size]
+            # every recipient must have variables, even empty ones, or they all receive the same message
+            variables = {email: recipient_variables.get(email, {}) for email in recipients}
+            try:
+                self._post(
+                    [("to", email) for email in recipients] + fields + [("recipient-variables", json.dumps(variables))]
+                )
+                accepted += len(recipients)
+            except RequestException as e:
+                logger.error(
+                    "Failed to send email batch",
+                    extra={"error": str(e), "email": message.to_dict() | {"to": f"{len(recipients)} recipients"}},
+                    exc_info=PROJECT_ENVS.DEBUG,
+                )
+        logger.info(f"Email batch sent to {accepted}/{len(message.to_emails)} recipients")
+        return accepted
+
+    def close(self) -> None:
+        self.session.close()
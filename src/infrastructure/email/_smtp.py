@@ -1,59 +1,117 @@
 import logging
 import smtplib
+import ssl
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import List
 
 from src import PROJECT_ENVS
 from src.infrastructure.email.base import EmailManager, EmailMessage
 
 logger = logging.getLogger(__name__)
 
+SMTP_TIMEOUT = 30
+
 
 class EmailSMTP(EmailManager):
-    def __init__(self, smtp_host: str, smtp_port: int, username: str, password: str):
+    def __init__(
+        self,
+        smtp_host: str,
+        smtp_port: int,
+        username: str,
+        password: str,
+        use_tls: bool = True,
+        timeout: float = SMTP_TIMEOUT,
+    ):
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
         self.username = username
         self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
 
-    def send_email(self, message: EmailMessage) -> bool:
+    def connect(self) -> smtplib.SMTP:
+        """Open an SMTP session, upgraded with STARTTLS and authenticated, ready to send many messages."""
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=self.timeout)
         try:
-            # Create MIME message
-            mime_message = MIMEMultipart()
-            mime_message["From"] = message.from_email
-            mime_message["To"] = message.to_email
-            mime_message["Subject"] = message.subject
-
-            # Attach body
-            mime_message.attach(MIMEText(message.body, "html" if message.html else "plain"))
-
-            # Attach file if provided
-            if message.attachment_path and message.attachment_path.exists():
-                with open(message.attachment_path, "rb") as f:
-                    attachment = MIMEApplication(f.read())
-                    attachment.add_header(
-                        "Content-Disposition",
-                        "attachment",
-                        filename=message.attachment_path.name,
-                    )
-                    mime_message.attach(attachment)
-            elif message.attachment_path:
-                logger.warning(f"Attachment not found: {message.attachment_path}")
-
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
+            if self.use_tls:
+                server.starttls(context=ssl.create_default_context())
+            if self.username:
                 server.login(self.username, self.password)
-                server.send_message(mime_message)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    @staticmethod
+    def build_mime(message: EmailMessage) -> MIMEMultipart:
+        mime_message = MIMEMultipart("mixed")
+        mime_message["From"] = message.from_email
+        mime_message["To"] = ", ".join(message.to_emails)
+        if message.cc:
+            mime_message["Cc"] = ", ".join(message.cc)
+        mime_message["Subject"] = message.subject
+
+        # Attach body, plain text first so clients prefer the html part
+        body = MIMEMultipart("alternative")
+        if message.text:
+            body.attach(MIMEText(message.text, "plain"))
+        body.attach(MIMEText(message.html, "html"))
+        mime_message.attach(body)
+
+        # Attach file if provided
+        if message.attachment_path and message.attachment_path.exists():
+            with open(message.attachment_path, "rb") as f:
+                attachment = MIMEApplication(f.read())
+            attachment.add_header(
+                "Content-Disposition",
+                "attachment",
+                filename=message.attachment_path.name,
+            )
+            mime_message.attach(attachment)
+        elif message.attachment_path:
+            logger.warning(f"Attachment not found: {message.attachment_path}")
+        return mime_message
+
+    @staticmethod
+    def recipients(message: EmailMessage) -> List[str]:
+        return [*message.to_emails, *(message.cc or []), *(message.bcc or [])]
 
-            logger.info("Email sent successfully", extra={"message": message.to_dict()})
-            return True
+    def deliver(self, server: smtplib.SMTP, message: EmailMessage) -> None:
+        """Send `message` on an open session, raising on failure."""
+        refused = server.send_message(
+            self.build_mime(message), from_addr=message.from_email, to_addrs=self.recipients(message)
+        )
+        if refused:
+            # only raised when every recipient is refused
+            logger.warning("Some recipients were refused", extra={"refused": list(refused), "email": message.to_dict()})
 
+    def send_email(self, message: EmailMessage) -> bool:
+        return self.send_many([message])[0]
+
+    def send_many(self, messages: List[EmailMessage]) -> List[bool]:
+        """Send `messages` over a single SMTP session, returning whether each one was sent."""
+        results = []
+        try:
+            with self.connect() as session:
+                for message in messages:
+                    try:
+                        self.deliver(session, message)
+                        logger.info("Email sent successfully", extra={"email": message.to_dict()})
+                        results.append(True)
+                    except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+                        # the session stays usable after a rejected message
+                        logger.error(
+                            "Failed to send email",
+                            extra={"error": str(e), "email": message.to_dict()},
+                            exc_info=PROJECT_ENVS.DEBUG,
+                        )
+                        results.append(False)
         except Exception as e:
             logger.error(
                 "Failed to send email",
-                extra={"error": str(e), "message": message.to_dict()},
+                extra={"error": str(e), "messages": len(messages) - len(results)},
                 exc_info=PROJECT_ENVS.DEBUG,
             )
-            return False
+        return results + [False] * (len(messages) - len(results))
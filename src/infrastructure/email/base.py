@@ -63,3 +63,6 @@ class EmailMessage(BaseModel):
 class EmailManager(ABC):
     @abstractmethod
     def send_email(self, message: EmailMessage) -> bool: ...
+
+    def send_many(self, messages: List[EmailMessage]) -> List[bool]:
+        return [self.send_email(message) for message in messages]
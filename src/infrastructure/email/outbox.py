@@ -0,0 +1,185 @@
+import logging
+import smtplib
+import threading
+from dataclasses import asdict, dataclass
+from queue import Empty, Full, Queue
+from typing import List, Optional
+
+from src import PROJECT_ENVS
+from src.infrastructure.email._smtp import EmailSMTP
+from src.infrastructure.email.base import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_WORKERS = 4
+OUTBOX_MAX_QUEUE = 10_000
+OUTBOX_MAX_RETRIES = 3
+OUTBOX_BACKOFF = 1.0
+OUTBOX_MAX_BACKOFF = 30.0
+OUTBOX_IDLE_TIMEOUT = 60.0
+
+_STOP = object()
+
+
+@dataclass
+class OutboxMetrics:
+    """Counters collected by `EmailOutbox`."""
+
+    enqueued: int = 0
+    dropped: int = 0
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    connections: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def incr(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class EmailOutbox:
+    """
+    In-process email queue delivered by a pool of background worker threads.
+
+    Each worker keeps its own authenticated SMTP session open across messages, closing it after
+    `idle_timeout` seconds without mail and reconnecting whenever the server drops it. Transient failures are retried
+    with exponential backoff, permanent (5xx) rejections are not. Callers only pay for a `Queue.put`.
+    """
+
+    def __init__(
+        self,
+        transport: EmailSMTP,
+        workers: int = OUTBOX_WORKERS,
+        max_queue: int = OUTBOX_MAX_QUEUE,
+        max_retries: int = OUTBOX_MAX_RETRIES,
+        backoff: float = OUTBOX_BACKOFF,
+        max_backoff: float = OUTBOX_MAX_BACKOFF,
+        idle_timeout: float = OUTBOX_IDLE_TIMEOUT,
+    ):
+        self.transport = transport
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.idle_timeout = idle_timeout
+        self.metrics = OutboxMetrics()
+        self._queue: Queue = Queue(maxsize=max_queue)
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        return self.metrics.to_dict() | {"queue_depth": self.queue_depth}
+
+    def start(self) -> "EmailOutbox":
+        if self._threads:
+            return self
+        self._stopping.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"email-outbox-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Deliver what is already queued, then stop the workers."""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._stopping.set()
+        self._threads = []
+
+    def send(self, message: EmailMessage) -> bool:
+        """Queue `message` for delivery, False if the outbox is full."""
+        try:
+            self._queue.put_nowait(message)
+        except Full:
+            self.metrics.incr("dropped")
+            logger.warning("Email outbox is full, dropping message", extra={"email": message.to_dict()})
+            return False
+        self.metrics.incr("enqueued")
+        return True
+
+    def send_many(self, messages: List[EmailMessage]) -> int:
+        """Queue `messages` for delivery, returning how many were accepted."""
+        return sum(self.send(message) for message in messages)
+
+    def _work(self) -> None:
+        session: Optional[smtplib.SMTP] = None
+        while True:
+            try:
+                message = self._queue.get(timeout=self.idle_timeout)
+            except Empty:
+                session = self._close(session)
+                continue
+            try:
+                if message is _STOP:
+                    break
+                session = self._deliver(session, message)
+            except Exception as e:
+                # a worker must outlive any single message
+                self.metrics.incr("failed")
+                session = self._close(session)
+                logger.error(f"Unexpected error in email outbox worker: {e}", exc_info=PROJECT_ENVS.DEBUG)
+            finally:
+                self._queue.task_done()
+        self._close(session)
+
+    def _deliver(self, session: Optional[smtplib.SMTP], message: EmailMessage) -> Optional[smtplib.SMTP]:
+        """Send `message`, reconnecting and retrying on transient errors. Returns the session to reuse."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                if session is None:
+                    session = self.transport.connect()
+                    self.metrics.incr("connections")
+                self.transport.deliver(session, message)
+                self.metrics.incr("sent")
+                return session
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+                code = getattr(e, "smtp_code", 500)
+                if code >= 500 or isinstance(e, smtplib.SMTPRecipientsRefused):
+                    self.metrics.incr("failed")
+                    logger.error(
+                        "Email rejected",
+                        extra={"error": str(e), "email": message.to_dict()},
+                        exc_info=PROJECT_ENVS.DEBUG,
+                    )
+                    return session
+                error = e
+            except (smtplib.SMTPException, OSError) as e:
+                # dropped or broken session, reconnect on the next attempt
+                session = self._close(session)
+                error = e
+            if attempt < self.max_retries:
+                self.metrics.incr("retries")
+                delay = min(self.backoff * 2**attempt, self.max_backoff)
+                logger.warning(f"Retrying email in {delay:.1f}s ({attempt + 1}/{self.max_retries}): {error}")
+                if self._stopping.wait(delay):
+                    break
+
+        self.metrics.incr("failed")
+        logger.error(
+            "Failed to send email",
+            extra={"error": str(error), "email": message.to_dict()},
+            exc_info=PROJECT_ENVS.DEBUG,
+        )
+        return session
+
+    @staticmethod
+    def _close(session: Optional[smtplib.SMTP]) -> None:
+        if session is not None:
+            try:
+                session.quit()
+            except (smtplib.SMTPException, OSError):
+                session.close()
+        return None
@@ -0,0 +1,23 @@
+from src.infrastructure.metrics._memory import InMemoryMetricsSink
+from src.infrastructure.metrics._null import NullMetricsSink
+from src.infrastructure.metrics._statsd import DogStatsDSink
+from src.infrastructure.metrics.base import MetricsSink
+from src.infrastructure.metrics.instrumentation import (
+    Instrumentation,
+    default_sink,
+    fingerprint,
+    instrumentation,
+    traced,
+)
+
+__ALL__ = [
+    DogStatsDSink,
+    InMemoryMetricsSink,
+    Instrumentation,
+    MetricsSink,
+    NullMetricsSink,
+    default_sink,
+    fingerprint,
+    instrumentation,
+    traced,
+]
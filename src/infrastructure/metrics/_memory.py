@@ -0,0 +1,33 @@
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+from src.infrastructure.metrics.base import MetricsSink
+
+
+class InMemoryMetricsSink(MetricsSink):
+    """Keeps every recorded metric in memory, for tests and benchmarks."""
+
+    def __init__(self):
+        self.records: List[Tuple[str, str, float, Tuple[str, ...]]] = []
+        self._lock = threading.Lock()
+
+    def timing(self, metric: str, value: float, tags: Optional[Sequence[str]] = None) -> None:
+        with self._lock:
+            self.records.append(("timing", metric, value, tuple(tags or ())))
+
+    def increment(self, metric: str, value: int = 1, tags: Optional[Sequence[str]] = None) -> None:
+        with self._lock:
+            self.records.append(("increment", metric, value, tuple(tags or ())))
+
+    def values(self, metric: str, *tags: str) -> List[float]:
+        """Values recorded for `metric` with at least the given `key:value` tags."""
+        with self._lock:
+            return [
+                value
+                for _, name, value, record_tags in self.records
+                if name == metric and set(tags) <= set(record_tags)
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
@@ -0,0 +1,13 @@
+from typing import Optional, Sequence
+
+from src.infrastructure.metrics.base import MetricsSink
+
+
+class NullMetricsSink(MetricsSink):
+    """Drops every metric, used where no Datadog agent runs."""
+
+    def timing(self, metric: str, value: float, tags: Optional[Sequence[str]] = None) -> None:
+        pass
+
+    def increment(self, metric: str, value: int = 1, tags: Optional[Sequence[str]] = None) -> None:
+        pass
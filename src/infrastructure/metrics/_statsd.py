@@ -0,0 +1,19 @@
+from typing import Optional, Sequence
+
+from datadog import statsd
+from datadog.dogstatsd.base import DogStatsd
+
+from src.infrastructure.metrics.base import MetricsSink
+
+
+class DogStatsDSink(MetricsSink):
+    """Sends the metrics to the Datadog agent, configured by `datadog.initialize` (see `setup_datadog`)."""
+
+    def __init__(self, client: DogStatsd = statsd):
+        self.client = client
+
+    def timing(self, metric: str, value: float, tags: Optional[Sequence[str]] = None) -> None:
+        self.client.timing(metric, value, tags=list(tags) if tags else None)
+
+    def increment(self, metric: str, value: int = 1, tags: Optional[Sequence[str]] = None) -> None:
+        self.client.increment(metric, value, tags=list(tags) if tags else None)
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+
+
+class MetricsSink(ABC):
+    """Destination of the instrumentation metrics, tags are DogStatsD `key:value` strings."""
+
+    @abstractmethod
+    def timing(self, metric: str, value: float, tags: Optional[Sequence[str]] = None) -> None:
+        """Record a duration `value` in milliseconds to the `metric` histogram."""
+
+    @abstractmethod
+    def increment(self, metric: str, value: int = 1, tags: Optional[Sequence[str]] = None) -> None: ...
@@ -0,0 +1,262 @@
+import functools
+import hashlib
+import inspect
+import logging
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, List, Optional
+
+import sqlalchemy as sa
+from ddtrace import tracer
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src import PROJECT_ENVS
+from src.constants import Envs
+from src.infrastructure.metrics._null import NullMetricsSink
+from src.infrastructure.metrics._statsd import DogStatsDSink
+from src.infrastructure.metrics.base import MetricsSink
+
+logger = logging.getLogger(__name__)
+
+REPOSITORY_DURATION = "repository.duration"
+VALIDATE_DURATION = "repository.validate.duration"
+QUERY_DURATION = "db.query.duration"
+COMMIT_DURATION = "db.commit.duration"
+SLOW_QUERIES = "db.query.slow"
+
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|\$\d+|%s")
+# asyncpg statements carry the type of each parameter, e.g. `$1::TIMESTAMP WITH TIME ZONE`
+_CASTS = re.compile(r"\?::\w+(?: WITH(?:OUT)? TIME ZONE)?(?:\[\])?")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*")
+_SPACES = re.compile(r"\s+")
+
+
+def default_sink() -> MetricsSink:
+    """DogStatsD where the Datadog agent runs, the environments traced by `setup`, else no metrics."""
+    if PROJECT_ENVS.ENV_STATE in [Envs.PROD.value, Envs.STAGING.value]:
+        return DogStatsDSink()
+    return NullMetricsSink()
+
+
+def fingerprint(statement: str) -> str:
+    """
+    `statement` with its parameters and literals replaced by `?` and its value lists collapsed, so every execution of
+    the same query shares one fingerprint whatever its values or number of rows, e.g.
+    `INSERT INTO org (id, name) VALUES (?, ?), (?, ?)` -> `INSERT INTO org (id, name) VALUES (...)`.
+    """
+    statement = _PLACEHOLDERS.sub("?", statement)
+    statement = _LITERALS.sub("?", statement)
+    statement = _CASTS.sub("?", statement)
+    statement = _LISTS.sub("(...)", statement)
+    return _SPACES.sub(" ", statement).strip()
+
+
+def parameter_count(parameters) -> int:
+    if not parameters:
+        return 0
+    if isinstance(parameters, list) and isinstance(parameters[0], (dict, tuple, list)):
+        # executemany
+        return sum(len(row) for row in parameters)
+    return len(parameters)
+
+
+@dataclass
+class _Scope:
+    table: str
+    operation: str
+    failed: bool = False
+
+    @property
+    def tags(self) -> List[str]:
+        return [f"table:{self.table}", f"operation:{self.operation}"]
+
+
+_scope: ContextVar[Optional[_Scope]] = ContextVar("repository_scope", default=None)
+
+
+class Instrumentation:
+    """
+    Spans and latency histograms of the repository calls and of the SQL they run.
+
+    - `traced` repository methods: a `repository.<operation>` span and the `repository.duration` histogram, tagged
+      by table, operation and outcome. Repositories log and swallow database errors, so the outcome is `error`
+      whenever a statement failed during the call.
+    - pydantic validation of the rows: `repository.validate.duration`.
+    - every statement of an instrumented engine: `db.query.duration` tagged by statement type and the enclosing
+      repository call, and a warning with its fingerprint above `slow_query_ms`.
+    - every session commit (flush included): a `db.commit` span and `db.commit.duration`.
+    """
+
+    def __init__(self, sink: Optional[MetricsSink] = None, slow_query_ms: float = PROJECT_ENVS.DB_SLOW_QUERY_MS):
+        self.sink = sink or default_sink()
+        self.slow_query_ms = float(slow_query_ms)
+        self._sessions_instrumented = False
+
+    def set_sink(self, sink: MetricsSink) -> None:
+        self.sink = sink
+
+    def _timing(self, metric: str, start: float, tags: List[str]) -> float:
+        elapsed_ms = (perf_counter() - start) * 1000
+        try:
+            self.sink.timing(metric, elapsed_ms, tags)
+        except Exception as e:
+            logger.debug(f"Failed to record {metric}: {e}")
+        return elapsed_ms
+
+    # repositories
+
+    def traced(self, operation: str) -> Callable:
+        """Trace and time the decorated (sync or async) repository method as `operation` on its table."""
+
+        def decorator(func):
+            def start(repository) -> tuple:
+                scope = _Scope(repository.model_table.__tablename__, operation)
+                span = tracer.trace(f"repository.{operation}", resource=f"{scope.table}.{operation}")
+                span.set_tags({"table": scope.table, "operation": operation})
+                return scope, _scope.set(scope), span, perf_counter()
+
+            def finish(scope: _Scope, token, span, started: float, raised: bool) -> None:
+                _scope.reset(token)
+                outcome = "error" if raised or scope.failed else "ok"
+                span.set_tag("outcome", outcome)
+                if outcome == "error":
+                    span.error = 1
+                span.finish()
+                self._timing(REPOSITORY_DURATION, started, scope.tags + [f"outcome:{outcome}"])
+
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def wrap_func(repository, *args, **kwargs):
+                    scope, token, span, started = start(repository)
+                    raised = True
+                    try:
+                        result = await func(repository, *args, **kwargs)
+                        raised = False
+                        return result
+                    finally:
+                        finish(scope, token, span, started, raised)
+
+            else:
+
+                @functools.wraps(func)
+                def wrap_func(repository, *args, **kwargs):
+                    scope, token, span, started = start(repository)
+                    raised = True
+                    try:
+                        result = func(repository, *args, **kwargs)
+                        raised = False
+                        return result
+                    finally:
+                        finish(scope, token, span, started, raised)
+
+            return wrap_func
+
+        return decorator
+
+    def validated(self, func: Callable) -> Callable:
+        """Time the decorated row -> pydantic conversion within the enclosing repository call."""
+
+        @functools.wraps(func)
+        def wrap_func(*args, **kwargs):
+            scope = _scope.get()
+            started = perf_counter()
+            with tracer.trace("repository.validate"):
+                result = func(*args, **kwargs)
+            self._timing(VALIDATE_DURATION, started, scope.tags if scope else [])
+            return result
+
+        return wrap_func
+
+    # engines and sessions
+
+    def instrument_engine(self, engine: sa.engine.Engine) -> None:
+        """Time every statement of `engine` (the `sync_engine` of an `AsyncEngine`) and log the slow ones."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+        if not self._sessions_instrumented:
+            event.listen(Session, "before_commit", self._before_commit)
+            event.listen(Session, "after_commit", self._after_commit)
+            event.listen(Session, "after_soft_rollback", self._after_soft_rollback)
+            self._sessions_instrumented = True
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._instrumentation_start = perf_counter()
+
+    def _query_tags(self, statement: str, outcome: str) -> List[str]:
+        scope = _scope.get()
+        keyword = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else "unknown"
+        return (scope.tags if scope else ["table:none", "operation:none"]) + [
+            f"statement:{keyword}",
+            f"outcome:{outcome}",
+        ]
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_instrumentation_start", None)
+        if started is None:
+            return
+        elapsed_ms = self._timing(QUERY_DURATION, started, self._query_tags(statement, "ok"))
+        if elapsed_ms >= self.slow_query_ms:
+            self._slow_query(statement, parameters, elapsed_ms)
+
+    def _handle_error(self, exception_context) -> None:
+        scope = _scope.get()
+        if scope is not None:
+            scope.failed = True
+        context = exception_context.execution_context
+        started = getattr(context, "_instrumentation_start", None)
+        if started is not None and exception_context.statement:
+            self._timing(QUERY_DURATION, started, self._query_tags(exception_context.statement, "error"))
+
+    def _slow_query(self, statement: str, parameters, elapsed_ms: float) -> None:
+        scope = _scope.get()
+        query = fingerprint(statement)
+        try:
+            self.sink.increment(SLOW_QUERIES, tags=scope.tags if scope else None)
+        except Exception as e:
+            logger.debug(f"Failed to record {SLOW_QUERIES}: {e}")
+        logger.warning(
+            f"Slow query ({elapsed_ms:.1f}ms): {query}",
+            extra={
+                "fingerprint": hashlib.sha1(query.encode()).hexdigest()[:16],
+                "query": query,
+                "parameters": parameter_count(parameters),
+                "duration_ms": round(elapsed_ms, 3),
+                "table": scope.table if scope else None,
+                "operation": scope.operation if scope else None,
+            },
+        )
+
+    def _before_commit(self, session: Session) -> None:
+        scope = _scope.get()
+        span = tracer.trace("db.commit", resource=f"{scope.table}.{scope.operation}" if scope else "commit")
+        session.info["_instrumentation_commit"] = (span, perf_counter())
+
+    def _finish_commit(self, session: Session, outcome: str) -> None:
+        pending = session.info.pop("_instrumentation_commit", None)
+        if pending is None:
+            return
+        span, started = pending
+        span.set_tag("outcome", outcome)
+        if outcome == "error":
+            span.error = 1
+        span.finish()
+        scope = _scope.get()
+        self._timing(COMMIT_DURATION, started, (scope.tags if scope else []) + [f"outcome:{outcome}"])
+
+    def _after_commit(self, session: Session) -> None:
+        self._finish_commit(session, "ok")
+
+    def _after_soft_rollback(self, session: Session, previous_transaction) -> None:
+        # a failed commit is only followed by a rollback
+        self._finish_commit(session, "error")
+
+
+instrumentation = Instrumentation()
+traced = instrumentation.traced
@@ -0,0 +1,24 @@
+from src.infrastructure.vector._flat import FlatIndex
+from src.infrastructure.vector._ivf import IVFIndex, kmeans
+from src.infrastructure.vector.base import VectorIndex
+from src.infrastructure.vector.store import (
+    VECTOR_INDEXES,
+    VectorStore,
+    create_index,
+    evaluate_index,
+    load_index,
+    recall_at_k,
+)
+
+__ALL__ = [
+    FlatIndex,
+    IVFIndex,
+    VectorIndex,
+    VectorStore,
+    create_index,
+    evaluate_index,
+    kmeans,
+    load_index,
+    recall_at_k,
+    VECTOR_INDEXES,
+]
@@ -0,0 +1,28 @@
+import numpy as np
+
+from src.infrastructure.vector.base import VECTOR_BLOCK_SIZE, VectorIndex, merge_top_k, pad_top_k, top_k
+
+
+class FlatIndex(VectorIndex):
+    """
+    Exact search: every vector is scored, by one matrix product per block of `VECTOR_BLOCK_SIZE` rows, and the top
+    k of each block is selected with `argpartition` and merged into the running top k.
+    """
+
+    kind = "flat"
+
+    def _add(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        self.ids = np.concatenate([self.ids, ids])
+        self.vectors = np.concatenate([self.vectors, vectors])
+
+    def _keep(self, mask: np.ndarray) -> None:
+        self.ids = self.ids[mask]
+        self.vectors = self.vectors[mask]
+
+    def _search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        best_rows = np.full((len(queries), 0), -1, dtype=np.int64)
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        for start in range(0, len(self), VECTOR_BLOCK_SIZE):
+            columns, scores = top_k(self._scores(queries, self.vectors[start : start + VECTOR_BLOCK_SIZE]), k)
+            best_rows, best_scores = merge_top_k(best_rows, best_scores, columns + start, scores, k)
+        return pad_top_k(best_rows, best_scores, k)
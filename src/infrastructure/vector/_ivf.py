@@ -0,0 +1,151 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.infrastructure.vector.base import VECTOR_BLOCK_SIZE, VectorIndex, pad_top_k, top_k
+
+IVF_NPROBE = 8
+IVF_KMEANS_ITERATIONS = 10
+# k-means is trained on a sample of this many vectors per list
+IVF_TRAIN_SIZE_PER_LIST = 64
+# the lists are trained again once the index has grown this many times since the last training
+IVF_RETRAIN_GROWTH = 4
+
+
+def default_nlist(n: int) -> int:
+    """About sqrt(n) lists of sqrt(n) vectors, probing costs `nprobe * sqrt(n)` scores instead of n."""
+    return max(1, min(n, int(np.sqrt(n))))
+
+
+def centroid_scores(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """
+    `(vectors, centroids)` scores ranking the centroids by euclidean distance to each vector, `x.c - |c|^2 / 2`.
+    Vectors are assigned to their lists and queries probe them by the same criterion, whatever the metric.
+    """
+    return vectors.astype(np.float32, copy=False) @ centroids.T - 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+
+
+def assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid of each vector in euclidean distance."""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), VECTOR_BLOCK_SIZE):
+        block = vectors[start : start + VECTOR_BLOCK_SIZE]
+        labels[start : start + VECTOR_BLOCK_SIZE] = np.argmax(centroid_scores(block, centroids), axis=1)
+    return labels
+
+
+def kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    iterations: int = IVF_KMEANS_ITERATIONS,
+    spherical: bool = True,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Lloyd's k-means on a sample of `IVF_TRAIN_SIZE_PER_LIST` vectors per cluster, empty clusters restarted from random
+    vectors. `spherical` centroids are normalized after each update, for cosine similarity.
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), IVF_TRAIN_SIZE_PER_LIST * n_clusters)
+    sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))].astype(np.float32)
+    centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        labels = assign(sample, centroids)
+        counts = np.bincount(labels, minlength=n_clusters)
+        filled = counts > 0
+        # sums of the members of each non-empty cluster, contiguous once sorted by label
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        sums = np.add.reduceat(sample[np.argsort(labels, kind="stable")], starts, axis=0)
+        centroids[filled] = sums / counts[filled, None]
+        centroids[~filled] = sample[rng.choice(len(sample), int((~filled).sum()), replace=False)]
+        if spherical:
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids /= np.where(norms > 0, norms, 1.0)
+    return centroids
+
+
+class IVFIndex(VectorIndex):
+    """
+    Approximate search with an inverted file: k-means splits the vectors into `nlist` lists, a query only scores the
+    vectors of the `nprobe` lists whose centroids are closest. Vectors are stored sorted by list, list `l` being rows
+    `offsets[l]:offsets[l + 1]`: a probed list is one contiguous read of the memory-mapped file, scored once per batch
+    of queries.
+
+    The lists are trained on the first vectors added and trained again as the index grows, `train` forces it. Queries
+    probe the lists whose centroids are the closest in euclidean distance, as the vectors were assigned to them: with
+    the `ip` metric, the closest centroids are not the ones with the highest inner products. Recall grows with
+    `nprobe`, measure it against a `FlatIndex` with `recall_at_k`.
+    """
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        dim: int,
+        dtype: str = "float32",
+        metric: str = "cosine",
+        nlist: Optional[int] = None,
+        nprobe: int = IVF_NPROBE,
+        trained_size: int = 0,
+    ):
+        super().__init__(dim, dtype=dtype, metric=metric)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.trained_size = trained_size
+        self.centroids = np.empty((0, dim), dtype=np.float32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+
+    def _labels(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.centroids)), np.diff(self.offsets))
+
+    def _sort(self, ids: np.ndarray, vectors: np.ndarray, labels: np.ndarray) -> None:
+        order = np.argsort(labels, kind="stable")
+        self.ids, self.vectors = ids[order], vectors[order]
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=len(self.centroids)))))
+
+    def train(self) -> None:
+        """Cluster the vectors of the index again."""
+        if not len(self):
+            return
+        nlist = min(self.nlist or default_nlist(len(self)), len(self))
+        self.centroids = kmeans(self.vectors, nlist, spherical=self.metric == "cosine")
+        self.trained_size = len(self)
+        self._sort(self.ids, self.vectors, assign(self.vectors, self.centroids))
+
+    def _add(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        if len(self.centroids) and len(self) + len(ids) < IVF_RETRAIN_GROWTH * self.trained_size:
+            labels = np.concatenate([self._labels(), assign(vectors, self.centroids)])
+            self._sort(np.concatenate([self.ids, ids]), np.concatenate([self.vectors, vectors]), labels)
+            return
+        self.ids, self.vectors = np.concatenate([self.ids, ids]), np.concatenate([self.vectors, vectors])
+        self.train()
+
+    def _keep(self, mask: np.ndarray) -> None:
+        self._sort(self.ids[mask], self.vectors[mask], self._labels()[mask])
+
+    def _search(self, queries: np.ndarray, k: int, nprobe: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        probed, _ = top_k(centroid_scores(queries, self.centroids), nprobe or self.nprobe)
+        nprobe = probed.shape[1]
+        # the top k of the j-th list probed by query q go to columns j * k:(j + 1) * k of its candidates
+        rows = np.full((len(queries), nprobe * k), -1, dtype=np.int64)
+        scores = np.full((len(queries), nprobe * k), -np.inf, dtype=np.float32)
+        # each list probed by the batch is scored once, against all the queries probing it
+        lists = probed.ravel()
+        order = np.argsort(lists, kind="stable")
+        for group in np.split(order, np.flatnonzero(np.diff(lists[order])) + 1):
+            start, end = self.offsets[lists[group[0]]], self.offsets[lists[group[0]] + 1]
+            if start == end:
+                continue
+            group_queries, slots = np.divmod(group, nprobe)
+            columns, group_scores = top_k(self._scores(queries[group_queries], self.vectors[start:end]), k)
+            targets = slots[:, None] * k + np.arange(columns.shape[1])
+            rows[group_queries[:, None], targets] = columns + start
+            scores[group_queries[:, None], targets] = group_scores
+        columns, best_scores = top_k(scores, k)
+        return pad_top_k(np.take_along_axis(rows, columns, axis=1), best_scores, k)
+
+    def _config(self) -> dict:
+        return super()._config() | {"nlist": self.nlist, "nprobe": self.nprobe, "trained_size": self.trained_size}
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        return super()._arrays() | {"centroids": self.centroids, "offsets": self.offsets}
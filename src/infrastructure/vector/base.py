@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+VECTOR_DTYPES = ("float32", "float16")
+VECTOR_METRICS = ("cosine", "ip")
+# rows scored per matrix product, bounds the `(queries, rows)` score matrix and the float16 upcast copy
+VECTOR_BLOCK_SIZE = 32_768
+VECTOR_QUERY_BATCH_SIZE = 256
+VECTOR_META_FILE = "meta.json"
+
+
+def top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Columns of the `k` best scores of each row, and these scores, in no particular order."""
+    if scores.shape[1] <= k:
+        columns = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        return columns, scores
+    columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return columns, np.take_along_axis(scores, columns, axis=1)
+
+
+def merge_top_k(
+    best_rows: np.ndarray, best_scores: np.ndarray, rows: np.ndarray, scores: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Keep the `k` best of two `(queries, n)` candidate sets, given as row numbers and scores."""
+    columns, merged_scores = top_k(np.concatenate([best_scores, scores], axis=1), k)
+    return np.take_along_axis(np.concatenate([best_rows, rows], axis=1), columns, axis=1), merged_scores
+
+
+def pad_top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Pad `(queries, n < k)` candidates to k columns with the row -1 and the score -inf."""
+    missing = k - rows.shape[1]
+    if missing > 0:
+        rows = np.pad(rows, ((0, 0), (0, missing)), constant_values=-1)
+        scores = np.pad(scores, ((0, 0), (0, missing)), constant_values=-np.inf)
+    return rows, scores
+
+
+class VectorIndex(ABC):
+    """
+    In-process index of `dim`-dimensional vectors, each one with a string id, searched by inner product.
+
+    Vectors are stored as `dtype`, float16 halving the memory and the files, and are normalized with the `cosine`
+    metric. Scores are always computed in float32: NumPy has no BLAS kernel for float16 products, float16 vectors are
+    upcast one block at a time.
+
+    `save` writes one `.npy` file per array to a directory, `load` memory-maps them so only the pages searched are
+    read and processes share them through the page cache.
+    """
+
+    kind: str
+
+    def __init__(self, dim: int, dtype: str = "float32", metric: str = "cosine"):
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector dtype {dtype}, expected one of {VECTOR_DTYPES}")
+        if metric not in VECTOR_METRICS:
+            raise ValueError(f"Unsupported metric {metric}, expected one of {VECTOR_METRICS}")
+        self.dim = dim
+        self.dtype = dtype
+        self.metric = metric
+        self.ids = np.empty(0, dtype=str)
+        self.vectors = np.empty((0, dim), dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _prepare(self, vectors, dtype: str = "float32") -> np.ndarray:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+        if self.metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms > 0, norms, 1.0)
+        return vectors.astype(dtype, copy=False)
+
+    def _scores(self, queries: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        return queries @ vectors.astype(np.float32, copy=False).T
+
+    def add(self, ids: Iterable[str], vectors) -> None:
+        ids = np.asarray(list(ids), dtype=str)
+        vectors = self._prepare(vectors, self.dtype)
+        if len(ids) != len(vectors):
+            raise ValueError(f"Got {len(ids)} ids for {len(vectors)} vectors")
+        self._add(ids, vectors)
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Remove the vectors of `ids`, returns how many were removed."""
+        keep = ~np.isin(self.ids, np.asarray(list(ids), dtype=str))
+        removed = len(keep) - int(keep.sum())
+        if removed:
+            self._keep(keep)
+        return removed
+
+    def search(self, queries, k: int = 10, **kwargs) -> tuple[list[list[str]], np.ndarray]:
+        """
+        Ids of the `k` vectors with the highest scores for each query, best first, and a `(queries, k)` array of their
+        scores. Queries get fewer than `k` ids when the index is smaller, their missing scores are `-inf`. `kwargs`
+        are options of the index kind, like the `nprobe` of an `IVFIndex`.
+        """
+        queries = self._prepare(queries)
+        rows = np.full((len(queries), k), -1, dtype=np.int64)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        if len(self) and k > 0:
+            for start in range(0, len(queries), VECTOR_QUERY_BATCH_SIZE):
+                batch = slice(start, start + VECTOR_QUERY_BATCH_SIZE)
+                rows[batch], scores[batch] = self._search(queries[batch], k, **kwargs)
+        order = np.argsort(-scores, axis=1, kind="stable")
+        rows, scores = np.take_along_axis(rows, order, axis=1), np.take_along_axis(scores, order, axis=1)
+        return [self.ids[query_rows[query_rows >= 0]].tolist() for query_rows in rows], scores
+
+    @abstractmethod
+    def _add(self, ids: np.ndarray, vectors: np.ndarray) -> None: ...
+
+    @abstractmethod
+    def _keep(self, mask: np.ndarray) -> None:
+        """Keep the vectors of the rows where `mask` is true."""
+
+    @abstractmethod
+    def _search(self, queries: np.ndarray, k: int, **kwargs) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and scores of the `k` best vectors of normalized float32 `queries`, -1 and -inf padded."""
+
+    def _config(self) -> dict:
+        return {"kind": self.kind, "dim": self.dim, "dtype": self.dtype, "metric": self.metric}
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        return {"ids": self.ids, "vectors": self.vectors}
+
+    def save(self, path: Path) -> None:
+        """Write the index to the `path` directory, replacing it only once every file is written."""
+        path = Path(path)
+        tmp_path, old_path = path.with_name(f"{path.name}.tmp"), path.with_name(f"{path.name}.old")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+        for name, array in self._arrays().items():
+            np.save(tmp_path / f"{name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+        (tmp_path / VECTOR_META_FILE).write_text(json.dumps(self._config()))
+        shutil.rmtree(old_path, ignore_errors=True)
+        if path.exists():
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True, config: Optional[dict] = None) -> "VectorIndex":
+        """Read an index written by `save`, its arrays memory-mapped read-only unless `mmap` is false."""
+        path = Path(path)
+        config = dict(config or json.loads((path / VECTOR_META_FILE).read_text()))
+        config.pop("kind", None)
+        index = cls(**config)
+        for name in index._arrays():
+            setattr(index, name, np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None, allow_pickle=False))
+        return index
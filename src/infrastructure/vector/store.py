@@ -0,0 +1,145 @@
+import copy
+import json
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Type
+
+import numpy as np
+
+from src import PROJECT_PATHS
+from src.infrastructure.vector._flat import FlatIndex
+from src.infrastructure.vector._ivf import IVFIndex
+from src.infrastructure.vector.base import VECTOR_META_FILE, VectorIndex
+from src.utils.evaluator_utils import BatchRetrievalEvaluator
+
+VECTOR_INDEXES: Dict[str, Type[VectorIndex]] = {FlatIndex.kind: FlatIndex, IVFIndex.kind: IVFIndex}
+VECTOR_PATH = PROJECT_PATHS.PROCESSED_DATA / "vectors"
+# collections and orgs are directory names
+PARTITION_PATTERN = re.compile(r"^\w[\w.-]*$")
+
+
+def create_index(kind: str, dim: int, **kwargs) -> VectorIndex:
+    try:
+        return VECTOR_INDEXES[kind](dim, **kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown vector index {kind}, expected one of {list(VECTOR_INDEXES)}")
+
+
+def load_index(path: Path, mmap: bool = True) -> VectorIndex:
+    config = json.loads((Path(path) / VECTOR_META_FILE).read_text())
+    return VECTOR_INDEXES[config["kind"]].load(path, mmap=mmap, config=config)
+
+
+def evaluate_index(
+    index: VectorIndex, queries, relevant_docs: List[List[str]], ks: Iterable[int] = (1, 3, 5, 10), **kwargs
+) -> Dict[str, float]:
+    """Mean retrieval metrics of `index` over `queries`, given the ids relevant to each one."""
+    ks = list(ks)
+    retrieved, _ = index.search(queries, max(ks), **kwargs)
+    return BatchRetrievalEvaluator(retrieved, relevant_docs).summarize(ks)
+
+
+def recall_at_k(index: VectorIndex, exact: VectorIndex, queries, k: int = 10, **kwargs) -> float:
+    """Share of the exact top `k` of each query found by `index`, `exact` being a `FlatIndex` of the same vectors."""
+    relevant, _ = exact.search(queries, k)
+    return evaluate_index(index, queries, relevant, ks=[k], **kwargs)[f"recall@{k}"]
+
+
+class VectorStore:
+    """
+    Vector indexes of a `collection`, e.g. transcript chunk embeddings, partitioned by org: an org only searches its
+    own vectors, and its index is read, written and dropped on its own.
+
+    Partitions are stored under `root/<collection>/<org_id>`, memory-mapped when first searched and kept open.
+    Changes stay in memory until `save`.
+
+    The lock serializes loads and changes, searches of a loaded index do not take it and run in parallel. Changes
+    are made to a copy of the index that then replaces it: the indexes reassign their arrays instead of writing into
+    them, so a search keeps reading the index it started with.
+    """
+
+    def __init__(
+        self, collection: str, kind: str = FlatIndex.kind, root: Path = VECTOR_PATH, mmap: bool = True, **index_kwargs
+    ):
+        if kind not in VECTOR_INDEXES:
+            raise ValueError(f"Unknown vector index {kind}, expected one of {list(VECTOR_INDEXES)}")
+        self.kind = kind
+        self.path = Path(root) / self._checked(collection)
+        self.mmap = mmap
+        self.index_kwargs = index_kwargs
+        self._indexes: Dict[str, VectorIndex] = {}
+        self._changed: set[str] = set()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _checked(name: str) -> str:
+        if not PARTITION_PATTERN.match(str(name)):
+            raise ValueError(f"Invalid vector partition name {name!r}")
+        return str(name)
+
+    def partition_path(self, org_id: str) -> Path:
+        return self.path / self._checked(org_id)
+
+    def partitions(self) -> List[str]:
+        """Orgs with a saved index."""
+        if not self.path.exists():
+            return []
+        return sorted(path.name for path in self.path.iterdir() if (path / VECTOR_META_FILE).exists())
+
+    def get(self, org_id: str) -> Optional[VectorIndex]:
+        index = self._indexes.get(org_id)
+        if index is not None:
+            return index
+        with self._lock:
+            if org_id not in self._indexes:
+                path = self.partition_path(org_id)
+                if not (path / VECTOR_META_FILE).exists():
+                    return None
+                self._indexes[org_id] = load_index(path, mmap=self.mmap)
+            return self._indexes[org_id]
+
+    def _copy(self, org_id: str) -> Optional[VectorIndex]:
+        """Shallow copy of the index of `org_id` to change, sharing its arrays until they are reassigned."""
+        index = self.get(org_id)
+        return copy.copy(index) if index is not None else None
+
+    def add(self, org_id: str, ids: Iterable[str], vectors) -> None:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        with self._lock:
+            index = self._copy(org_id) or create_index(self.kind, vectors.shape[1], **self.index_kwargs)
+            index.add(ids, vectors)
+            self._indexes[org_id] = index
+            self._changed.add(org_id)
+
+    def remove(self, org_id: str, ids: Iterable[str]) -> int:
+        with self._lock:
+            index = self._copy(org_id)
+            removed = index.remove(ids) if index is not None else 0
+            if removed:
+                self._indexes[org_id] = index
+                self._changed.add(org_id)
+            return removed
+
+    def search(self, org_id: str, queries, k: int = 10, **kwargs) -> tuple[list[list[str]], np.ndarray]:
+        """`VectorIndex.search` in the partition of `org_id`, no results for an org without vectors."""
+        index = self.get(org_id)
+        if index is None:
+            n_queries = len(np.atleast_2d(queries))
+            return [[] for _ in range(n_queries)], np.full((n_queries, k), -np.inf, dtype=np.float32)
+        return index.search(queries, k, **kwargs)
+
+    def save(self, org_id: Optional[str] = None) -> None:
+        """Write the changed partitions, or the one of `org_id`."""
+        with self._lock:
+            for changed in [org_id] if org_id is not None else sorted(self._changed):
+                if changed in self._indexes:
+                    self._indexes[changed].save(self.partition_path(changed))
+                self._changed.discard(changed)
+
+    def drop(self, org_id: str) -> None:
+        with self._lock:
+            self._indexes.pop(org_id, None)
+            self._changed.discard(org_id)
+            shutil.rmtree(self.partition_path(org_id), ignore_errors=True)
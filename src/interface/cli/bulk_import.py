@@ -0,0 +1,263 @@
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import typing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from time import perf_counter
+from typing import Iterator, Optional
+
+from src.db.engine import engines
+from src.repository.base import BaseRepository, copy_line
+from src.repository.deal import DealRepository
+from src.repository.recording import RecordingRepository
+from src.repository.user import UserRepository
+
+logger = logging.getLogger(__name__)
+
+IMPORT_REPOSITORIES = {"user": UserRepository, "deal": DealRepository, "recording": RecordingRepository}
+IMPORT_BATCH_SIZE = 5000
+IMPORT_FORMATS = ("ndjson", "csv")
+
+
+def _ignore_interrupts() -> None:
+    # Ctrl-C reaches the whole process group, only the parent stops the import
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _repository(entity: str) -> BaseRepository:
+    """Session-less repository, enough for its schema, table and columns."""
+    return IMPORT_REPOSITORIES[entity](None)
+
+
+def _json_fields(repository: BaseRepository) -> set[str]:
+    """Fields holding lists or dicts, written as JSON in CSV cells."""
+    json_fields = set()
+    for name, info in repository.model_schema.model_fields.items():
+        annotation = info.annotation
+        types = typing.get_args(annotation) if typing.get_origin(annotation) is typing.Union else (annotation,)
+        if any((typing.get_origin(_type) or _type) in (list, dict) for _type in types):
+            json_fields.add(name)
+    return json_fields
+
+
+def validate_batch(entity: str, start: int, records: list) -> tuple[list, list]:
+    """
+    Validate `records` (NDJSON lines or CSV row dicts) numbered from `start + 1` through the entity's schema.
+
+    Runs in the process pool. Returns the `(id, record number, COPY line)` of the valid records and the
+    `(record number, error)` of the rejected ones.
+    """
+    repository = _repository(entity)
+    columns = repository.copy_columns()
+    json_fields = _json_fields(repository)
+    now = datetime.now(timezone.utc)
+    valid, rejected = [], []
+    for number, record in enumerate(records, start + 1):
+        try:
+            if isinstance(record, str):
+                data = json.loads(record)
+            else:
+                # empty cells fall back to the schema defaults
+                data = {
+                    key: json.loads(value) if key in json_fields else value for key, value in record.items() if value
+                }
+            row = repository.model_schema(**data).model_dump()
+        except (ValueError, TypeError) as e:
+            rejected.append((number, str(e)))
+            continue
+        row["created_at"] = row.get("created_at") or now
+        row["updated_at"] = now
+        valid.append((row["id"], number, copy_line(row[key] for key in columns)))
+    return valid, rejected
+
+
+def read_records(path: str, format: str) -> Iterator:
+    """NDJSON lines (parsed by the workers) or CSV row dicts, blank lines skipped."""
+    with open(path, newline="") as file:
+        if format == "csv":
+            yield from csv.DictReader(file)
+        else:
+            yield from (line.rstrip("\r\n") for line in file if line.strip())
+
+
+@dataclass
+class ImportReport:
+    records: int = 0
+    inserted: int = 0
+    updated: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    # records of this run, the others were imported before resuming
+    run_records: int = field(default=0, compare=False)
+    elapsed: float = field(default=0.0, compare=False)
+    completed: bool = field(default=False, compare=False)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.run_records / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self) | {"rows_per_second": round(self.rows_per_second, 1)}
+
+
+class BulkImporter:
+    """
+    Load a large NDJSON or CSV file of users, deals or recordings.
+
+    Records are read lazily and validated through the schemas in a process pool, a bounded number of batches ahead
+    of the loader. Each batch is de-duplicated on the deterministic `set_id()` ids (last one wins) and upserted
+    with `copy_upsert` in its own transaction. Invalid records and records pointing to unknown rows are written to
+    `rejects_path` and skipped.
+
+    After each committed batch the number of records read is saved to `checkpoint_path`, so an interrupted import
+    resumes after the last committed batch when run again. Batches are idempotent upserts, replaying one is safe.
+    """
+
+    def __init__(
+        self,
+        entity: str,
+        source: str,
+        format: Optional[str] = None,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        workers: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        rejects_path: Optional[str] = None,
+    ):
+        if entity not in IMPORT_REPOSITORIES:
+            raise ValueError(f"Unknown entity '{entity}', expected one of {', '.join(IMPORT_REPOSITORIES)}")
+        self.entity = entity
+        self.source = os.path.abspath(source)
+        self.format = format or ("csv" if source.lower().endswith(".csv") else "ndjson")
+        if self.format not in IMPORT_FORMATS:
+            raise ValueError(f"Unknown format '{self.format}', expected one of {', '.join(IMPORT_FORMATS)}")
+        self.batch_size = batch_size
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint_path = checkpoint_path or f"{self.source}.{entity}.checkpoint"
+        self.rejects_path = rejects_path or f"{self.source}.{entity}.rejects.ndjson"
+
+    # checkpoint
+
+    def _fingerprint(self) -> dict:
+        return {"source": self.source, "entity": self.entity, "size": os.path.getsize(self.source)}
+
+    def _load_checkpoint(self) -> ImportReport:
+        if not os.path.exists(self.checkpoint_path):
+            return ImportReport()
+        with open(self.checkpoint_path) as file:
+            checkpoint = json.load(file)
+        if checkpoint.get("fingerprint") != self._fingerprint():
+            raise ValueError(f"{self.checkpoint_path} belongs to another import or the source changed, restart it")
+        return ImportReport(**checkpoint["report"])
+
+    def _save_checkpoint(self, report: ImportReport) -> None:
+        checkpoint = {
+            "fingerprint": self._fingerprint(),
+            "report": {
+                key: value
+                for key, value in asdict(report).items()
+                if key not in ("run_records", "elapsed", "completed")
+            },
+        }
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(checkpoint, file)
+        # atomic, a crash never leaves a truncated checkpoint
+        os.replace(temporary_path, self.checkpoint_path)
+
+    # pipeline
+
+    def _batches(self, skip: int) -> Iterator[tuple[int, list]]:
+        records = islice(read_records(self.source, self.format), skip, None)
+        start = skip
+        while batch := list(islice(records, self.batch_size)):
+            yield start, batch
+            start += len(batch)
+
+    def _reject(self, rejects, records: list, start: int, number: int, error: str) -> None:
+        rejects.write(json.dumps({"record": number, "error": error, "data": records[number - start - 1]}) + "\n")
+
+    def _load(self, repository: BaseRepository, rejects, start: int, records: list, validated) -> Optional[dict]:
+        valid, invalid = validated
+        for number, error in invalid:
+            self._reject(rejects, records, start, number, error)
+        # the last occurrence of an id wins, as it would with one upsert per record
+        unique = {_id: (number, line) for _id, number, line in valid}
+        result = {"inserted": 0, "updated": 0, "failed": 0, "rejected": []}
+        if unique:
+            result = repository.copy_upsert([line for _, line in unique.values()])
+            if result["failed"]:
+                return None
+        for _id, key in result["rejected"]:
+            self._reject(rejects, records, start, unique[_id][0], f"{key} not found")
+        return result | {"duplicates": len(valid) - len(unique), "invalid": len(invalid)}
+
+    def stop(self) -> None:
+        """Stop after the batch being loaded, keeping the checkpoint to resume from."""
+        self._stopping = True
+
+    def _submit(self, pool: ProcessPoolExecutor, pending: deque, batches: Iterator, count: int) -> None:
+        for start, records in islice(batches, count):
+            pending.append((start, records, pool.submit(validate_batch, self.entity, start, records)))
+
+    def run(self, restart: bool = False) -> Optional[ImportReport]:
+        """Import the source, `restart` ignores a previous checkpoint. Returns None when a batch fails to load."""
+        if restart and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        report = self._load_checkpoint()
+        if report.records:
+            logger.info(f"Resuming the import of {self.source} after record {report.records}")
+
+        self._stopping = False
+        started = perf_counter()
+        batches = self._batches(report.records)
+        # spawn: the workers do not inherit the connections nor the threads of this process
+        pool = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=_ignore_interrupts
+        )
+        try:
+            pending = deque()
+            self._submit(pool, pending, batches, 2 * self.workers)
+            # a fresh import starts a fresh rejects file, a resumed one appends to it
+            rejects_mode = "a" if report.records else "w"
+            with engines.get().context_session() as db, open(self.rejects_path, rejects_mode) as rejects:
+                repository = IMPORT_REPOSITORIES[self.entity](db)
+                while pending and not self._stopping:
+                    start, records, future = pending.popleft()
+                    # keep the pool busy while this batch is loaded
+                    self._submit(pool, pending, batches, 1)
+                    result = self._load(repository, rejects, start, records, future.result())
+                    if result is None:
+                        logger.error(
+                            f"Failed to load records {start + 1} to {start + len(records)}, fix the database and run "
+                            "the import again to resume from there"
+                        )
+                        return None
+                    rejects.flush()
+
+                    report.records = start + len(records)
+                    report.run_records += len(records)
+                    report.inserted += result["inserted"]
+                    report.updated += result["updated"]
+                    report.duplicates += result["duplicates"]
+                    report.rejected += result["invalid"] + len(result["rejected"])
+                    report.elapsed = perf_counter() - started
+                    self._save_checkpoint(report)
+                    logger.info(
+                        f"{report.records} records imported ({report.rows_per_second:.0f} rows/s): "
+                        f"{report.inserted} inserted, {report.updated} updated, {report.rejected} rejected"
+                    )
+                report.completed = not pending
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+        if report.completed and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        report.elapsed = perf_counter() - started
+        return report
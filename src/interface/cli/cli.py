@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import importlib
+import logging
+import signal
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src import PROJECT_ENVS
+from src.constants import Statues
+from src.db.engine import engines
+from src.interface.cli.bulk_import import IMPORT_BATCH_SIZE, IMPORT_FORMATS, IMPORT_REPOSITORIES, BulkImporter
+from src.interface.cli.webhooks import LOAD_TEST_CONCURRENCY, LOAD_TEST_EVENTS, run_load_test
+from src.interface.wsgi.setup import setup_datadog
+from src.jobs.recallai import RECALLAI_QUEUE
+from src.jobs.worker import JOB_BATCH_SIZE, TASKS, Worker
+from src.repository.job import JobRepository
+
+logger = logging.getLogger(__name__)
+
+# modules registering their job handlers with `@task`
+TASK_MODULES = ["src.jobs.recording", "src.jobs.recallai"]
+
+
+def parse_queues(values: List[str]) -> Dict[str, int]:
+    """`["default=8", "recording"]` -> `{"default": 8, "recording": 1}`"""
+    queues = {}
+    for value in values:
+        name, _, concurrency = value.partition("=")
+        queues[name] = int(concurrency or 1)
+    return queues
+
+
+async def run_worker(queues: Dict[str, int], batch_size: int) -> None:
+    # one connection per running job, plus the claims and heartbeats
+    engines.register_async(pool_size=max(int(PROJECT_ENVS.DB_POOL_SIZE), sum(queues.values()) + 2))
+    worker = Worker(queues, batch_size=batch_size)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        await engines.dispose_all_async()
+
+
+def worker(args: argparse.Namespace) -> None:
+    for module in TASK_MODULES + args.tasks:
+        importlib.import_module(module)
+    setup_datadog()
+    queues = parse_queues(args.queue) if args.queue else {}
+    if not queues:
+        # every queue with a registered task, one job at a time
+        queues = {task.queue: 1 for task in TASKS.values()}
+    asyncio.run(run_worker(queues, args.batch_size))
+
+
+def bulk_import(args: argparse.Namespace) -> None:
+    setup_datadog()
+    try:
+        importer = BulkImporter(
+            args.entity,
+            args.source,
+            format=args.format,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            checkpoint_path=args.checkpoint,
+            rejects_path=args.rejects,
+        )
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda signum, frame: importer.stop())
+
+    engines.register()
+    try:
+        report = importer.run(restart=args.restart)
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    finally:
+        engines.dispose_all()
+    if report is None:
+        sys.exit(1)
+    logger.info(
+        f"Imported {report.run_records} records in {report.elapsed:.1f}s ({report.rows_per_second:.0f} rows/s): "
+        f"{report.inserted} inserted, {report.updated} updated, {report.duplicates} duplicates, "
+        f"{report.rejected} rejected (see {importer.rejects_path})",
+        extra=report.to_dict(),
+    )
+    if not report.completed:
+        logger.warning(f"Import stopped, run the same command again to resume from {importer.checkpoint_path}")
+        sys.exit(130)
+
+
+def replay(args: argparse.Namespace) -> None:
+    engines.register()
+    try:
+        with engines.get().context_session() as db:
+            requeued = JobRepository(db).requeue(args.queue, tuple(args.status or [Statues.FAILED.value]), args.since)
+    finally:
+        engines.dispose_all()
+    if requeued is None:
+        sys.exit(1)
+    logger.info(f"Requeued {requeued} jobs of the {args.queue} queue")
+
+
+def load_test(args: argparse.Namespace) -> None:
+    report = run_load_test(
+        args.url,
+        events=args.events,
+        rate=args.rate,
+        concurrency=args.concurrency,
+        duplicates=args.duplicates,
+        secret=args.secret,
+    )
+    logger.info(
+        f"Sent {report.sent} events in {report.elapsed:.1f}s: {report.accepted} accepted, {report.duplicates} "
+        f"duplicates, {report.throttled} throttled (Retry-After up to {report.max_retry_after}s), {report.errors} "
+        f"errors, latency p50 {report.percentile(0.5) * 1000:.1f}ms p99 {report.percentile(0.99) * 1000:.1f}ms",
+        extra=report.to_dict(),
+    )
+
+
+def cli(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="recordmebe", description="Command Line Interface for various tasks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker_parser = commands.add_parser(
+        "worker",
+        help="Run the background jobs of the job table",
+        description="Run the background jobs of the job table. Start more processes to scale out.",
+    )
+    worker_parser.add_argument(
+        "-q",
+        "--queue",
+        action="append",
+        default=[],
+        metavar="NAME[=CONCURRENCY]",
+        help="Queue to consume and how many of its jobs run at once, repeatable (default: every task queue)",
+    )
+    worker_parser.add_argument(
+        "--batch-size", type=int, default=JOB_BATCH_SIZE, help="Maximum number of jobs claimed per query"
+    )
+    worker_parser.add_argument(
+        "--tasks", action="append", default=[], metavar="MODULE", help="Extra module registering tasks, repeatable"
+    )
+    worker_parser.set_defaults(func=worker)
+
+    import_parser = commands.add_parser(
+        "import",
+        help="Bulk load users, deals or recordings from a NDJSON or CSV file",
+        description="Bulk load users, deals or recordings from a NDJSON or CSV file with COPY. Existing rows are "
+        "updated, invalid ones are written to a rejects file. Run the same command again to resume an interrupted "
+        "import.",
+    )
+    import_parser.add_argument("entity", choices=list(IMPORT_REPOSITORIES))
+    import_parser.add_argument("source", help="NDJSON or CSV file, CSV lists and dicts encoded as JSON")
+    import_parser.add_argument(
+        "--format", choices=IMPORT_FORMATS, help="Format of the source (default: from its extension, else ndjson)"
+    )
+    import_parser.add_argument(
+        "--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Records validated and loaded per transaction"
+    )
+    import_parser.add_argument("--workers", type=int, help="Validation processes (default: one per CPU)")
+    import_parser.add_argument("--checkpoint", help="Checkpoint file (default: <source>.<entity>.checkpoint)")
+    import_parser.add_argument("--rejects", help="Rejected records file (default: <source>.<entity>.rejects.ndjson)")
+    import_parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of a previous import")
+    import_parser.set_defaults(func=bulk_import)
+
+    replay_parser = commands.add_parser(
+        "replay",
+        help="Run the failed jobs of a queue again",
+        description="Make the jobs of a queue due again with all of their attempts, e.g. the Recall.ai events whose "
+        "processing failed once the bug is fixed.",
+    )
+    replay_parser.add_argument("--queue", default=RECALLAI_QUEUE, help=f"Queue of the jobs (default: {RECALLAI_QUEUE})")
+    replay_parser.add_argument(
+        "--status",
+        action="append",
+        choices=[status.value for status in (Statues.FAILED, Statues.COMPLETED)],
+        help=f"Status of the jobs, repeatable (default: {Statues.FAILED.value})",
+    )
+    replay_parser.add_argument(
+        "--since", type=datetime.fromisoformat, help="Only the jobs created from this ISO 8601 datetime"
+    )
+    replay_parser.set_defaults(func=replay)
+
+    load_test_parser = commands.add_parser(
+        "loadtest",
+        help="Send synthetic Recall.ai webhooks to a running API",
+        description="Send synthetic Recall.ai events to POST /webhooks/recallai and report how many were accepted, "
+        "de-duplicated and throttled, and the latency percentiles.",
+    )
+    load_test_parser.add_argument("url", help="Webhook URL, e.g. http://localhost:8000/webhooks/recallai")
+    load_test_parser.add_argument("--events", type=int, default=LOAD_TEST_EVENTS, help="Number of events sent")
+    load_test_parser.add_argument(
+        "--rate", type=float, default=0.0, help="Events sent per second (default: as fast as possible)"
+    )
+    load_test_parser.add_argument(
+        "--concurrency", type=int, default=LOAD_TEST_CONCURRENCY, help="Maximum number of requests in flight"
+    )
+    load_test_parser.add_argument(
+        "--duplicates", type=float, default=0.0, help="Share of the events delivered again, between 0 and 1"
+    )
+    load_test_parser.add_argument(
+        "--secret", help="Signing secret or token of the webhook (default: RECALLAI_WEBHOOK_TOKEN)"
+    )
+    load_test_parser.set_defaults(func=load_test)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    cli()
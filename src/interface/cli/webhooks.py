@@ -0,0 +1,164 @@
+import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from time import perf_counter, sleep, time
+from typing import Iterator, Optional
+from uuid import uuid4
+
+import requests
+
+from src import API_KEYS
+from src.interface.wsgi.auth.webhook import SIGNING_SECRET_PREFIX, sign
+
+LOAD_TEST_EVENTS = 5000
+LOAD_TEST_CONCURRENCY = 64
+LOAD_TEST_TIMEOUT = 30.0
+BOT_STATUSES = ["joining_call", "in_waiting_room", "in_call_recording", "call_ended", "done"]
+
+
+def synthetic_events(count: int, duplicates: float = 0.0, seed: int = 0) -> Iterator[tuple[str, bytes]]:
+    """
+    `count` `(webhook id, body)` Recall.ai events, bot status changes and real-time transcript words. A `duplicates`
+    share of them are deliveries of an earlier event again, with its id and body.
+    """
+    rng = random.Random(seed)
+    sent = []
+    for _ in range(count):
+        if sent and rng.random() < duplicates:
+            yield rng.choice(sent)
+            continue
+        bot_id = f"bot_{rng.randrange(1000)}"
+        if rng.random() < 0.2:
+            event = {
+                "event": "bot.status_change",
+                "data": {"bot_id": bot_id, "status": {"code": rng.choice(BOT_STATUSES)}},
+            }
+        else:
+            start = rng.uniform(0, 3600)
+            words = [
+                {"text": f"word{index}", "start_time": start + index / 3, "end_time": start + index / 3 + 0.3}
+                for index in range(rng.randint(1, 20))
+            ]
+            event = {
+                "event": "transcript.data",
+                "data": {"bot_id": bot_id, "transcript": {"speaker": "Speaker", "words": words}},
+            }
+        delivery = (f"msg_{uuid4().hex}", json.dumps(event).encode())
+        sent.append(delivery)
+        yield delivery
+
+
+@dataclass
+class LoadTestReport:
+    sent: int = 0
+    accepted: int = 0
+    duplicates: int = 0
+    throttled: int = 0
+    errors: int = 0
+    max_retry_after: int = 0
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list, repr=False)
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    def to_dict(self) -> dict:
+        return {key: value for key, value in asdict(self).items() if key != "latencies"} | {
+            "requests_per_second": round(self.sent / self.elapsed, 1) if self.elapsed else 0.0,
+            **{f"p{round(q * 100)}_ms": round(self.percentile(q) * 1000, 1) for q in (0.5, 0.95, 0.99, 1.0)},
+        }
+
+
+class WebhookLoadTest:
+    """
+    Send Recall.ai events to a running `POST /webhooks/recallai` at `rate` requests per second (all at once when
+    0), from `concurrency` threads, signed like Svix does when `secret` is a signing secret, with the `token` query
+    parameter otherwise. Arrivals do not wait for responses, as with real bursts, and 429s are not retried.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        rate: float = 0.0,
+        concurrency: int = LOAD_TEST_CONCURRENCY,
+        secret: str = API_KEYS.RECALLAI_WEBHOOK_TOKEN,
+        timeout: float = LOAD_TEST_TIMEOUT,
+    ):
+        self.url = url
+        self.rate = rate
+        self.concurrency = concurrency
+        self.secret = secret
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _request(self, webhook_id: str, body: bytes) -> dict:
+        headers = {"content-type": "application/json"}
+        params = {}
+        if self.secret.startswith(SIGNING_SECRET_PREFIX):
+            timestamp = str(int(time()))
+            headers |= {
+                "webhook-id": webhook_id,
+                "webhook-timestamp": timestamp,
+                "webhook-signature": sign(self.secret, webhook_id, timestamp, body),
+            }
+        else:
+            params["token"] = self.secret
+        return {"headers": headers, "params": params, "data": body, "timeout": self.timeout}
+
+    def _send(self, report: LoadTestReport, webhook_id: str, body: bytes) -> None:
+        # one connection pool per thread, requests sessions are not thread-safe
+        session = getattr(self._local, "session", None) or requests.Session()
+        self._local.session = session
+        start = perf_counter()
+        try:
+            response = session.post(self.url, **self._request(webhook_id, body))
+        except requests.RequestException:
+            with self._lock:
+                report.errors += 1
+            return
+        latency = perf_counter() - start
+        with self._lock:
+            report.latencies.append(latency)
+            if response.status_code == 429:
+                report.throttled += 1
+                report.max_retry_after = max(report.max_retry_after, int(response.headers.get("Retry-After", 0)))
+            elif response.ok and response.json().get("status") == "duplicate":
+                report.duplicates += 1
+            elif response.ok:
+                report.accepted += 1
+            else:
+                report.errors += 1
+
+    def run(self, events: Iterator[tuple[str, bytes]]) -> LoadTestReport:
+        report = LoadTestReport()
+        start = perf_counter()
+        with ThreadPoolExecutor(self.concurrency) as pool:
+            for index, (webhook_id, body) in enumerate(events):
+                if self.rate:
+                    delay = start + index / self.rate - perf_counter()
+                    if delay > 0:
+                        sleep(delay)
+                pool.submit(self._send, report, webhook_id, body)
+                report.sent += 1
+        report.elapsed = perf_counter() - start
+        return report
+
+
+def run_load_test(
+    url: str,
+    events: int = LOAD_TEST_EVENTS,
+    rate: float = 0.0,
+    concurrency: int = LOAD_TEST_CONCURRENCY,
+    duplicates: float = 0.0,
+    secret: Optional[str] = None,
+) -> LoadTestReport:
+    load_test = WebhookLoadTest(
+        url, rate=rate, concurrency=concurrency, secret=secret or API_KEYS.RECALLAI_WEBHOOK_TOKEN
+    )
+    return load_test.run(synthetic_events(events, duplicates))
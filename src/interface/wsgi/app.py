@@ -5,13 +5,17 @@ from fastapi.concurrency import asynccontextmanager
 
 from src import PROJECT_ENVS
 from src.constants import Envs
+from src.db.engine import engines
+from src.infrastructure.cache import CacheInvalidationListener, app_cache
 from src.interface.wsgi.middlewares.setup import setup_middleware
+from src.interface.wsgi.routes.deal import deal_route
+from src.interface.wsgi.routes.org import org_route
 from src.interface.wsgi.routes.probes import probes_route
+from src.interface.wsgi.routes.recorder import recorder_route
 from src.interface.wsgi.routes.user import user_route
+from src.interface.wsgi.routes.webhooks import webhooks_route
 from src.interface.wsgi.setup import setup_datadog
-
-# from fastapi_pagination import add_pagination as setup_pagination
-
+from src.jobs.buffer import JobBuffer
 
 logger = logging.getLogger(__name__)
 setup_datadog()
@@ -19,9 +23,23 @@ setup_datadog()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app.state.cache = {}
+    app.state.cache = app_cache
+    app.state.engines = engines
+    engines.register()
+    engines.register_async()
+    cache_listener = CacheInvalidationListener(app_cache)
+    cache_listener.start()
+    app.state.webhook_buffer = JobBuffer()
+    app.state.webhook_buffer.start()
     logger.info("App ready")
     yield
+    await app.state.webhook_buffer.stop()
+    await cache_listener.stop()
+    engines.dispose_all()
+    await engines.dispose_all_async()
+    logger.info(
+        "App shutdown", extra={"cache": app_cache.to_dict(), "webhooks": app.state.webhook_buffer.metrics.to_dict()}
+    )
 
 
 def build_app() -> FastAPI:
@@ -38,10 +56,13 @@ def build_app() -> FastAPI:
     routes = [
         probes_route,
         user_route,
+        org_route,
+        deal_route,
+        recorder_route,
+        webhooks_route,
     ]
     for route in routes:
         app.include_router(route)
-    # setup_pagination(app)
 
     return app
 
@@ -1,5 +1,10 @@
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from typing import Optional
 
 import jwt
 
@@ -8,6 +13,156 @@ from src.interface.wsgi.auth.exceptions import UnableCredentialsException
 
 logger = logging.getLogger(__name__)
 
+JWKS_TTL_SECONDS = 600
+JWKS_MAX_STALE_SECONDS = 24 * 3600
+JWKS_MIN_REFRESH_INTERVAL_SECONDS = 30
+JWKS_REFRESH_WAIT_SECONDS = 10
+VERIFIED_TOKEN_CACHE_SIZE = 10_000
+
+
+class JwksCache:
+    """
+    Signing keys of one JWKS endpoint, keyed by `kid` and shared by every request of the process.
+
+    - Fresh keys (younger than `ttl`) are served from memory.
+    - Stale keys (younger than `max_stale`) are served while a background thread refetches the set.
+    - An unknown `kid` (or keys older than `max_stale`) triggers a blocking refetch; concurrent callers
+      wait for the single in-flight fetch instead of issuing their own, and refetches are throttled to
+      one per `min_refresh_interval` so random `kid`s cannot hammer the endpoint.
+    - A failed fetch keeps the previous keys, so a JWKS endpoint outage does not reject known keys.
+    """
+
+    def __init__(
+        self,
+        jwks_uri: str,
+        ttl: float = JWKS_TTL_SECONDS,
+        max_stale: float = JWKS_MAX_STALE_SECONDS,
+        min_refresh_interval: float = JWKS_MIN_REFRESH_INTERVAL_SECONDS,
+    ):
+        self.jwks_client = jwt.PyJWKClient(jwks_uri, cache_jwk_set=False)
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._fetched_at: Optional[float] = None
+        self._last_attempt: Optional[float] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._refreshed = threading.Condition(self._lock)
+
+    def get_signing_key_from_jwt(self, token: str) -> jwt.PyJWK:
+        kid = jwt.get_unverified_header(token).get("kid")
+        return self.get_signing_key(kid)
+
+    def get_signing_key(self, kid: str) -> jwt.PyJWK:
+        key = self._keys.get(kid)
+        age = time.monotonic() - self._fetched_at if self._fetched_at is not None else None
+        if key is not None and age < self.ttl:
+            return key
+        if key is not None and age < self.max_stale:
+            with self._lock:
+                scheduled = self._schedule_refresh()
+            if scheduled:
+                threading.Thread(target=self._fetch, daemon=True).start()
+            return key
+
+        self.refresh(wait=True)
+        key = self._keys.get(kid)
+        if key is None:
+            raise jwt.exceptions.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    def _schedule_refresh(self) -> bool:
+        """
+        Mark a fetch as in flight, unless one already is or was just attempted. Called with `_lock` held, so each
+        stale window starts a single fetch and a single thread.
+        """
+        now = time.monotonic()
+        throttled = self._last_attempt is not None and now - self._last_attempt < self.min_refresh_interval
+        if self._refreshing or throttled:
+            return False
+        self._refreshing = True
+        self._last_attempt = now
+        return True
+
+    def refresh(self, wait: bool = True) -> None:
+        """Refetch the key set unless a fetch is in flight (then optionally wait for it) or was just attempted."""
+        with self._lock:
+            if self._refreshing and wait:
+                self._refreshed.wait(timeout=JWKS_REFRESH_WAIT_SECONDS)
+                return
+            if not self._schedule_refresh():
+                return
+        self._fetch()
+
+    def _fetch(self) -> None:
+        keys = None
+        try:
+            jwk_set = self.jwks_client.get_jwk_set(refresh=True)
+            keys = {key.key_id: key for key in jwk_set.keys if key.key_id}
+        except jwt.exceptions.PyJWTError as e:
+            logger.warning(
+                f"Unable to refresh JWKS, keeping {len(self._keys)} cached keys: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+        finally:
+            with self._lock:
+                if keys is not None:
+                    self._keys = keys
+                    self._fetched_at = time.monotonic()
+                self._refreshing = False
+                self._refreshed.notify_all()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of already-verified token payloads, each entry expiring at the token's `exp`."""
+
+    def __init__(self, maxsize: int = VERIFIED_TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._payloads: OrderedDict[bytes, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts: str) -> bytes:
+        return hashlib.sha256("|".join(parts).encode()).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        with self._lock:
+            payload = self._payloads.get(key)
+            if payload is None:
+                return None
+            if payload["exp"] <= time.time():
+                del self._payloads[key]
+                return None
+            self._payloads.move_to_end(key)
+            return dict(payload)
+
+    def put(self, key: bytes, payload: dict) -> None:
+        if not isinstance(payload.get("exp"), (int, float)):
+            return
+        with self._lock:
+            self._payloads[key] = dict(payload)
+            self._payloads.move_to_end(key)
+            while len(self._payloads) > self.maxsize:
+                self._payloads.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._payloads.clear()
+
+
+_jwks_caches: dict[str, JwksCache] = {}
+_jwks_caches_lock = threading.Lock()
+verified_tokens = VerifiedTokenCache()
+
+
+def get_jwks_cache(jwks_uri: str) -> JwksCache:
+    with _jwks_caches_lock:
+        if jwks_uri not in _jwks_caches:
+            _jwks_caches[jwks_uri] = JwksCache(jwks_uri)
+        return _jwks_caches[jwks_uri]
+
 
 @dataclass
 class JsonWebToken:
@@ -28,9 +183,16 @@ class JsonWebToken:
 
     def validate(self):
         logger.debug(f"Starting Token validation\nAccess token: {self.jwt_access_token}")
+        # only signature-verified payloads are cached, keyed by everything the verification depended on
+        cacheable = self.options.get("verify_signature", True)
+        cache_key = VerifiedTokenCache.key(
+            self.jwt_access_token, str(self.auth0_audience), str(self.auth0_issuer_url), str(self.algorithm)
+        )
+        if cacheable and (payload := verified_tokens.get(cache_key)) is not None:
+            return payload
+
         try:
-            jwks_client = jwt.PyJWKClient(self.jwks_uri)
-            jwt_signing_key = jwks_client.get_signing_key_from_jwt(self.jwt_access_token).key
+            jwt_signing_key = get_jwks_cache(self.jwks_uri).get_signing_key_from_jwt(self.jwt_access_token).key
             payload = jwt.decode(
                 self.jwt_access_token,
                 jwt_signing_key,
@@ -61,6 +223,8 @@ class JsonWebToken:
             )
             raise e
 
+        if cacheable:
+            verified_tokens.put(cache_key, payload)
         return payload
 
 
@@ -0,0 +1,59 @@
+import base64
+import hashlib
+import hmac
+from time import time
+from typing import Mapping, Optional
+
+from src import API_KEYS, FAKE_API_KEY
+
+# Recall.ai delivers its webhooks through Svix, whose signing secrets look like `whsec_<base64 key>`
+SIGNING_SECRET_PREFIX = "whsec_"
+# older signatures are rejected, a captured request cannot be replayed later
+SIGNATURE_TOLERANCE = 300
+
+
+def webhook_header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    """Svix `webhook-<name>` header, also sent as `svix-<name>`."""
+    return headers.get(f"webhook-{name}") or headers.get(f"svix-{name}")
+
+
+def sign(secret: str, message_id: str, timestamp: str, body: bytes) -> str:
+    key = base64.b64decode(secret.removeprefix(SIGNING_SECRET_PREFIX))
+    digest = hmac.new(key, f"{message_id}.{timestamp}.".encode() + body, hashlib.sha256).digest()
+    return f"v1,{base64.b64encode(digest).decode()}"
+
+
+def webhook_secret_configured(secret: str) -> bool:
+    """False for an unset secret, `FAKE_API_KEY` being the default of every unset API key."""
+    return bool(secret) and secret != FAKE_API_KEY
+
+
+def verify_signature(
+    secret: str, headers: Mapping[str, str], body: bytes, tolerance: float = SIGNATURE_TOLERANCE
+) -> bool:
+    message_id, timestamp, signatures = (webhook_header(headers, name) for name in ("id", "timestamp", "signature"))
+    if not (message_id and timestamp and signatures):
+        return False
+    try:
+        if abs(time() - int(timestamp)) > tolerance:
+            return False
+    except ValueError:
+        return False
+    expected = sign(secret, message_id, timestamp, body).encode()
+    # several space separated signatures are sent while the secret is rotated
+    return any(hmac.compare_digest(expected, signature.encode()) for signature in signatures.split())
+
+
+def verify_recallai_request(
+    headers: Mapping[str, str], body: bytes, token: Optional[str], secret: Optional[str] = None
+) -> bool:
+    """
+    Check the Svix signature of the request when `RECALLAI_WEBHOOK_TOKEN` is a signing secret, else the `token`
+    query parameter of the webhook URL. Every request is refused while the secret is not configured.
+    """
+    secret = API_KEYS.RECALLAI_WEBHOOK_TOKEN if secret is None else secret
+    if not webhook_secret_configured(secret):
+        return False
+    if secret.startswith(SIGNING_SECRET_PREFIX):
+        return verify_signature(secret, headers, body)
+    return token is not None and hmac.compare_digest(token.encode(), secret.encode())
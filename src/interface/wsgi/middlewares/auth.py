@@ -1,14 +1,32 @@
 import secure
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class SecureHeadersMiddleware(BaseHTTPMiddleware):
+class SecureHeadersMiddleware:
+    """
+    Pure ASGI middleware adding the `secure` headers to every HTTP response.
+
+    The header bytes are computed once at startup and appended to the `http.response.start` message, so the
+    response body is never wrapped or re-streamed.
+    """
+
     def __init__(self, app: ASGIApp, secure_headers: secure.Secure) -> None:
-        super().__init__(app)
-        self.secure_headers = secure_headers
+        self.app = app
+        self.raw_headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in secure_headers.headers.items()
+        ]
+        self.header_names = {name for name, _ in self.raw_headers}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_secure_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # secure headers override any value set by the endpoint
+                headers = [header for header in message.get("headers", []) if header[0] not in self.header_names]
+                message = {**message, "headers": headers + self.raw_headers}
+            await send(message)
 
-    async def dispatch(self, request, call_next):
-        response = await call_next(request)
-        self.secure_headers.framework.fastapi(response)
-        return response
+        await self.app(scope, receive, send_with_secure_headers)
@@ -0,0 +1,59 @@
+import logging
+from typing import Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROBE_PATHS = ("/healthcheck", "/startup", "/readiness")
+MAX_LOGGED_BODY_BYTES = 4096
+
+
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI middleware logging incoming requests at DEBUG level.
+
+    Nothing is read when DEBUG is disabled for this logger. Otherwise at most `max_body_bytes` of the request
+    body are read ahead and replayed to the application, so uploads are never buffered whole.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        skip_paths: Iterable[str] = PROBE_PATHS,
+        max_body_bytes: int = MAX_LOGGED_BODY_BYTES,
+    ) -> None:
+        self.app = app
+        self.skip_paths = frozenset(skip_paths)
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.skip_paths or not logger.isEnabledFor(logging.DEBUG):
+            await self.app(scope, receive, send)
+            return
+
+        buffered: list[Message] = []
+        size = 0
+        more_body = True
+        while more_body and size < self.max_body_bytes:
+            message = await receive()
+            buffered.append(message)
+            if message["type"] != "http.request":
+                break
+            size += len(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        body = b"".join(message.get("body", b"") for message in buffered if message["type"] == "http.request")
+        truncated = "..." if more_body or len(body) > self.max_body_bytes else ""
+        params = scope.get("query_string", b"").decode("latin-1")
+        logger.debug(
+            f"Endpoint called: {scope['path']}, Method: {scope['method']}, "
+            f"Params: {params}, Body: {body[: self.max_body_bytes]!r}{truncated}"
+        )
+
+        async def replay_receive() -> Message:
+            if buffered:
+                return buffered.pop(0)
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
@@ -1,9 +1,10 @@
 import logging
 
 import secure
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 
 from src.interface.wsgi.middlewares.auth import SecureHeadersMiddleware
+from src.interface.wsgi.middlewares.request_logging import RequestLoggingMiddleware
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +18,7 @@ def setup_middleware(app: FastAPI) -> None:
     :type app: FastAPI
     """
 
-    @app.middleware("http")
-    async def log_requests(request: Request, call_next):
-        if request.url.path not in ["/healthcheck", "/startup", "/readiness"]:
-            logger.debug(
-                f"Endpoint called: {request.url.path}, Method: {request.method}, Params: {request.query_params}, Body: {await request.body()}"
-            )
-
-        response = await call_next(request)
-        return response
-
+    app.add_middleware(RequestLoggingMiddleware)
     app.add_middleware(
         SecureHeadersMiddleware,
         secure_headers=secure.Secure(
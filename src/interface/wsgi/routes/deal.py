@@ -1,13 +1,17 @@
 import logging
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import PROJECT_ENVS
+from src.infrastructure.cache import cached
 from src.interface.wsgi.auth.dependencies import Authenticator
-from src.interface.wsgi.setup import get_db
-from src.repository.deal import DealRepository
+from src.interface.wsgi.setup import get_async_db
+from src.repository.base import LIST_DEFAULT_LIMIT, LIST_MAX_LIMIT, UPSERT_CHUNK_SIZE
+from src.repository.deal import AsyncDealRepository
+from src.schema.base import CursorPage
 from src.schema.deal import DealSchema
 
 deal_route = APIRouter(
@@ -21,14 +25,37 @@ deal_route = APIRouter(
 logger = logging.getLogger(__name__)
 
 
+@deal_route.get(
+    "/",
+    response_model=CursorPage[DealSchema],
+    response_description="List deals, newest first, with keyset pagination",
+)
+async def get_list(
+    org_id: Optional[str] = None,
+    status_: Optional[str] = Query(None, alias="status"),
+    limit: int = Query(LIST_DEFAULT_LIMIT, gt=0, le=LIST_MAX_LIMIT),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    filters = {key: value for key, value in {"org_id": org_id, "status": status_}.items() if value is not None}
+    try:
+        return await AsyncDealRepository(db).list(filters=filters, limit=limit, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing deals: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 @deal_route.get(
     "/{deal_id}",
     response_model=DealSchema,
     response_description="Retrieve a deal by ID",
 )
-def get(deal_id: str, db: Session = Depends(get_db)):
+@cached("deal", key="deal_id", schema=DealSchema)
+async def get(deal_id: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        deal = DealRepository(db).read(_id=deal_id)
+        deal = await AsyncDealRepository(db).read(_id=deal_id)
         if not deal:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
         return deal
@@ -38,18 +65,31 @@ def get(deal_id: str, db: Session = Depends(get_db)):
 
 
 @deal_route.post("/", response_model=DealSchema, response_description="Create a new deal")
-def post(model: DealSchema, db: Session = Depends(get_db)):
+async def post(model: DealSchema, db: AsyncSession = Depends(get_async_db)):
     try:
-        return DealRepository(db).upsert(data=model)
+        return await AsyncDealRepository(db).upsert(data=model)
     except Exception as e:
         logger.error(f"Error creating deal: {e}", exc_info=PROJECT_ENVS.DEBUG)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@deal_route.post("/batch", response_description="Create or update deals in bulk, one statement per chunk")
+async def post_batch(
+    models: list[DealSchema],
+    chunk_size: int = Query(UPSERT_CHUNK_SIZE, gt=0, le=5_000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await AsyncDealRepository(db).bulk_upsert(data=models, chunk_size=chunk_size)
+    except Exception as e:
+        logger.error(f"Error upserting deals: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 @deal_route.delete("/{deal_id}", response_description="Delete a deal by ID")
-def delete(deal_id: str, db: Session = Depends(get_db)):
+async def delete(deal_id: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        result = DealRepository(db).delete(_id=deal_id)
+        result = await AsyncDealRepository(db).delete(_id=deal_id)
         if not result:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
         return JSONResponse(
@@ -62,9 +102,9 @@ def delete(deal_id: str, db: Session = Depends(get_db)):
 
 
 @deal_route.patch("/", response_model=DealSchema, response_description="Update an existing deal")
-def patch(model: DealSchema, db: Session = Depends(get_db)):
+async def patch(model: DealSchema, db: AsyncSession = Depends(get_async_db)):
     try:
-        updated_deal = DealRepository(db).update(_id=model.id, data=model)
+        updated_deal = await AsyncDealRepository(db).update(_id=model.id, data=model)
         if not updated_deal:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
         return updated_deal
@@ -1,14 +1,23 @@
 import logging
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import PROJECT_ENVS
+from src.db.engine import engines
+from src.infrastructure.cache import cached
 from src.interface.wsgi.auth.dependencies import Authenticator
-from src.interface.wsgi.setup import get_db
-from src.repository.org import OrgRepository
+from src.interface.wsgi.setup import get_async_db
+from src.repository.base import LIST_DEFAULT_LIMIT, LIST_MAX_LIMIT, STREAM_BATCH_SIZE, UPSERT_CHUNK_SIZE
+from src.repository.deal import AsyncDealRepository
+from src.repository.org import AsyncOrgRepository
+from src.repository.recording import AsyncRecordingRepository
+from src.repository.user import AsyncUserRepository
+from src.schema.base import CursorPage
 from src.schema.org import OrgSchema
+from src.utils.export_utils import export_chunks, gzip_chunks
 
 org_route = APIRouter(
     prefix="/org",
@@ -20,11 +29,41 @@ org_route = APIRouter(
 # Set up logger
 logger = logging.getLogger(__name__)
 
+EXPORT_REPOSITORIES = {
+    "user": AsyncUserRepository,
+    "deal": AsyncDealRepository,
+    "recording": AsyncRecordingRepository,
+}
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@org_route.get(
+    "/",
+    response_model=CursorPage[OrgSchema],
+    response_description="List orgs, newest first, with keyset pagination",
+)
+async def get_list(
+    status_: Optional[str] = Query(None, alias="status"),
+    domain: Optional[str] = None,
+    limit: int = Query(LIST_DEFAULT_LIMIT, gt=0, le=LIST_MAX_LIMIT),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    filters = {key: value for key, value in {"status": status_, "domain": domain}.items() if value is not None}
+    try:
+        return await AsyncOrgRepository(db).list(filters=filters, limit=limit, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing orgs: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
 
 @org_route.get("/{org_id}", response_model=OrgSchema, response_description="Retrieve a org by ID")
-def get(org_id: str, db: Session = Depends(get_db)):
+@cached("org", key="org_id", schema=OrgSchema)
+async def get(org_id: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        org = OrgRepository(db).read(_id=org_id)
+        org = await AsyncOrgRepository(db).read(_id=org_id)
         if not org:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Org not found")
         return org
@@ -33,19 +72,76 @@ def get(org_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@org_route.get("/{org_id}/export", response_description="Stream every user, deal or recording of an org")
+async def export(
+    request: Request,
+    org_id: str,
+    entity: Literal["user", "deal", "recording"] = "recording",
+    format: Literal["ndjson", "csv"] = "ndjson",
+    batch_size: int = Query(STREAM_BATCH_SIZE, gt=0, le=10_000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Rows are read through a server-side cursor and written to the response batch by batch, so memory stays flat
+    whatever the size of the org. The body is gzipped when the client accepts it, and the export stops as soon as
+    the client disconnects.
+    """
+    try:
+        org = await AsyncOrgRepository(db).read(_id=org_id)
+    except Exception as e:
+        logger.error(f"Error retrieving org with ID {org_id}: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    if not org:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Org not found")
+
+    repository_class = EXPORT_REPOSITORIES[entity]
+
+    async def body():
+        # the request session is closed before the body is streamed, the export holds its own
+        async with engines.get_async().context_session() as export_db:
+            repository = repository_class(export_db)
+            batches = repository.stream({"org_id": org_id}, batch_size=batch_size)
+            name = f"{entity} of org {org_id}"
+            async for chunk in export_chunks(batches, repository.model_schema, format, request.is_disconnected, name):
+                yield chunk
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{org_id}_{entity}.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    content = body()
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        content = gzip_chunks(content)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(content, media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
+
+
 @org_route.post("/", response_model=OrgSchema, response_description="Create a new org")
-def post(model: OrgSchema, db: Session = Depends(get_db)):
+async def post(model: OrgSchema, db: AsyncSession = Depends(get_async_db)):
     try:
-        return OrgRepository(db).upsert(data=model)
+        return await AsyncOrgRepository(db).upsert(data=model)
     except Exception as e:
         logger.error(f"Error creating org: {e}", exc_info=PROJECT_ENVS.DEBUG)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@org_route.post("/batch", response_description="Create or update orgs in bulk, one statement per chunk")
+async def post_batch(
+    models: list[OrgSchema],
+    chunk_size: int = Query(UPSERT_CHUNK_SIZE, gt=0, le=5_000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await AsyncOrgRepository(db).bulk_upsert(data=models, chunk_size=chunk_size)
+    except Exception as e:
+        logger.error(f"Error upserting orgs: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 @org_route.delete("/{org_id}", response_description="Delete a org by ID")
-def delete(org_id: str, db: Session = Depends(get_db)):
+async def delete(org_id: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        result = OrgRepository(db).delete(_id=org_id)
+        result = await AsyncOrgRepository(db).delete(_id=org_id)
         if not result:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Org not found")
         return JSONResponse(
@@ -58,9 +154,9 @@ def delete(org_id: str, db: Session = Depends(get_db)):
 
 
 @org_route.patch("/", response_model=OrgSchema, response_description="Update an existing org")
-def patch(model: OrgSchema, db: Session = Depends(get_db)):
+async def patch(model: OrgSchema, db: AsyncSession = Depends(get_async_db)):
     try:
-        updated_org = OrgRepository(db).update(_id=model.id, data=model)
+        updated_org = await AsyncOrgRepository(db).update(_id=model.id, data=model)
         if not updated_org:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Org not found")
         return updated_org
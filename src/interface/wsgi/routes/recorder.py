@@ -1,13 +1,22 @@
 import logging
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import PROJECT_ENVS
+from src.constants import Statues
 from src.interface.wsgi.auth.dependencies import Authenticator
-from src.interface.wsgi.setup import get_db
-from src.schema.user import UserSchema
+from src.interface.wsgi.setup import get_async_db
+from src.jobs.recording import RECORDING_QUEUE, ingest_recording
+from src.repository.base import LIST_DEFAULT_LIMIT, LIST_MAX_LIMIT
+from src.repository.recording import AsyncRecordingRepository
+from src.repository.transcript import AsyncTranscriptRepository
+from src.schema.base import CursorPage, SearchPage
+from src.schema.job import JobSchema
+from src.schema.recording import RecordingSchema, RecordingSearchResult
+from src.schema.transcript import TranscriptSegment
 
 recorder_route = APIRouter(
     prefix="/recorder",
@@ -20,62 +29,147 @@ recorder_route = APIRouter(
 logger = logging.getLogger(__name__)
 
 
+# before `/{org_id}/{email}`, which would match it too
+@recorder_route.get(
+    "/{recording_id}/transcript",
+    response_model=list[TranscriptSegment],
+    response_description="Retrieve the transcript segments of a recording overlapping the start to end seconds range",
+)
+async def get_transcript(
+    recording_id: str,
+    start: Optional[float] = Query(None, ge=0),
+    end: Optional[float] = Query(None, gt=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if start is not None and end is not None and start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    try:
+        segments = await AsyncTranscriptRepository(db).segments(recording_id=recording_id, start=start, end=end)
+        # an unknown recording has no transcript either, only then is it looked up
+        recording_exists = bool(segments) or await AsyncRecordingRepository(db).read(_id=recording_id) is not None
+    except Exception as e:
+        logger.error(f"Error retrieving the transcript of recording {recording_id}: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    if segments is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Unable to read the transcript")
+    if not recording_exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recording not found")
+    return segments
+
+
 @recorder_route.get(
     "/{org_id}/{email}",
-    response_model=UserSchema,
-    response_description="Retrieve recordings by org_id and email",
+    response_model=CursorPage[RecordingSchema],
+    response_description="Retrieve recordings by org_id and participant email",
 )
-def get(org_id: str, email: str, db: Session = Depends(get_db)):
+async def get_list(
+    org_id: str,
+    email: str,
+    limit: int = Query(LIST_DEFAULT_LIMIT, gt=0, le=LIST_MAX_LIMIT),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
     try:
-        records = None
-        if not records:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        return records
+        return await AsyncRecordingRepository(db).find_by_participant(
+            org_id=org_id, email=email, limit=limit, after=after
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(
-            f"Error retrieving user with email {email}: {e}",
+            f"Error retrieving recordings of {email}: {e}",
             exc_info=PROJECT_ENVS.DEBUG,
         )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
-@recorder_route.post("/", response_model=UserSchema, response_description="Create a new recording")
-def post(model: UserSchema, db: Session = Depends(get_db)):
+@recorder_route.get(
+    "/search",
+    response_model=SearchPage[RecordingSearchResult],
+    response_description="Search the titles and descriptions of the org's recordings, best matches first among the "
+    "newest matches, `truncated` when older matches were left out",
+)
+async def search(
+    org_id: str,
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(LIST_DEFAULT_LIMIT, gt=0, le=LIST_MAX_LIMIT),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Only the `SEARCH_MAX_CANDIDATES` newest matching recordings are ranked and paged. When more recordings match,
+    `truncated` is true and the older matches are not reachable from any page: narrow the query to find them.
+    """
+    try:
+        return await AsyncRecordingRepository(db).search(org_id=org_id, query=q, limit=limit, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching recordings of org {org_id}: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@recorder_route.get("/{recording_id}", response_model=RecordingSchema, response_description="Retrieve a recording")
+async def get(recording_id: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        return None
+        recording = await AsyncRecordingRepository(db).read(_id=recording_id)
+    except Exception as e:
+        logger.error(f"Error retrieving recording with ID {recording_id}: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    if not recording:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recording not found")
+    return recording
+
+
+@recorder_route.post(
+    "/",
+    response_model=RecordingSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    response_description="Create a new recording, its video is ingested by a job worker",
+)
+async def post(model: RecordingSchema, db: AsyncSession = Depends(get_async_db)):
+    """An existing recording only gets its details updated, its ingestion is left as it is."""
+    try:
+        model.status = Statues.PENDING.value
+        job = JobSchema(name=ingest_recording.__name__, payload={"recording_id": model.id}, queue=RECORDING_QUEUE)
+        recording = await AsyncRecordingRepository(db).upsert_for_ingestion(data=model, job=job)
     except Exception as e:
         logger.error(f"Error creating recording: {e}", exc_info=PROJECT_ENVS.DEBUG)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    if not recording:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Recording not created")
+    return recording
 
 
 @recorder_route.delete("/{recording_id}", response_description="Delete a recording")
-def delete(recording_id: str, db: Session = Depends(get_db)):
+async def delete(recording_id: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        result = None
-        if not result:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recording not found")
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={"detail": "Recording deleted successfully"},
-        )
+        result = await AsyncRecordingRepository(db).delete(_id=recording_id)
     except Exception as e:
         logger.error(
             f"Error deleting recording with ID {recording_id}: {e}",
             exc_info=PROJECT_ENVS.DEBUG,
         )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recording not found")
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"detail": "Recording deleted successfully"},
+    )
 
 
-@recorder_route.patch("/", response_model=UserSchema, response_description="Update an existing recording")
-def patch(recording: UserSchema, db: Session = Depends(get_db)):
+@recorder_route.patch("/", response_model=RecordingSchema, response_description="Update an existing recording")
+async def patch(recording: RecordingSchema, db: AsyncSession = Depends(get_async_db)):
+    data = recording.model_dump(exclude_unset=True)
     try:
-        updated_recording = None
-        if not updated_recording:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recording not found")
-        return updated_recording
+        updated_recording = await AsyncRecordingRepository(db).update(_id=recording.id, data=data, fields=list(data))
     except Exception as e:
         logger.error(
             f"Error updating recording with ID {recording.id}: {e}",
             exc_info=PROJECT_ENVS.DEBUG,
         )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    if not updated_recording:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recording not found")
+    return updated_recording
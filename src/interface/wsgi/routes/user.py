@@ -1,14 +1,16 @@
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import PROJECT_ENVS
 from src.interface.wsgi.auth.dependencies import Authenticator
-from src.interface.wsgi.setup import get_db
-from src.repository.user import UserRepository
+from src.interface.wsgi.setup import get_async_db
+from src.repository.base import LIST_DEFAULT_LIMIT, LIST_MAX_LIMIT, UPSERT_CHUNK_SIZE
+from src.repository.user import AsyncUserRepository
+from src.schema.base import CursorPage
 from src.schema.user import UserSchema
 
 user_route = APIRouter(
@@ -22,10 +24,32 @@ user_route = APIRouter(
 logger = logging.getLogger(__name__)
 
 
-@user_route.get("/", response_model=UserSchema, response_description="Retrieve a user by ID")
-def get(user_id: Optional[str] = None, db: Session = Depends(get_db)):
+@user_route.get(
+    "/",
+    response_model=CursorPage[UserSchema],
+    response_description="List users, newest first, with keyset pagination",
+)
+async def get_list(
+    org_id: Optional[str] = None,
+    role: Optional[str] = None,
+    limit: int = Query(LIST_DEFAULT_LIMIT, gt=0, le=LIST_MAX_LIMIT),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    filters = {key: value for key, value in {"org_id": org_id, "role": role}.items() if value is not None}
+    try:
+        return await AsyncUserRepository(db).list(filters=filters, limit=limit, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing users: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@user_route.get("/{user_id}", response_model=UserSchema, response_description="Retrieve a user by ID")
+async def get(user_id: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        user = UserRepository(db).read(_id=user_id)
+        user = await AsyncUserRepository(db).read(_id=user_id)
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         return user
@@ -35,18 +59,31 @@ def get(user_id: Optional[str] = None, db: Session = Depends(get_db)):
 
 
 @user_route.post("/", response_model=UserSchema, response_description="Create a new user")
-def post(model: UserSchema, db: Session = Depends(get_db)):
+async def post(model: UserSchema, db: AsyncSession = Depends(get_async_db)):
     try:
-        return UserRepository(db).upsert(data=model)
+        return await AsyncUserRepository(db).upsert(data=model)
     except Exception as e:
         logger.error(f"Error creating user: {e}", exc_info=PROJECT_ENVS.DEBUG)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@user_route.post("/batch", response_description="Create or update users in bulk, one statement per chunk")
+async def post_batch(
+    models: list[UserSchema],
+    chunk_size: int = Query(UPSERT_CHUNK_SIZE, gt=0, le=5_000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await AsyncUserRepository(db).bulk_upsert(data=models, chunk_size=chunk_size)
+    except Exception as e:
+        logger.error(f"Error upserting users: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 @user_route.delete("/{user_id}", response_description="Delete a user by ID")
-def delete(user_id: Optional[str] = None, db: Session = Depends(get_db)):
+async def delete(user_id: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
     try:
-        result = UserRepository(db).delete(_id=user_id)
+        result = await AsyncUserRepository(db).delete(_id=user_id)
         if not result:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         return JSONResponse(
@@ -59,9 +96,9 @@ def delete(user_id: Optional[str] = None, db: Session = Depends(get_db)):
 
 
 @user_route.patch("/", response_model=UserSchema, response_description="Update an existing user")
-def patch(model: UserSchema, db: Session = Depends(get_db)):
+async def patch(model: UserSchema, db: AsyncSession = Depends(get_async_db)):
     try:
-        updated_user = UserRepository(db).update(_id=model.id, data=model)
+        updated_user = await AsyncUserRepository(db).update(_id=model.id, data=model)
         if not updated_user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         return updated_user
@@ -0,0 +1,65 @@
+import hashlib
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+
+from src import API_KEYS, PROJECT_ENVS
+from src.infrastructure.cache import LRUCache
+from src.interface.wsgi.auth.webhook import verify_recallai_request, webhook_header, webhook_secret_configured
+from src.jobs.buffer import BufferFull
+from src.jobs.recallai import recallai_job
+
+webhooks_route = APIRouter(
+    prefix="/webhooks",
+    tags=["webhooks"],
+    responses={404: {"description": "Not Found"}},
+)
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# ids of the events accepted lately, an event is delivered again until its delivery is acknowledged
+recent_events = LRUCache(maxsize=int(PROJECT_ENVS.WEBHOOK_DEDUP_ENTRIES), ttl=float(PROJECT_ENVS.WEBHOOK_DEDUP_TTL))
+
+
+@webhooks_route.post(
+    "/recallai",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_description="Accept a Recall.ai event, processed by a job worker",
+)
+async def recallai(request: Request, token: Optional[str] = None):
+    """
+    Authenticated by the webhook signature or the `token` query parameter. Events are buffered and enqueued in
+    batches, `429` with a `Retry-After` header is returned while the buffer is full. Events are de-duplicated on
+    their `webhook-id`, or on their body when they have none. `503` while `RECALLAI_WEBHOOK_TOKEN` is not set.
+    """
+    if not webhook_secret_configured(API_KEYS.RECALLAI_WEBHOOK_TOKEN):
+        logger.error("RECALLAI_WEBHOOK_TOKEN is not set, Recall.ai events are refused")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Webhook not configured")
+    body = await request.body()
+    if not verify_recallai_request(request.headers, body, token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook token or signature")
+    try:
+        event = json.loads(body)
+    except ValueError:
+        event = None
+    if not isinstance(event, dict) or not isinstance(event.get("event"), str):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Recall.ai event")
+
+    event_id = webhook_header(request.headers, "id") or hashlib.sha256(body).hexdigest()
+    if recent_events.get(event_id):
+        return {"status": "duplicate", "id": event_id}
+    try:
+        request.app.state.webhook_buffer.put(recallai_job(event_id, event))
+    except BufferFull as e:
+        logger.warning(f"Webhook buffer full, Recall.ai event {event_id} refused")
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": "Too many events, retry later"},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    recent_events.set(event_id, True)
+    return {"status": "accepted", "id": event_id}
@@ -1,12 +1,16 @@
-from typing import Iterator
+from typing import AsyncIterator, Iterator
 
 from datadog import initialize
 from ddtrace import patch_all, tracer
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src import DATABASE_URI, PROJECT_ENVS
+from src import PROJECT_ENVS
 from src.constants import Envs
-from src.db.db import FastAPISessionMaker
+from src.db.db import AsyncFastAPISessionMaker, FastAPISessionMaker
+from src.db.engine import engines
+from src.infrastructure.cache import AppCache
 
 # Automatically patch libraries for tracing
 patch_all()
@@ -22,15 +26,28 @@ else:
 
 
 def _get_fastapi_sessionmaker() -> FastAPISessionMaker:
-    return FastAPISessionMaker(DATABASE_URI)
+    return engines.get()
+
+
+def _get_async_fastapi_sessionmaker() -> AsyncFastAPISessionMaker:
+    return engines.get_async()
 
 
 def get_db() -> Iterator[Session]:
     yield from _get_fastapi_sessionmaker().get_db()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async for session in _get_async_fastapi_sessionmaker().get_db():
+        yield session
+
+
+def get_cache(request: Request) -> AppCache:
+    return request.app.state.cache
+
+
 def setup_datadog() -> None:
     initialize(
         statsd_host=PROJECT_ENVS.DD_AGENT_HOST,
-        statsd_port=PROJECT_ENVS.DD_TRACE_AGENT_PORT,
+        statsd_port=PROJECT_ENVS.DD_DOGSTATSD_PORT,
     )
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import math
+from dataclasses import asdict, dataclass
+from time import monotonic
+from typing import Optional
+
+from src import PROJECT_ENVS
+from src.db.db import AsyncFastAPISessionMaker
+from src.db.engine import engines
+from src.repository.job import AsyncJobRepository
+from src.schema.job import JobSchema
+
+logger = logging.getLogger(__name__)
+
+JOB_BUFFER_BATCH_SIZE = 500
+JOB_BUFFER_BACKOFF = 0.5
+JOB_BUFFER_MAX_BACKOFF = 30.0
+# bounds of the delay producers are told to wait before retrying, in seconds
+JOB_BUFFER_MIN_RETRY_AFTER = 1
+JOB_BUFFER_MAX_RETRY_AFTER = 60
+JOB_BUFFER_STOP_TIMEOUT = 10.0
+
+
+class BufferFull(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job buffer full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class JobBufferMetrics:
+    """Counters collected by `JobBuffer`."""
+
+    accepted: int = 0
+    rejected: int = 0
+    enqueued: int = 0
+    # jobs whose id was already in the job table
+    skipped: int = 0
+    flush_errors: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class JobBuffer:
+    """
+    Bounded in-process buffer between bursty producers, e.g. webhooks, and the `job` table.
+
+    `put` never waits: it accepts a job while fewer than `maxsize` are buffered and raises `BufferFull` otherwise,
+    with the number of seconds the buffer needs to drain at its recent rate. A background task inserts the buffered
+    jobs in multi-row batches of up to `batch_size`, so a burst costs a few round trips instead of one per job, and
+    skips the ids already in the table. A failed insert is retried with exponential backoff while `put` keeps
+    accepting jobs up to the bound.
+
+    Buffered jobs are lost if the process dies, `stop` flushes them on a clean shutdown.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = PROJECT_ENVS.WEBHOOK_BUFFER_SIZE,
+        batch_size: int = JOB_BUFFER_BATCH_SIZE,
+        session_maker: Optional[AsyncFastAPISessionMaker] = None,
+    ):
+        self.maxsize = int(maxsize)
+        self.batch_size = batch_size
+        self.session_maker = session_maker
+        self.metrics = JobBufferMetrics()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # jobs inserted per second, exponentially averaged over the last flushes
+        self._rate: Optional[float] = None
+        # delay before retrying the failed insert, 0 while inserts succeed
+        self._backoff = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self.session_maker = self.session_maker or engines.get_async()
+            self._queue = asyncio.Queue(self.maxsize)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = JOB_BUFFER_STOP_TIMEOUT) -> None:
+        """Insert the buffered jobs, waiting up to `timeout` seconds, then stop."""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"{len(self)} buffered jobs lost, the job table did not accept them in {timeout}s")
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def __len__(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def put(self, job: JobSchema) -> None:
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.metrics.rejected += 1
+            raise BufferFull(self.retry_after())
+        self.metrics.accepted += 1
+
+    def retry_after(self) -> int:
+        """Seconds the buffered jobs need to drain at the recent rate, the pending backoff while inserts fail."""
+        if self._backoff:
+            seconds = self._backoff
+        elif self._rate:
+            seconds = len(self) / self._rate
+        else:
+            seconds = JOB_BUFFER_MIN_RETRY_AFTER
+        return int(min(JOB_BUFFER_MAX_RETRY_AFTER, max(JOB_BUFFER_MIN_RETRY_AFTER, math.ceil(seconds))))
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: list[JobSchema]) -> None:
+        while True:
+            started = monotonic()
+            enqueued = None
+            try:
+                async with self.session_maker.context_session() as db:
+                    enqueued = await AsyncJobRepository(db).enqueue_many(batch, skip_existing=True)
+            except Exception as e:
+                logger.error(f"Error enqueuing {len(batch)} buffered jobs: {e}", exc_info=PROJECT_ENVS.DEBUG)
+            if enqueued is not None:
+                break
+            self.metrics.flush_errors += 1
+            self._backoff = min(JOB_BUFFER_MAX_BACKOFF, self._backoff * 2 or JOB_BUFFER_BACKOFF)
+            logger.warning(f"Enqueuing {len(batch)} buffered jobs failed, retrying in {self._backoff}s")
+            await asyncio.sleep(self._backoff)
+
+        self._backoff = 0.0
+        rate = len(batch) / max(monotonic() - started, 1e-3)
+        self._rate = rate if self._rate is None else 0.8 * self._rate + 0.2 * rate
+        self.metrics.enqueued += enqueued
+        self.metrics.skipped += len(batch) - enqueued
@@ -0,0 +1,58 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict
+from uuid import NAMESPACE_URL, uuid5
+
+from src.jobs.worker import task
+from src.schema.job import JobSchema
+
+logger = logging.getLogger(__name__)
+
+RECALLAI_QUEUE = "recallai"
+
+RecallaiHandler = Callable[[dict], Awaitable[Any]]
+
+RECALLAI_HANDLERS: Dict[str, RecallaiHandler] = {}
+
+
+def on_event(*events: str):
+    """Register the decorated coroutine function as the handler of the Recall.ai `events`, called with their data."""
+
+    def decorator(handler: RecallaiHandler) -> RecallaiHandler:
+        for event in events:
+            RECALLAI_HANDLERS[event] = handler
+        return handler
+
+    return decorator
+
+
+def recallai_job(event_id: str, event: dict) -> JobSchema:
+    """Job processing a webhook `event`, its id derived from `event_id` so a redelivered event is enqueued once."""
+    return JobSchema(
+        id=str(uuid5(NAMESPACE_URL, f"recallai:{event_id}")),
+        name=process_recallai_event.__name__,
+        queue=RECALLAI_QUEUE,
+        payload={
+            "event": event["event"],
+            "data": event.get("data") or {},
+            "event_id": event_id,
+            "received_at": datetime.now(timezone.utc).isoformat(),
+        },
+    )
+
+
+@task(queue=RECALLAI_QUEUE)
+async def process_recallai_event(event: str, data: dict, event_id: str = None, received_at: str = None) -> Any:
+    """Run the handler of a Recall.ai event accepted by `POST /webhooks/recallai`, events without one are dropped."""
+    handler = RECALLAI_HANDLERS.get(event)
+    if handler is None:
+        logger.debug(f"No handler for Recall.ai event {event} {event_id}, skipping it")
+        return None
+    return await handler(data)
+
+
+@on_event("bot.status_change")
+async def log_bot_status(data: dict) -> None:
+    bot_id = data.get("bot_id") or (data.get("bot") or {}).get("id")
+    status = data.get("status") or data.get("data") or {}
+    logger.info(f"Recall.ai bot {bot_id} is {status.get('code')}", extra={"status": status})
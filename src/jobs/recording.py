@@ -0,0 +1,56 @@
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from src import PROJECT_ENVS
+from src.constants import Statues
+from src.db.engine import engines
+from src.jobs.worker import task
+from src.repository.recording import AsyncRecordingRepository
+from src.schema.recording import RecordingSchema
+from src.utils.s3_utils import AWSUtils
+
+logger = logging.getLogger(__name__)
+
+RECORDING_QUEUE = "recording"
+
+
+@lru_cache
+def get_aws_utils() -> AWSUtils:
+    return AWSUtils()
+
+
+def recording_key(recording: RecordingSchema) -> str:
+    return f"{recording.org_id}/{recording.id}.mp4"
+
+
+@task(queue=RECORDING_QUEUE)
+async def ingest_recording(
+    recording_id: str, bucket: str = PROJECT_ENVS.RECORDINGS_BUCKET
+) -> Optional[RecordingSchema]:
+    """
+    Stream the video of a pending recording from its `url` into S3, then fill `video_path` and `duration`.
+
+    Runs as a job outside the request that created the recording, with its own session, and marks the recording
+    `completed` or `failed`. A failed upload is raised again so the job is retried.
+    """
+    async with engines.get_async().context_session() as db:
+        repository = AsyncRecordingRepository(db)
+        recording = await repository.read(_id=recording_id)
+        if not recording:
+            logger.warning(f"Recording {recording_id} not found, skipping ingestion")
+            return None
+
+        try:
+            upload = await get_aws_utils().upload_stream_file_s3(bucket, recording_key(recording), recording.url)
+        except Exception as e:
+            logger.error(f"Error ingesting recording {recording_id}: {e}", exc_info=PROJECT_ENVS.DEBUG)
+            await repository.update(_id=recording_id, data={"status": Statues.FAILED.value}, fields=["status"])
+            raise
+
+        logger.info(f"Recording {recording_id} ingested", extra={"upload": upload})
+        return await repository.update(
+            _id=recording_id,
+            data={"video_path": upload["path"], "duration": upload["duration"], "status": Statues.COMPLETED.value},
+            fields=["video_path", "duration", "status"],
+        )
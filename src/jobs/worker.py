@@ -0,0 +1,225 @@
+import asyncio
+import inspect
+import logging
+import os
+import random
+import socket
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src import PROJECT_ENVS
+from src.db.db import AsyncFastAPISessionMaker
+from src.db.engine import engines
+from src.repository.job import AsyncJobRepository
+from src.schema.job import DEFAULT_QUEUE, JobSchema
+
+logger = logging.getLogger(__name__)
+
+JOB_BATCH_SIZE = 10
+JOB_BACKOFF = 5.0
+JOB_MAX_BACKOFF = 3600.0
+JOB_REAP_INTERVAL = 60.0
+
+JobHandler = Callable[..., Awaitable[Any] | Any]
+
+
+@dataclass
+class Task:
+    name: str
+    handler: JobHandler
+    queue: str
+
+
+TASKS: Dict[str, Task] = {}
+
+
+def task(name: Optional[str] = None, queue: str = DEFAULT_QUEUE):
+    """
+    Register the decorated function as the handler of the jobs named `name` (the function name by default).
+
+    The job payload is passed as keyword arguments. Coroutine functions run on the worker's event loop, plain
+    functions on a thread. Raising schedules a retry.
+    """
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        task_name = name or handler.__name__
+        TASKS[task_name] = Task(task_name, handler, queue)
+        return handler
+
+    return decorator
+
+
+@dataclass
+class WorkerMetrics:
+    """Counters collected by `Worker`."""
+
+    claimed: int = 0
+    completed: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def incr(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class Worker:
+    """
+    asyncio worker running the jobs of the `job` table.
+
+    Each queue is consumed with its own concurrency limit, claiming up to `batch_size` due jobs at a time with
+    `SELECT ... FOR UPDATE SKIP LOCKED`, so any number of worker processes can share the same queues. A claimed
+    job stays invisible to other workers for `visibility_timeout` seconds, extended while it runs, and is claimed
+    again once that lapses if its worker died. Failed jobs are retried with exponential backoff up to their
+    `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        queues: Dict[str, int],
+        session_maker: Optional[AsyncFastAPISessionMaker] = None,
+        batch_size: int = JOB_BATCH_SIZE,
+        poll_interval: float = PROJECT_ENVS.JOB_POLL_INTERVAL,
+        visibility_timeout: float = PROJECT_ENVS.JOB_VISIBILITY_TIMEOUT,
+        backoff: float = JOB_BACKOFF,
+        max_backoff: float = JOB_MAX_BACKOFF,
+    ):
+        """
+        Args:
+            queues: Concurrency of each queue to consume, e.g. `{"default": 8, "video": 2}`
+            session_maker: Async sessionmaker of the database holding the jobs, the default engine if not set
+            batch_size: Maximum number of jobs claimed per query
+            poll_interval: Seconds to wait before polling an empty queue again
+            visibility_timeout: Seconds a claimed job is hidden from other workers without a heartbeat
+            backoff: Delay before the first retry, doubled on every attempt
+            max_backoff: Upper bound of the retry delay
+        """
+        self.queues = queues
+        self.session_maker = session_maker or engines.get_async()
+        self.batch_size = batch_size
+        self.poll_interval = float(poll_interval)
+        self.visibility_timeout = float(visibility_timeout)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.metrics = WorkerMetrics()
+
+        self._running: Dict[str, JobSchema] = {}
+        self._stopping: Optional[asyncio.Event] = None
+
+    def stop(self) -> None:
+        """Stop claiming jobs, `run` returns once the running ones are done."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def run(self) -> None:
+        self._stopping = asyncio.Event()
+        logger.info(f"Worker {self.worker_id} consuming {self.queues}")
+        background = [asyncio.create_task(self._heartbeat()), asyncio.create_task(self._reap())]
+        try:
+            await asyncio.gather(*(self._consume(queue, concurrency) for queue, concurrency in self.queues.items()))
+        finally:
+            for loop_task in background:
+                loop_task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            logger.info(f"Worker {self.worker_id} stopped", extra={"jobs": self.metrics.to_dict()})
+
+    async def _consume(self, queue: str, concurrency: int) -> None:
+        running: set[asyncio.Task] = set()
+        stopping = asyncio.create_task(self._stopping.wait())
+        while not self._stopping.is_set():
+            free = concurrency - len(running)
+            jobs = []
+            if free:
+                try:
+                    async with self.session_maker.context_session() as db:
+                        jobs = await AsyncJobRepository(db).claim(
+                            queue, min(free, self.batch_size), self.worker_id, self.visibility_timeout
+                        )
+                except Exception as e:
+                    logger.error(f"Error claiming jobs of queue '{queue}': {e}", exc_info=PROJECT_ENVS.DEBUG)
+                self.metrics.incr("claimed", len(jobs))
+                for job in jobs:
+                    job_task = asyncio.create_task(self._execute(job))
+                    running.add(job_task)
+                    job_task.add_done_callback(running.discard)
+
+            # poll again right away while the queue has more due jobs than were claimed
+            if not free or len(jobs) < min(free, self.batch_size):
+                timeout = None if not free else self.poll_interval
+                await asyncio.wait({*running, stopping}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+        stopping.cancel()
+        if running:
+            logger.info(f"Waiting for {len(running)} running jobs of queue '{queue}'")
+            await asyncio.wait(running)
+
+    async def _execute(self, job: JobSchema) -> None:
+        self._running[job.id] = job
+        try:
+            task_ = TASKS.get(job.name)
+            if task_ is None:
+                await self._fail(job, f"No task registered under '{job.name}'")
+                return
+            try:
+                if inspect.iscoroutinefunction(task_.handler):
+                    await task_.handler(**job.payload)
+                else:
+                    await asyncio.to_thread(task_.handler, **job.payload)
+            except Exception as e:
+                await self._retry(job, f"{type(e).__name__}: {e}")
+                return
+
+            async with self.session_maker.context_session() as db:
+                await AsyncJobRepository(db).complete(job.id, self.worker_id)
+            self.metrics.incr("completed")
+            logger.debug(f"Job {job.name} {job.id} completed")
+        except Exception as e:
+            # the job is left running and claimed again once its visibility timeout lapses
+            logger.error(f"Error recording the outcome of job {job.id}: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        finally:
+            del self._running[job.id]
+
+    async def _retry(self, job: JobSchema, error: str) -> None:
+        if job.attempts >= job.max_attempts:
+            await self._fail(job, error)
+            return
+        # full jitter, so jobs failing together do not retry together
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (job.attempts - 1)))
+        async with self.session_maker.context_session() as db:
+            await AsyncJobRepository(db).retry(job, self.worker_id, error, delay)
+        self.metrics.incr("retried")
+        logger.warning(f"Job {job.name} {job.id} failed, retrying in {delay:.1f}s: {error}")
+
+    async def _fail(self, job: JobSchema, error: str) -> None:
+        async with self.session_maker.context_session() as db:
+            await AsyncJobRepository(db).fail(job.id, self.worker_id, error)
+        self.metrics.incr("failed")
+        logger.error(f"Job {job.name} {job.id} failed after {job.attempts} attempts: {error}")
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                async with self.session_maker.context_session() as db:
+                    await AsyncJobRepository(db).heartbeat(list(self._running), self.worker_id, self.visibility_timeout)
+            except Exception as e:
+                logger.error(f"Job heartbeat failed: {e}", exc_info=PROJECT_ENVS.DEBUG)
+
+    async def _reap(self) -> None:
+        while True:
+            try:
+                async with self.session_maker.context_session() as db:
+                    reaped = await AsyncJobRepository(db).reap()
+                if reaped:
+                    logger.warning(f"{reaped} timed out jobs failed after their last attempt")
+            except Exception as e:
+                logger.error(f"Job reaping failed: {e}", exc_info=PROJECT_ENVS.DEBUG)
+            await asyncio.sleep(JOB_REAP_INTERVAL)
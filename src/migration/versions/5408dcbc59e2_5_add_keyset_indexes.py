@@ -0,0 +1,31 @@
+"""5 add keyset indexes
+
+Revision ID: 5408dcbc59e2
+Revises: 1315c655eb48
+Create Date: 2026-10-18 09:02:11.412093
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5408dcbc59e2"
+down_revision: Union[str, None] = "1315c655eb48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_org_created_at_id", "org", ["created_at", "id"], unique=False)
+    op.create_index("ix_user_org_id_created_at_id", "user", ["org_id", "created_at", "id"], unique=False)
+    op.create_index("ix_deal_org_id_created_at_id", "deal", ["org_id", "created_at", "id"], unique=False)
+    op.create_index("ix_recording_org_id_created_at_id", "recording", ["org_id", "created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recording_org_id_created_at_id", table_name="recording")
+    op.drop_index("ix_deal_org_id_created_at_id", table_name="deal")
+    op.drop_index("ix_user_org_id_created_at_id", table_name="user")
+    op.drop_index("ix_org_created_at_id", table_name="org")
@@ -0,0 +1,54 @@
+"""9 add recording search vector
+
+Revision ID: a4042c32c5ed
+Revises: f8e967786f77
+Create Date: 2026-10-18 09:28:37.517358
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a4042c32c5ed"
+down_revision: Union[str, None] = "f8e967786f77"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # a stored generated column rewrites the table under an exclusive lock, run it off-peak on large tables
+    op.add_column(
+        "recording",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_recording_search_vector",
+            "recording",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_recording_search_vector", table_name="recording", postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column("recording", "search_vector")
@@ -0,0 +1,37 @@
+"""8 add recording participants index
+
+Revision ID: f8e967786f77
+Revises: 89542c76ddf9
+Create Date: 2026-10-18 09:19:39.473690
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f8e967786f77"
+down_revision: Union[str, None] = "89542c76ddf9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY does not block writes while the index of a large table builds, it cannot run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_recording_participants",
+            "recording",
+            ["participants"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"participants": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_recording_participants", table_name="recording", postgresql_concurrently=True, if_exists=True)
@@ -1,33 +1,211 @@
+import base64
+import io
+import json
 import logging
-from typing import Type
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Optional, Type
 
+import psycopg2
 from pydantic import BaseModel
+from sqlalchemy import Row, column, delete, exists, literal_column, select, table, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src import PROJECT_ENVS
+from src.db.db import UTC_TIMESTAMP
+from src.infrastructure.cache import CACHE_INVALIDATION_CHANNEL, app_cache, notify_payloads
+from src.infrastructure.metrics import instrumentation, traced
+from src.schema.base import CursorPage
 
 logger = logging.getLogger(__name__)
 
+UPSERT_CHUNK_SIZE = 1000
+# asyncpg refuses a statement with more bind parameters, a multi-row INSERT binds one per row and column
+MAX_BIND_PARAMETERS = 32767
+# `xmax` is 0 for a freshly inserted tuple and set for one rewritten by ON CONFLICT DO UPDATE
+INSERTED_FLAG = literal_column("(xmax = 0)").label("inserted")
+LIST_DEFAULT_LIMIT = 50
+LIST_MAX_LIMIT = 500
+STREAM_BATCH_SIZE = 1000
+# `COPY ... FROM STDIN` text format
+COPY_NULL = "\\N"
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+NOTIFY_STATEMENT = text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload")
 
-class BaseRepository:
-    def __init__(self, db_session: Session, model_schema: BaseModel, model_table: Type):
+
+def encode_cursor(created_at: datetime, _id: str) -> str:
+    """Opaque keyset cursor pointing right after the (created_at, id) of the last row of a page."""
+    payload = json.dumps([created_at.isoformat(), _id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, _id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), _id
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def encode_rank_cursor(rank: float, _id: str) -> str:
+    """Opaque keyset cursor pointing right after the (rank, id) of the last row of a ranked page."""
+    return base64.urlsafe_b64encode(json.dumps([rank, _id]).encode()).decode()
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, str]:
+    try:
+        rank, _id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), str(_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def copy_line(values: Iterable[Any]) -> str:
+    """One row of the `COPY` text format: tab separated, `\\N` for nulls, dicts and lists as JSON."""
+    fields = []
+    for value in values:
+        if value is None:
+            fields.append(COPY_NULL)
+            continue
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        elif isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        fields.append(str(value).translate(_COPY_ESCAPES))
+    return "\t".join(fields) + "\n"
+
+
+class _RepositoryMixin:
+    # reads fetch plain column rows and build the models with `from_rows`, without re-validating them
+    trusted: bool = True
+
+    def __init__(self, db_session: Session | AsyncSession, model_schema: BaseModel, model_table: Type):
         self.db_session = db_session
         self.model_table = model_table
         self.model_schema = model_schema
 
+    @instrumentation.validated
     def alembic_to_pydantic(self, db_record: Type):
         if not db_record:
             return db_record
         if isinstance(db_record, list):
+            if isinstance(db_record[0], Row):
+                return self.model_schema.from_rows(db_record[0]._fields, db_record)
             return [self.model_schema.model_validate(record) for record in db_record]
+        if isinstance(db_record, Row):
+            return self.model_schema.from_rows(db_record._fields, [db_record])[0]
 
         return self.model_schema.model_validate(db_record)
 
+    def _schema_columns(self) -> list:
+        fields = self.model_schema.model_fields
+        return [column for column in self.model_table.__table__.columns if column.key in fields]
+
+    def _select(self):
+        """Rows of the schema's columns in trusted mode, ORM instances otherwise."""
+        if self.trusted:
+            return select(*self._schema_columns())
+        return select(self.model_table)
+
+    def _records(self, result) -> list:
+        return list(result.all()) if self.trusted else list(result.scalars().all())
+
+    def _invalidate(self, *ids: str) -> None:
+        """Drop the cached reads of the committed rows `ids`."""
+        app_cache.invalidate(self.model_table.__tablename__, *ids)
+
+    def _notify_statement(self, ids: tuple[str, ...]):
+        """`NOTIFY` the other workers of the written rows `ids`, only delivered if the transaction commits."""
+        payloads = notify_payloads(self.model_table.__tablename__, list(ids))
+        return NOTIFY_STATEMENT.bindparams(channel=CACHE_INVALIDATION_CHANNEL, payloads=payloads)
+
+    def _upsert_rows(self, data: list[BaseModel]) -> list[dict]:
+        """Table-column-only rows, de-duplicated on id (last one wins) so a chunk never hits a row twice."""
+        columns = {column.name for column in self.model_table.__table__.columns}
+        now = datetime.now(timezone.utc)
+        rows = {}
+        for item in data:
+            row = {key: value for key, value in item.model_dump().items() if key in columns}
+            row["created_at"] = row.get("created_at") or now
+            row["updated_at"] = now
+            rows[row["id"]] = row
+        return list(rows.values())
+
+    def _upsert_chunk_size(self, chunk_size: int) -> int:
+        """`chunk_size` lowered so that the INSERT of a chunk binds at most `MAX_BIND_PARAMETERS` parameters."""
+        return max(1, min(chunk_size, MAX_BIND_PARAMETERS // len(self.model_table.__table__.columns)))
+
+    def _on_conflict_update(self, statement, columns: Iterable[str]):
+        """`ON CONFLICT (id) DO UPDATE` that keeps `created_at` and bumps `updated_at`."""
+        updates = {key: statement.excluded[key] for key in columns if key not in ("id", "created_at")}
+        updates["updated_at"] = UTC_TIMESTAMP
+        return statement.on_conflict_do_update(index_elements=[self.model_table.id], set_=updates)
+
+    def _upsert_statement(self, rows: list[dict]):
+        """`INSERT ... ON CONFLICT (id) DO UPDATE` that keeps `created_at` and bumps `updated_at`."""
+        return self._on_conflict_update(insert(self.model_table).values(rows), rows[0])
+
+    def copy_columns(self) -> list[str]:
+        """Columns loaded by `copy_upsert`, in `copy_line` order."""
+        return [column.key for column in self._schema_columns()]
+
+    def _filter(self, statement, filters: Optional[dict[str, Any]]):
+        columns = self.model_table.__table__.columns
+        for key, value in (filters or {}).items():
+            if key not in columns:
+                raise ValueError(f"Unknown filter '{key}' for {self.model_table.__tablename__}")
+            statement = statement.where(columns[key] == value)
+        return statement
+
+    def _stream_statement(self, filters: Optional[dict[str, Any]], batch_size: int):
+        """Every matching row in (created_at, id) order, read `batch_size` rows at a time from a server-side cursor."""
+        statement = self._filter(self._select(), filters)
+        return statement.order_by(self.model_table.created_at, self.model_table.id).execution_options(
+            yield_per=batch_size
+        )
+
+    def _partition_to_pydantic(self, partition) -> list[BaseModel]:
+        return self.alembic_to_pydantic(list(partition) if self.trusted else [row[0] for row in partition])
+
+    def _list_statement(self, filters: Optional[dict[str, Any]], limit: int, after: Optional[str]):
+        """
+        Keyset query over (created_at DESC, id DESC), fetching one extra row to know if there is a next page.
+
+        Served by the `(org_id, created_at, id)` indexes, so a deep page costs the same as the first one.
+        """
+        statement = self._filter(self._select(), filters)
+        if after:
+            created_at, _id = decode_cursor(after)
+            statement = statement.where(
+                tuple_(self.model_table.created_at, self.model_table.id) < tuple_(created_at, _id)
+            )
+        return statement.order_by(self.model_table.created_at.desc(), self.model_table.id.desc()).limit(limit + 1)
+
+    def _to_page(self, db_records: list, limit: int) -> CursorPage:
+        next_cursor = None
+        if len(db_records) > limit:
+            db_records = db_records[:limit]
+            next_cursor = encode_cursor(db_records[-1].created_at, db_records[-1].id)
+        return CursorPage(items=self.alembic_to_pydantic(db_records) or [], next_cursor=next_cursor)
+
+    @staticmethod
+    def _chunk_result(index: int, inserted_flags: list[bool]) -> dict:
+        inserted = sum(1 for flag in inserted_flags if flag)
+        return {"chunk": index, "inserted": inserted, "updated": len(inserted_flags) - inserted, "failed": 0}
+
+
+class BaseRepository(_RepositoryMixin):
+    def _notify(self, *ids: str) -> None:
+        self.db_session.execute(self._notify_statement(ids))
+
+    @traced("create")
     def create(self, data: BaseModel) -> BaseModel:
         try:
             db_record = self.model_table(**data.model_dump())
             self.db_session.add(db_record)
+            self._notify(data.id)
             self.db_session.commit()
             return data
         except SQLAlchemyError as e:
@@ -39,10 +217,11 @@ class BaseRepository:
             self.db_session.rollback()
             return None
 
+    @traced("read")
     def read(self, _id: str) -> BaseModel:
         try:
-            db_record = self.db_session.query(self.model_table).filter(self.model_table.id == _id).first()
-            return self.alembic_to_pydantic(db_record)
+            records = self._records(self.db_session.execute(self._select().where(self.model_table.id == _id)))
+            return self.alembic_to_pydantic(records[0] if records else None)
         except SQLAlchemyError as e:
             logger.error(
                 f"Database error occurred: {e}",
@@ -51,6 +230,7 @@ class BaseRepository:
             )
             return None
 
+    @traced("update")
     def update(self, _id: str, data: BaseModel | dict, fields: list[str] = None) -> BaseModel:
         try:
             db_record = self.db_session.query(self.model_table).filter(self.model_table.id == _id).first()
@@ -64,7 +244,9 @@ class BaseRepository:
                 for field, value in data.items():
                     if field in fields and hasattr(db_record, field):
                         setattr(db_record, field, value)
+                self._notify(_id)
                 self.db_session.commit()
+                self._invalidate(_id)
                 return self.alembic_to_pydantic(db_record)
             return None
         except SQLAlchemyError as e:
@@ -76,10 +258,110 @@ class BaseRepository:
             self.db_session.rollback()
             return None
 
+    @traced("upsert")
+    def upsert(self, data: BaseModel) -> BaseModel:
+        try:
+            statement = self._upsert_statement(self._upsert_rows([data])).returning(self.model_table)
+            db_record = self.db_session.scalars(statement, execution_options={"populate_existing": True}).first()
+            self._notify(data.id)
+            self.db_session.commit()
+            self._invalidate(data.id)
+            return self.alembic_to_pydantic(db_record)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            self.db_session.rollback()
+            return None
+
+    @traced("bulk_upsert")
+    def bulk_upsert(self, data: list[BaseModel], chunk_size: int = UPSERT_CHUNK_SIZE) -> list[dict]:
+        """
+        Upsert `data` with one statement and one commit per chunk; a failing chunk is reported, not raised. Chunks are
+        capped by `MAX_BIND_PARAMETERS`, `chunk_size` can end up smaller for wide tables.
+        """
+        chunk_size = self._upsert_chunk_size(chunk_size)
+        results = []
+        for index, start in enumerate(range(0, len(data), chunk_size)):
+            rows = self._upsert_rows(data[start : start + chunk_size])
+            try:
+                inserted_flags = self.db_session.scalars(self._upsert_statement(rows).returning(INSERTED_FLAG)).all()
+                self._notify(*(row["id"] for row in rows))
+                self.db_session.commit()
+                self._invalidate(*(row["id"] for row in rows))
+                results.append(self._chunk_result(index, inserted_flags))
+            except SQLAlchemyError as e:
+                logger.error(
+                    f"Database error occurred on upsert chunk {index}: {e}",
+                    extra={"error": e},
+                    exc_info=PROJECT_ENVS.DEBUG,
+                )
+                self.db_session.rollback()
+                results.append({"chunk": index, "inserted": 0, "updated": 0, "failed": len(rows)})
+        return results
+
+    @traced("copy_upsert")
+    def copy_upsert(self, lines: list[str]) -> dict:
+        """
+        Upsert `lines`, `copy_line` rows of `copy_columns()` with unique ids, in a single transaction: `COPY` into a
+        temporary staging table, drop the rows whose foreign keys match nothing, then merge the others with one
+        `INSERT ... SELECT ... ON CONFLICT (id) DO UPDATE`. The dropped rows are returned as `(id, column)` pairs.
+        """
+        columns = self.copy_columns()
+        staging_name = f"{self.model_table.__tablename__}_staging"
+        staging = table(staging_name, *(column(key) for key in columns))
+        try:
+            self.db_session.execute(
+                text(
+                    f'CREATE TEMPORARY TABLE "{staging_name}" (LIKE "{self.model_table.__tablename__}" '
+                    "INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+            )
+            quoted_columns = ", ".join(f'"{key}"' for key in columns)
+            cursor = self.db_session.connection().connection.cursor()
+            cursor.copy_expert(f'COPY "{staging_name}" ({quoted_columns}) FROM STDIN', io.StringIO("".join(lines)))
+
+            rejected = []
+            for foreign_key in self.model_table.__table__.foreign_keys:
+                key = foreign_key.parent.key
+                if key not in columns:
+                    continue
+                orphans = (
+                    delete(staging)
+                    .where(staging.c[key].is_not(None), ~exists().where(foreign_key.column == staging.c[key]))
+                    .returning(staging.c.id)
+                )
+                rejected += [(_id, key) for _id in self.db_session.scalars(orphans).all()]
+
+            merge = self._on_conflict_update(
+                insert(self.model_table).from_select(columns, select(*(staging.c[key] for key in columns))), columns
+            )
+            merged = self.db_session.execute(merge.returning(self.model_table.id, INSERTED_FLAG)).all()
+            ids = [row.id for row in merged]
+            if ids:
+                self._notify(*ids)
+            self.db_session.commit()
+            self._invalidate(*ids)
+            inserted = sum(1 for row in merged if row.inserted)
+            return {"inserted": inserted, "updated": len(merged) - inserted, "failed": 0, "rejected": rejected}
+        except (SQLAlchemyError, psycopg2.Error) as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            self.db_session.rollback()
+            return {"inserted": 0, "updated": 0, "failed": len(lines), "rejected": []}
+
+    @traced("delete")
     def delete(self, _id: str) -> int:
         try:
             row_count = self.db_session.query(self.model_table).filter(self.model_table.id == _id).delete()
+            self._notify(_id)
             self.db_session.commit()
+            self._invalidate(_id)
             return row_count
         except SQLAlchemyError as e:
             logger.error(
@@ -89,3 +371,188 @@ class BaseRepository:
             )
             self.db_session.rollback()
             return 0
+
+    @traced("list")
+    def list(
+        self, filters: Optional[dict[str, Any]] = None, limit: int = LIST_DEFAULT_LIMIT, after: Optional[str] = None
+    ) -> CursorPage:
+        """Newest-first page of rows matching the equality `filters`, starting after the `after` cursor."""
+        try:
+            db_records = self._records(self.db_session.execute(self._list_statement(filters, limit, after)))
+            return self._to_page(db_records, limit)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            return None
+
+    def stream(
+        self, filters: Optional[dict[str, Any]] = None, batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[List[BaseModel]]:
+        """
+        Batches of every row matching the equality `filters`, oldest first, read through a server-side cursor so
+        memory stays bounded by `batch_size` whatever the number of rows. Errors are raised, not swallowed.
+        """
+        result = self.db_session.execute(self._stream_statement(filters, batch_size))
+        for partition in result.partitions():
+            yield self._partition_to_pydantic(partition)
+
+
+class AsyncBaseRepository(_RepositoryMixin):
+    """asyncio counterpart of `BaseRepository`, operating on an `AsyncSession`."""
+
+    async def _notify(self, *ids: str) -> None:
+        await self.db_session.execute(self._notify_statement(ids))
+
+    @traced("create")
+    async def create(self, data: BaseModel) -> BaseModel:
+        try:
+            db_record = self.model_table(**data.model_dump())
+            self.db_session.add(db_record)
+            await self._notify(data.id)
+            await self.db_session.commit()
+            return data
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            await self.db_session.rollback()
+            return None
+
+    @traced("read")
+    async def read(self, _id: str) -> BaseModel:
+        try:
+            records = self._records(await self.db_session.execute(self._select().where(self.model_table.id == _id)))
+            return self.alembic_to_pydantic(records[0] if records else None)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            return None
+
+    @traced("update")
+    async def update(self, _id: str, data: BaseModel | dict, fields: list[str] = None) -> BaseModel:
+        try:
+            result = await self.db_session.execute(select(self.model_table).where(self.model_table.id == _id))
+            db_record = result.scalars().first()
+            if db_record:
+                default_fields = []
+                if isinstance(data, BaseModel):
+                    data = data.model_dump()
+                    default_fields = [x for x in data.keys()]
+                fields = fields or default_fields
+
+                for field, value in data.items():
+                    if field in fields and hasattr(db_record, field):
+                        setattr(db_record, field, value)
+                await self._notify(_id)
+                await self.db_session.commit()
+                self._invalidate(_id)
+                # server-side `onupdate` values are expired by the flush, reload them without lazy IO
+                await self.db_session.refresh(db_record)
+                return self.alembic_to_pydantic(db_record)
+            return None
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            await self.db_session.rollback()
+            return None
+
+    @traced("upsert")
+    async def upsert(self, data: BaseModel) -> BaseModel:
+        try:
+            statement = self._upsert_statement(self._upsert_rows([data])).returning(self.model_table)
+            result = await self.db_session.scalars(statement, execution_options={"populate_existing": True})
+            db_record = result.first()
+            await self._notify(data.id)
+            await self.db_session.commit()
+            self._invalidate(data.id)
+            return self.alembic_to_pydantic(db_record)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            await self.db_session.rollback()
+            return None
+
+    @traced("bulk_upsert")
+    async def bulk_upsert(self, data: list[BaseModel], chunk_size: int = UPSERT_CHUNK_SIZE) -> list[dict]:
+        """
+        Upsert `data` with one statement and one commit per chunk; a failing chunk is reported, not raised. Chunks are
+        capped by `MAX_BIND_PARAMETERS`, `chunk_size` can end up smaller for wide tables.
+        """
+        chunk_size = self._upsert_chunk_size(chunk_size)
+        results = []
+        for index, start in enumerate(range(0, len(data), chunk_size)):
+            rows = self._upsert_rows(data[start : start + chunk_size])
+            try:
+                result = await self.db_session.scalars(self._upsert_statement(rows).returning(INSERTED_FLAG))
+                inserted_flags = result.all()
+                await self._notify(*(row["id"] for row in rows))
+                await self.db_session.commit()
+                self._invalidate(*(row["id"] for row in rows))
+                results.append(self._chunk_result(index, inserted_flags))
+            except SQLAlchemyError as e:
+                logger.error(
+                    f"Database error occurred on upsert chunk {index}: {e}",
+                    extra={"error": e},
+                    exc_info=PROJECT_ENVS.DEBUG,
+                )
+                await self.db_session.rollback()
+                results.append({"chunk": index, "inserted": 0, "updated": 0, "failed": len(rows)})
+        return results
+
+    @traced("delete")
+    async def delete(self, _id: str) -> int:
+        try:
+            result = await self.db_session.execute(delete(self.model_table).where(self.model_table.id == _id))
+            await self._notify(_id)
+            await self.db_session.commit()
+            self._invalidate(_id)
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            await self.db_session.rollback()
+            return 0
+
+    @traced("list")
+    async def list(
+        self, filters: Optional[dict[str, Any]] = None, limit: int = LIST_DEFAULT_LIMIT, after: Optional[str] = None
+    ) -> CursorPage:
+        """Newest-first page of rows matching the equality `filters`, starting after the `after` cursor."""
+        try:
+            result = await self.db_session.execute(self._list_statement(filters, limit, after))
+            return self._to_page(self._records(result), limit)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            return None
+
+    async def stream(
+        self, filters: Optional[dict[str, Any]] = None, batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[List[BaseModel]]:
+        """
+        Batches of every row matching the equality `filters`, oldest first, read through a server-side cursor so
+        memory stays bounded by `batch_size` whatever the number of rows. Errors are raised, not swallowed.
+        """
+        result = await self.db_session.stream(self._stream_statement(filters, batch_size))
+        async for partition in result.partitions():
+            yield self._partition_to_pydantic(partition)
@@ -1,9 +1,10 @@
 import logging
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.db import DealTable
-from src.repository.base import BaseRepository
+from src.repository.base import AsyncBaseRepository, BaseRepository
 from src.schema.deal import DealSchema
 
 logger = logging.getLogger(__name__)
@@ -12,3 +13,8 @@ logger = logging.getLogger(__name__)
 class DealRepository(BaseRepository):
     def __init__(self, db_session: Session):
         super().__init__(db_session, DealSchema, DealTable)
+
+
+class AsyncDealRepository(AsyncBaseRepository):
+    def __init__(self, db_session: AsyncSession):
+        super().__init__(db_session, DealSchema, DealTable)
@@ -0,0 +1,248 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src import PROJECT_ENVS
+from src.constants import Statues
+from src.db import JobTable
+from src.infrastructure.metrics import traced
+from src.repository.base import AsyncBaseRepository, BaseRepository
+from src.schema.job import DEFAULT_QUEUE, JobSchema
+
+logger = logging.getLogger(__name__)
+
+CLAIMABLE = (Statues.PENDING.value, Statues.RUNNING.value)
+
+
+class _JobStatementsMixin:
+    @staticmethod
+    def _job(name: str, payload: dict = None, queue: str = DEFAULT_QUEUE, priority: int = 0, **kwargs) -> JobSchema:
+        return JobSchema(name=name, payload=payload or {}, queue=queue, priority=priority, **kwargs)
+
+    @staticmethod
+    def _enqueue_statement(jobs: list[JobSchema], delay: float = 0.0, skip_existing: bool = False):
+        """
+        Multi-row insert, `run_at` defaults to the database clock plus `delay` seconds. With `skip_existing`, jobs
+        whose id is already in the table are left out, so deterministic ids make enqueuing idempotent.
+        """
+        run_at = func.now() + timedelta(seconds=delay) if delay else func.now()
+        rows = [
+            job.model_dump(include={"id", "queue", "name", "payload", "priority", "status", "max_attempts"})
+            | {"run_at": job.run_at or run_at}
+            for job in jobs
+        ]
+        statement = insert(JobTable).values(rows)
+        if skip_existing:
+            statement = statement.on_conflict_do_nothing(index_elements=[JobTable.id])
+        return statement
+
+    @staticmethod
+    def _requeue_statement(queue: str, statuses: tuple[str, ...], since: Optional[datetime] = None):
+        """Make the jobs of `queue` in `statuses` (created after `since`) due now, with all of their attempts."""
+        statement = update(JobTable).where(JobTable.queue == queue, JobTable.status.in_(statuses))
+        if since is not None:
+            statement = statement.where(JobTable.created_at >= since)
+        return statement.values(
+            status=Statues.PENDING.value, attempts=0, locked_by=None, last_error=None, run_at=func.now()
+        )
+
+    @staticmethod
+    def _claim_statement(queue: str, limit: int, worker_id: str, visibility_timeout: float):
+        """
+        Mark up to `limit` due jobs of `queue` as running for `visibility_timeout` seconds, in priority order.
+
+        `SKIP LOCKED` lets concurrent workers claim disjoint batches without waiting on each other.
+        """
+        claimable = (
+            select(JobTable.id)
+            .where(
+                JobTable.queue == queue,
+                JobTable.status.in_(CLAIMABLE),
+                JobTable.run_at <= func.now(),
+                JobTable.attempts < JobTable.max_attempts,
+            )
+            .order_by(JobTable.priority, JobTable.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        return (
+            update(JobTable)
+            .where(JobTable.id.in_(claimable))
+            .values(
+                status=Statues.RUNNING.value,
+                attempts=JobTable.attempts + 1,
+                locked_by=worker_id,
+                run_at=func.now() + timedelta(seconds=visibility_timeout),
+            )
+            .returning(JobTable)
+        )
+
+    @staticmethod
+    def _owned(job_ids: list[str], worker_id: str):
+        """Only touch jobs still held by `worker_id`, not ones reclaimed by another worker after a timeout."""
+        return update(JobTable).where(
+            JobTable.id.in_(job_ids), JobTable.locked_by == worker_id, JobTable.status == Statues.RUNNING.value
+        )
+
+
+class JobRepository(_JobStatementsMixin, BaseRepository):
+    def __init__(self, db_session: Session):
+        super().__init__(db_session, JobSchema, JobTable)
+
+    def enqueue(
+        self, name: str, payload: dict = None, queue: str = DEFAULT_QUEUE, priority: int = 0, delay: float = 0.0
+    ) -> JobSchema:
+        """Schedule the task `name` to run with `payload` as keyword arguments, `delay` seconds from now."""
+        job = self._job(name, payload, queue, priority)
+        return job if self.enqueue_many([job], delay=delay) else None
+
+    @traced("enqueue_many")
+    def enqueue_many(self, jobs: list[JobSchema], delay: float = 0.0, skip_existing: bool = False) -> int:
+        """Number of jobs enqueued, those skipped by `skip_existing` left out, or None when the insert failed."""
+        try:
+            if not jobs:
+                return 0
+            result = self.db_session.execute(self._enqueue_statement(jobs, delay, skip_existing))
+            self.db_session.commit()
+            return result.rowcount if skip_existing else len(jobs)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            self.db_session.rollback()
+            return None
+
+    @traced("requeue")
+    def requeue(
+        self, queue: str, statuses: tuple[str, ...] = (Statues.FAILED.value,), since: Optional[datetime] = None
+    ) -> int:
+        """
+        Run the jobs of `queue` in `statuses` (created after `since`) again. Number of jobs requeued, or None when the
+        update failed.
+        """
+        try:
+            result = self.db_session.execute(self._requeue_statement(queue, statuses, since))
+            self.db_session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            self.db_session.rollback()
+            return None
+
+
+class AsyncJobRepository(_JobStatementsMixin, AsyncBaseRepository):
+    """Producer side (`enqueue`) and worker side (`claim`, `complete`, `retry`, ...) of the job queue."""
+
+    def __init__(self, db_session: AsyncSession):
+        super().__init__(db_session, JobSchema, JobTable)
+
+    async def enqueue(
+        self, name: str, payload: dict = None, queue: str = DEFAULT_QUEUE, priority: int = 0, delay: float = 0.0
+    ) -> JobSchema:
+        """Schedule the task `name` to run with `payload` as keyword arguments, `delay` seconds from now."""
+        job = self._job(name, payload, queue, priority)
+        return job if await self.enqueue_many([job], delay=delay) else None
+
+    @traced("enqueue_many")
+    async def enqueue_many(self, jobs: list[JobSchema], delay: float = 0.0, skip_existing: bool = False) -> int:
+        """Number of jobs enqueued, those skipped by `skip_existing` left out, or None when the insert failed."""
+        try:
+            if not jobs:
+                return 0
+            result = await self.db_session.execute(self._enqueue_statement(jobs, delay, skip_existing))
+            await self.db_session.commit()
+            return result.rowcount if skip_existing else len(jobs)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            await self.db_session.rollback()
+            return None
+
+    async def _execute(self, statement) -> int:
+        try:
+            result = await self.db_session.execute(statement)
+            await self.db_session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            await self.db_session.rollback()
+            return 0
+
+    @traced("claim")
+    async def claim(self, queue: str, limit: int, worker_id: str, visibility_timeout: float) -> list[JobSchema]:
+        try:
+            result = await self.db_session.scalars(self._claim_statement(queue, limit, worker_id, visibility_timeout))
+            jobs = self.alembic_to_pydantic(list(result.all()))
+            await self.db_session.commit()
+            return jobs
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            await self.db_session.rollback()
+            return []
+
+    async def complete(self, job_id: str, worker_id: str) -> int:
+        return await self._execute(
+            self._owned([job_id], worker_id).values(status=Statues.COMPLETED.value, locked_by=None, last_error=None)
+        )
+
+    async def retry(self, job: JobSchema, worker_id: str, error: str, delay: float) -> int:
+        """Reschedule `job` in `delay` seconds, or fail it for good once it has used all of its attempts."""
+        if job.attempts >= job.max_attempts:
+            return await self.fail(job.id, worker_id, error)
+        return await self._execute(
+            self._owned([job.id], worker_id).values(
+                status=Statues.PENDING.value,
+                locked_by=None,
+                last_error=error,
+                run_at=func.now() + timedelta(seconds=delay),
+            )
+        )
+
+    async def fail(self, job_id: str, worker_id: str, error: str) -> int:
+        return await self._execute(
+            self._owned([job_id], worker_id).values(status=Statues.FAILED.value, locked_by=None, last_error=error)
+        )
+
+    async def heartbeat(self, job_ids: list[str], worker_id: str, visibility_timeout: float) -> int:
+        """Extend the visibility timeout of the jobs `worker_id` is still running."""
+        if not job_ids:
+            return 0
+        return await self._execute(
+            self._owned(job_ids, worker_id).values(run_at=func.now() + timedelta(seconds=visibility_timeout))
+        )
+
+    async def reap(self) -> int:
+        """Fail the timed-out jobs that have no attempt left, they would otherwise never be claimed again."""
+        return await self._execute(
+            update(JobTable)
+            .where(
+                JobTable.status == Statues.RUNNING.value,
+                JobTable.run_at <= func.now(),
+                JobTable.attempts >= JobTable.max_attempts,
+            )
+            .values(status=Statues.FAILED.value, locked_by=None, last_error="Visibility timeout expired")
+        )
@@ -1,9 +1,10 @@
 import logging
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.db import OrgTable
-from src.repository.base import BaseRepository
+from src.repository.base import AsyncBaseRepository, BaseRepository
 from src.schema.org import OrgSchema
 
 logger = logging.getLogger(__name__)
@@ -12,3 +13,8 @@ logger = logging.getLogger(__name__)
 class OrgRepository(BaseRepository):
     def __init__(self, db_session: Session):
         super().__init__(db_session, OrgSchema, OrgTable)
+
+
+class AsyncOrgRepository(AsyncBaseRepository):
+    def __init__(self, db_session: AsyncSession):
+        super().__init__(db_session, OrgSchema, OrgTable)
@@ -1,14 +1,217 @@
 import logging
 
+from sqlalchemy import REAL, cast, func, join, literal_column, select, true, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from src import PROJECT_ENVS
 from src.db import RecordingTable
-from src.repository.base import BaseRepository
-from src.schema.recording import RecordingSchema
+from src.db.recording import SEARCH_CONFIG
+from src.infrastructure.metrics import traced
+from src.repository.base import (
+    INSERTED_FLAG,
+    LIST_DEFAULT_LIMIT,
+    AsyncBaseRepository,
+    BaseRepository,
+    decode_rank_cursor,
+    encode_rank_cursor,
+)
+from src.repository.job import AsyncJobRepository
+from src.schema.base import CursorPage, SearchPage
+from src.schema.job import JobSchema
+from src.schema.recording import RecordingSchema, RecordingSearchResult
 
 logger = logging.getLogger(__name__)
 
+SEARCH_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5"
+# written by the ingestion job only, an upsert of an existing recording leaves them as they are
+INGESTION_FIELDS = ("status", "video_path", "duration")
 
-class RecordingRepository(BaseRepository):
+
+class _RecordingStatementsMixin:
+    def _participant_statement(self, org_id: str, email: str, limit: int, after: str = None):
+        """
+        Keyset page of the org's recordings whose `participants` contain `email`.
+
+        `@>` containment is served by the `jsonb_path_ops` GIN index on `participants`, the keyset order by the
+        `(org_id, created_at, id)` index.
+        """
+        return self._list_statement({"org_id": org_id}, limit, after).where(
+            RecordingTable.participants.contains([email])
+        )
+
+    def _search_statement(self, org_id: str, query: str, limit: int, after: str = None):
+        """
+        Best-ranked page of the org's recordings matching the web-search style `query` (`"exact phrase"`, `or`,
+        `-excluded`), keyset-paginated on (rank, id).
+
+        Only the `SEARCH_MAX_CANDIDATES` newest matches are ranked, `truncated` telling when there were more: ranking
+        every match of a common term reads its whole posting list from the heap. Postgres picks the cheaper of the GIN
+        index on `search_vector` (rare terms) and a backward scan of the keyset index (common terms) to find them.
+        Postgres estimates a phrase like its words, a rare phrase of common words may take the scan and read the whole
+        org. The columns and highlights are fetched for the page only, `ts_headline` re-parses the whole text and
+        costs far more than the match. `truncated` is joined to the page rows, an empty page is a single row of nulls.
+        """
+        config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+        tsquery = func.websearch_to_tsquery(config, query)
+        max_candidates = int(PROJECT_ENVS.SEARCH_MAX_CANDIDATES)
+        # one match more than ranked, to tell whether some were left out
+        matches = (
+            select(
+                RecordingTable.id,
+                RecordingTable.created_at,
+                func.ts_rank(RecordingTable.search_vector, tsquery).label("rank"),
+            )
+            .where(RecordingTable.org_id == org_id, RecordingTable.search_vector.op("@@")(tsquery))
+            .order_by(RecordingTable.created_at.desc(), RecordingTable.id.desc())
+            .limit(max_candidates + 1)
+            .cte("matches")
+        )
+        candidates = (
+            select(matches.c.id, matches.c.rank)
+            .order_by(matches.c.created_at.desc(), matches.c.id.desc())
+            .limit(max_candidates)
+            .subquery("candidates")
+        )
+        truncated = select((func.count() > max_candidates).label("truncated")).select_from(matches).subquery("flag")
+        page = select(candidates)
+        if after:
+            rank_after, id_after = decode_rank_cursor(after)
+            # ts_rank is a real, read back as its shortest decimal: compare as reals or that decimal is larger
+            page = page.where(tuple_(candidates.c.rank, candidates.c.id) < tuple_(cast(rank_after, REAL), id_after))
+        page = page.order_by(candidates.c.rank.desc(), candidates.c.id.desc()).limit(limit + 1).subquery("page")
+        return (
+            select(
+                *self._schema_columns(),
+                page.c.rank,
+                truncated.c.truncated,
+                func.ts_headline(config, RecordingTable.title, tsquery, SEARCH_HEADLINE_OPTIONS).label(
+                    "title_highlight"
+                ),
+                func.ts_headline(config, RecordingTable.description, tsquery, SEARCH_HEADLINE_OPTIONS).label(
+                    "description_highlight"
+                ),
+            )
+            .select_from(truncated.outerjoin(join(RecordingTable, page, RecordingTable.id == page.c.id), true()))
+            .order_by(page.c.rank.desc(), page.c.id.desc())
+        )
+
+    def _to_search_page(self, rows: list, limit: int) -> SearchPage:
+        truncated = bool(rows) and rows[0].truncated
+        rows = [row for row in rows if row.id is not None]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id)
+        if not rows:
+            return SearchPage(items=[], next_cursor=next_cursor, truncated=truncated)
+        if self.trusted:
+            items = RecordingSearchResult.from_rows(rows[0]._fields, rows)
+        else:
+            items = [
+                RecordingSearchResult.model_validate(
+                    {key: value for key, value in row._mapping.items() if key != "truncated"}
+                )
+                for row in rows
+            ]
+        return SearchPage(items=items, next_cursor=next_cursor, truncated=truncated)
+
+
+class RecordingRepository(_RecordingStatementsMixin, BaseRepository):
     def __init__(self, db_session: Session):
         super().__init__(db_session, RecordingSchema, RecordingTable)
+
+    @traced("find_by_participant")
+    def find_by_participant(
+        self, org_id: str, email: str, limit: int = LIST_DEFAULT_LIMIT, after: str = None
+    ) -> CursorPage:
+        """Newest-first page of the org's recordings that `email` took part in."""
+        try:
+            result = self.db_session.execute(self._participant_statement(org_id, email, limit, after))
+            return self._to_page(self._records(result), limit)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            return None
+
+    @traced("search")
+    def search(self, org_id: str, query: str, limit: int = LIST_DEFAULT_LIMIT, after: str = None) -> SearchPage:
+        """Best-ranked page of the org's recordings whose title or description match `query`."""
+        try:
+            result = self.db_session.execute(self._search_statement(org_id, query, limit, after))
+            return self._to_search_page(list(result.all()), limit)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            return None
+
+
+class AsyncRecordingRepository(_RecordingStatementsMixin, AsyncBaseRepository):
+    def __init__(self, db_session: AsyncSession):
+        super().__init__(db_session, RecordingSchema, RecordingTable)
+
+    @traced("find_by_participant")
+    async def find_by_participant(
+        self, org_id: str, email: str, limit: int = LIST_DEFAULT_LIMIT, after: str = None
+    ) -> CursorPage:
+        """Newest-first page of the org's recordings that `email` took part in."""
+        try:
+            result = await self.db_session.execute(self._participant_statement(org_id, email, limit, after))
+            return self._to_page(self._records(result), limit)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            return None
+
+    @traced("search")
+    async def search(self, org_id: str, query: str, limit: int = LIST_DEFAULT_LIMIT, after: str = None) -> SearchPage:
+        """Best-ranked page of the org's recordings whose title or description match `query`."""
+        try:
+            result = await self.db_session.execute(self._search_statement(org_id, query, limit, after))
+            return self._to_search_page(list(result.all()), limit)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            return None
+
+    @traced("upsert_for_ingestion")
+    async def upsert_for_ingestion(self, data: RecordingSchema, job: JobSchema) -> RecordingSchema:
+        """
+        Upsert `data` and enqueue its ingestion `job` in the same transaction, so a new recording is never left
+        pending without a job. An existing recording keeps its `INGESTION_FIELDS` and gets no new job.
+        """
+        try:
+            rows = self._upsert_rows([data])
+            statement = self._on_conflict_update(
+                insert(RecordingTable).values(rows), [key for key in rows[0] if key not in INGESTION_FIELDS]
+            ).returning(RecordingTable, INSERTED_FLAG)
+            result = await self.db_session.execute(statement, execution_options={"populate_existing": True})
+            db_record, inserted = result.first()
+            if inserted:
+                await self.db_session.execute(AsyncJobRepository._enqueue_statement([job]))
+            await self._notify(data.id)
+            await self.db_session.commit()
+            self._invalidate(data.id)
+            return self.alembic_to_pydantic(db_record)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            await self.db_session.rollback()
+            return None
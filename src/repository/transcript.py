@@ -0,0 +1,157 @@
+import logging
+from typing import AsyncIterator, Iterable, Iterator, List, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src import PROJECT_ENVS
+from src.db import TranscriptChunkTable
+from src.infrastructure.metrics import traced
+from src.repository.base import AsyncBaseRepository, BaseRepository
+from src.schema.transcript import TRANSCRIPT_CHUNK_SECONDS, TranscriptChunkSchema, TranscriptSegment, chunk_transcript
+
+logger = logging.getLogger(__name__)
+
+# chunks fetched per round trip when streaming a transcript, ~25 minutes of a meeting
+TRANSCRIPT_STREAM_BATCH_SIZE = 5
+
+
+class _TranscriptStatementsMixin:
+    def _chunks_statement(self, recording_id: str, start: Optional[float] = None, end: Optional[float] = None):
+        """Chunks of the recording's transcript overlapping the `start` to `end` seconds range, in order."""
+        statement = self._select().where(TranscriptChunkTable.recording_id == recording_id)
+        if start is not None:
+            statement = statement.where(TranscriptChunkTable.end_ms > start * 1000)
+        if end is not None:
+            statement = statement.where(TranscriptChunkTable.start_ms < end * 1000)
+        return statement.order_by(TranscriptChunkTable.seq)
+
+    def _replace_statements(self, recording_id: str, chunks: list[TranscriptChunkSchema]) -> list:
+        statements = [delete(TranscriptChunkTable).where(TranscriptChunkTable.recording_id == recording_id)]
+        if chunks:
+            statements.append(insert(TranscriptChunkTable).values(self._upsert_rows(chunks)))
+        return statements
+
+    @staticmethod
+    def _decode(chunks: Optional[list[TranscriptChunkSchema]], start: Optional[float], end: Optional[float]) -> list:
+        return [segment for chunk in chunks or [] for segment in chunk.decode(start, end)]
+
+
+class TranscriptRepository(_TranscriptStatementsMixin, BaseRepository):
+    def __init__(self, db_session: Session):
+        super().__init__(db_session, TranscriptChunkSchema, TranscriptChunkTable)
+
+    @traced("save")
+    def save(
+        self, recording_id: str, segments: Iterable[TranscriptSegment], chunk_seconds: float = TRANSCRIPT_CHUNK_SECONDS
+    ) -> int:
+        """Replace the transcript of the recording with `segments`, returns the number of chunks written."""
+        chunks = chunk_transcript(recording_id, segments, chunk_seconds)
+        try:
+            for statement in self._replace_statements(recording_id, chunks):
+                self.db_session.execute(statement)
+            self.db_session.commit()
+            return len(chunks)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            self.db_session.rollback()
+            return None
+
+    @traced("segments")
+    def segments(
+        self, recording_id: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> List[TranscriptSegment]:
+        """Segments of the recording's transcript overlapping the `start` to `end` seconds range, all by default."""
+        try:
+            result = self.db_session.execute(self._chunks_statement(recording_id, start, end))
+            return self._decode(self.alembic_to_pydantic(self._records(result)), start, end)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            return None
+
+    def stream_segments(
+        self,
+        recording_id: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        batch_size: int = TRANSCRIPT_STREAM_BATCH_SIZE,
+    ) -> Iterator[List[TranscriptSegment]]:
+        """
+        The segments of `segments`, one chunk at a time, read through a server-side cursor and decoded as they are
+        consumed. Errors are raised, not swallowed.
+        """
+        statement = self._chunks_statement(recording_id, start, end).execution_options(yield_per=batch_size)
+        for partition in self.db_session.execute(statement).partitions():
+            for chunk in self._partition_to_pydantic(partition):
+                if segments := chunk.decode(start, end):
+                    yield segments
+
+
+class AsyncTranscriptRepository(_TranscriptStatementsMixin, AsyncBaseRepository):
+    def __init__(self, db_session: AsyncSession):
+        super().__init__(db_session, TranscriptChunkSchema, TranscriptChunkTable)
+
+    @traced("save")
+    async def save(
+        self, recording_id: str, segments: Iterable[TranscriptSegment], chunk_seconds: float = TRANSCRIPT_CHUNK_SECONDS
+    ) -> int:
+        """Replace the transcript of the recording with `segments`, returns the number of chunks written."""
+        chunks = chunk_transcript(recording_id, segments, chunk_seconds)
+        try:
+            for statement in self._replace_statements(recording_id, chunks):
+                await self.db_session.execute(statement)
+            await self.db_session.commit()
+            return len(chunks)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            await self.db_session.rollback()
+            return None
+
+    @traced("segments")
+    async def segments(
+        self, recording_id: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> List[TranscriptSegment]:
+        """Segments of the recording's transcript overlapping the `start` to `end` seconds range, all by default."""
+        try:
+            result = await self.db_session.execute(self._chunks_statement(recording_id, start, end))
+            return self._decode(self.alembic_to_pydantic(self._records(result)), start, end)
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error occurred: {e}",
+                extra={"error": e},
+                exc_info=PROJECT_ENVS.DEBUG,
+            )
+            return None
+
+    async def stream_segments(
+        self,
+        recording_id: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        batch_size: int = TRANSCRIPT_STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[List[TranscriptSegment]]:
+        """
+        The segments of `segments`, one chunk at a time, read through a server-side cursor and decoded as they are
+        consumed. Errors are raised, not swallowed.
+        """
+        statement = self._chunks_statement(recording_id, start, end).execution_options(yield_per=batch_size)
+        result = await self.db_session.stream(statement)
+        async for partition in result.partitions():
+            for chunk in self._partition_to_pydantic(partition):
+                if segments := chunk.decode(start, end):
+                    yield segments
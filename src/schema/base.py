@@ -1,6 +1,6 @@
 from abc import abstractmethod
 from datetime import datetime
-from typing import Optional
+from typing import Generic, Iterable, Optional, Sequence, TypeVar
 
 from pydantic import BaseModel
 
@@ -17,10 +17,33 @@ class BaseSchema(BaseModel):
         self.set_id()
 
     @abstractmethod
-    def set_id(self):
-        ...
+    def set_id(self): ...
+
+    @classmethod
+    def from_rows(cls, keys: Sequence[str], rows: Iterable[Sequence]) -> list["BaseSchema"]:
+        """
+        Build models from trusted rows of our own database, e.g. SQLAlchemy `Row` tuples of `keys` columns.
+
+        Values are neither validated nor converted and `set_id` is not called: the rows were validated on write and
+        already carry their id. Columns that are not fields of the schema are ignored.
+        """
+        fields = [(index, key) for index, key in enumerate(keys) if key in cls.model_fields]
+        return [cls.model_construct(**{key: row[index] for index, key in fields}) for row in rows]
 
     class Config:
         from_attributes = True
         use_enum_values = True
         extra = "allow"
+
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None
+
+
+class SearchPage(CursorPage[T], Generic[T]):
+    # more documents matched than are ranked, the older matches are left out of every page
+    truncated: bool = False
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+
+from src import PROJECT_ENVS
+from src.constants import Statues
+from src.schema.base import BaseSchema
+
+DEFAULT_QUEUE = "default"
+
+
+class JobSchema(BaseSchema):
+    queue: str = DEFAULT_QUEUE
+    name: str
+    payload: dict = dict()
+    priority: int = 0
+    status: Statues = Statues.PENDING.value
+    attempts: int = 0
+    max_attempts: int = int(PROJECT_ENVS.JOB_MAX_ATTEMPTS)
+    run_at: Optional[datetime] = None
+    locked_by: Optional[str] = None
+    last_error: Optional[str] = None
+
+    def set_id(self):
+        self.id = self.id or str(uuid4())
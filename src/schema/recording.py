@@ -3,6 +3,7 @@ from uuid import NAMESPACE_DNS, uuid5
 
 from pydantic import EmailStr
 
+from src.constants import Statues
 from src.schema.base import BaseSchema
 
 
@@ -13,6 +14,7 @@ class RecordingSchema(BaseSchema):
     title: Optional[str] = None
     description: Optional[str] = None
     participants: Optional[list[EmailStr]] = None
+    status: Statues = Statues.PENDING.value
     video_path: Optional[str] = None
     duration: Optional[float] = None
 
@@ -20,6 +22,13 @@ class RecordingSchema(BaseSchema):
         self.id = str(uuid5(NAMESPACE_DNS, f"{self.org_id}:{self.url}:{self.created_at}"))
 
 
+class RecordingSearchResult(RecordingSchema):
+    rank: float = 0.0
+    # matching fragments of the title and description, terms wrapped in <mark></mark>
+    title_highlight: Optional[str] = None
+    description_highlight: Optional[str] = None
+
+
 if __name__ == "__main__":
     recording = RecordingSchema(
         org_id="org_1",
@@ -30,4 +39,6 @@ if __name__ == "__main__":
     )
     print(recording)
     # Expected output:
-    # id='46122b30-2e4d-5e5a-8fdf-2f662bd5da84' meta={} created_at=None updated_at=None org_id='org_1' url='https://www.google.com' title='Test Recording' description='Test Description' participants=['test@test.com'] video_path=None duration=None
+    # id='46122b30-2e4d-5e5a-8fdf-2f662bd5da84' meta={} created_at=None updated_at=None org_id='org_1'
+    # url='https://www.google.com' title='Test Recording' description='Test Description'
+    # participants=['test@test.com'] status='pending' video_path=None duration=None
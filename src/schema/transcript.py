@@ -0,0 +1,114 @@
+import json
+from typing import Iterable, Optional
+from uuid import NAMESPACE_DNS, uuid5
+
+import zstandard
+from pydantic import BaseModel
+
+from src.schema.base import BaseSchema
+
+# a chunk holds the segments starting within this many seconds of its first one
+TRANSCRIPT_CHUNK_SECONDS = 300
+TRANSCRIPT_ZSTD_LEVEL = 9
+
+
+class TranscriptSegment(BaseModel):
+    speaker: Optional[str] = None
+    # seconds from the start of the recording
+    start: float
+    end: float
+    text: str
+
+
+class TranscriptChunkSchema(BaseSchema):
+    recording_id: str
+    seq: int
+    start_ms: int
+    end_ms: int
+    speakers: list[Optional[str]]
+    segment_speakers: list[int]
+    segment_starts: list[int]
+    segment_ends: list[int]
+    texts: bytes
+
+    def set_id(self):
+        self.id = str(uuid5(NAMESPACE_DNS, f"{self.recording_id}:{self.seq}"))
+
+    @classmethod
+    def encode(cls, recording_id: str, seq: int, segments: list[TranscriptSegment]) -> "TranscriptChunkSchema":
+        speakers = list(dict.fromkeys(segment.speaker for segment in segments))
+        speaker_index = {speaker: index for index, speaker in enumerate(speakers)}
+        starts = [round(segment.start * 1000) for segment in segments]
+        ends = [round(segment.end * 1000) for segment in segments]
+        texts = json.dumps([segment.text for segment in segments], ensure_ascii=False).encode()
+        return cls(
+            recording_id=recording_id,
+            seq=seq,
+            start_ms=starts[0],
+            end_ms=max(ends),
+            speakers=speakers,
+            segment_speakers=[speaker_index[segment.speaker] for segment in segments],
+            segment_starts=starts,
+            segment_ends=ends,
+            texts=zstandard.compress(texts, TRANSCRIPT_ZSTD_LEVEL),
+        )
+
+    def decode(self, start: Optional[float] = None, end: Optional[float] = None) -> list[TranscriptSegment]:
+        """Segments of the chunk overlapping the `start` to `end` seconds range, all of them by default."""
+        start_ms = float("-inf") if start is None else start * 1000
+        end_ms = float("inf") if end is None else end * 1000
+        texts = json.loads(zstandard.decompress(self.texts))
+        return [
+            # written by `encode`, no need to validate them again
+            TranscriptSegment.model_construct(
+                speaker=self.speakers[speaker], start=segment_start / 1000, end=segment_end / 1000, text=text
+            )
+            for speaker, segment_start, segment_end, text in zip(
+                self.segment_speakers, self.segment_starts, self.segment_ends, texts
+            )
+            if segment_end > start_ms and segment_start < end_ms
+        ]
+
+
+def chunk_transcript(
+    recording_id: str, segments: Iterable[TranscriptSegment], chunk_seconds: float = TRANSCRIPT_CHUNK_SECONDS
+) -> list[TranscriptChunkSchema]:
+    """Encode the segments in start order, in chunks spanning `chunk_seconds` from their first segment."""
+    chunks, current = [], []
+    for segment in sorted(segments, key=lambda segment: segment.start):
+        if current and segment.start - current[0].start >= chunk_seconds:
+            chunks.append(TranscriptChunkSchema.encode(recording_id, len(chunks), current))
+            current = []
+        current.append(segment)
+    if current:
+        chunks.append(TranscriptChunkSchema.encode(recording_id, len(chunks), current))
+    return chunks
+
+
+def recallai_segments(transcript: list[dict]) -> list[TranscriptSegment]:
+    """
+    One segment per speaker turn of a Recall.ai transcript, a list of `{"speaker", "words": [{"text", "start_time",
+    "end_time"}]}` (bot transcripts) or `{"participant": {"name"}, "words": [{"text", "start_timestamp":
+    {"relative"}, "end_timestamp": {"relative"}}]}` (recording transcripts).
+    """
+
+    def seconds(word: dict, key: str) -> float:
+        if f"{key}_time" in word:
+            return word[f"{key}_time"]
+        return word[f"{key}_timestamp"]["relative"]
+
+    segments = []
+    for turn in transcript:
+        words = turn.get("words") or []
+        if not words:
+            continue
+        speaker = turn.get("speaker") or (turn.get("participant") or {}).get("name")
+        segments.append(
+            TranscriptSegment(
+                speaker=speaker,
+                start=seconds(words[0], "start"),
+                end=seconds(words[-1], "end"),
+                text=" ".join(word["text"] for word in words),
+            )
+        )
+    return segments
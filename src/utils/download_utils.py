@@ -1,9 +1,12 @@
+import hashlib
+import json
 import os.path
 import signal
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import partial
 from threading import Event
 from typing import List, Optional
+from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 
 from rich.progress import (
@@ -16,13 +19,24 @@ from rich.progress import (
     TransferSpeedColumn,
 )
 
+USER_AGENT = {"User-Agent": "Mozilla/5.0"}
+READ_SIZE = 256 * 1024
+SEGMENT_SIZE = 16 * 1024 * 1024
+SEGMENT_RETRIES = 3
+PROGRESS_SUFFIX = ".progress"
+
+
+class RangeNotSupported(Exception):
+    """The server answered a ranged request with the whole file."""
+
 
 class DownloadUtils:
-    def __init__(self, max_workers: int = 4):
+    def __init__(self, max_workers: int = 4, segment_size: int = SEGMENT_SIZE):
         """Initialize the download manager.
 
         Args:
-            max_workers: Maximum number of concurrent downloads
+            max_workers: Maximum number of concurrent downloads, or of concurrent segments of a ranged download
+            segment_size: Size of the HTTP Range segments of a ranged download
         """
         self.progress = Progress(
             TextColumn("[bold blue]{task.fields[filename]}", justify="right"),
@@ -37,6 +51,7 @@ class DownloadUtils:
         )
         self.done_event = Event()
         self.max_workers = max_workers
+        self.segment_size = segment_size
 
         # Setup signal handler
         signal.signal(signal.SIGINT, self._handle_sigint)
@@ -49,9 +64,10 @@ class DownloadUtils:
         """Download a single file from URL to the specified path."""
         try:
             self.progress.console.log(f"Requesting {url}")
-            request = Request(url, headers={"User-Agent": "Mozilla/5.0"})
+            request = Request(url, headers=USER_AGENT)
             response = urlopen(request)
-            total_size = int(response.info()["Content-Length"])
+            content_length = response.info()["Content-Length"]
+            total_size = int(content_length) if content_length else None
 
             if task_id is not None:
                 self.progress.update(task_id, total=total_size)
@@ -72,14 +88,216 @@ class DownloadUtils:
         except Exception as e:
             self.progress.console.log(f"Failed to download {url}: {e}")
 
-    def download_urls(self, urls: List[str], dest_dir: str) -> None:
+    def _probe(self, url: str) -> tuple[Optional[int], bool, Optional[str]]:
+        """
+        Size, Range support and validator (ETag or Last-Modified) of `url`, from a GET of its first byte: servers
+        refusing HEAD requests, like presigned S3 GET URLs, answer it. No Range support when the probe is refused.
+        """
+        request = Request(url, headers=USER_AGENT | {"Range": "bytes=0-0"})
+        try:
+            with urlopen(request) as response:
+                info = response.info()
+                validator = info["ETag"] or info["Last-Modified"]
+                # `Content-Range: bytes 0-0/<size>`, the size being `*` when unknown
+                total = (info["Content-Range"] or "").rpartition("/")[2]
+                if response.status == 206 and total.isdigit():
+                    return int(total), True, validator
+                content_length = info["Content-Length"]
+                return int(content_length) if content_length and response.status == 200 else None, False, validator
+        except HTTPError as e:
+            self.progress.console.log(f"{url} refused the probe request ({e.code})")
+            return None, False, None
+
+    def _load_progress(self, progress_path: str, url: str, size: int, validator: Optional[str]) -> set[int]:
+        """Segments already written by a previous attempt, if it targeted the same version of the same file."""
+        try:
+            with open(progress_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        expected = {"url": url, "size": size, "validator": validator, "segment_size": self.segment_size}
+        if any(state.get(key) != value for key, value in expected.items()):
+            return set()
+        return set(state.get("done", []))
+
+    @staticmethod
+    def _save_progress(progress_path: str, state: dict) -> None:
+        tmp_path = f"{progress_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, progress_path)
+
+    def _copy_segment(self, url: str, path: str, start: int, end: int, task_id: Optional[TaskID] = None) -> None:
+        """Write bytes `start..end` (inclusive) of `url` at the same offset of the preallocated `path`."""
+        request = Request(url, headers=USER_AGENT | {"Range": f"bytes={start}-{end}"})
+        with urlopen(request) as response, open(path, "r+b") as dest_file:
+            if response.status != 206:
+                raise RangeNotSupported(f"{url} answered {response.status} to a ranged request")
+            dest_file.seek(start)
+            for data in iter(partial(response.read, READ_SIZE), b""):
+                dest_file.write(data)
+                if task_id is not None:
+                    self.progress.update(task_id, advance=len(data))
+                if self.done_event.is_set():
+                    return
+            if dest_file.tell() != end + 1:
+                raise IOError(f"Segment {start}-{end} of {url} ended at {dest_file.tell()}")
+
+    def _copy_segment_with_retries(self, url: str, path: str, start: int, end: int, task_id: Optional[TaskID]) -> None:
+        for attempt in range(1, SEGMENT_RETRIES + 1):
+            try:
+                return self._copy_segment(url, path, start, end, task_id)
+            except RangeNotSupported:
+                raise
+            except Exception as e:
+                if attempt == SEGMENT_RETRIES:
+                    raise
+                self.progress.console.log(f"Retrying segment {start}-{end} of {url} ({attempt}): {e}")
+
+    @staticmethod
+    def _sha256(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for data in iter(partial(f.read, 1024 * 1024), b""):
+                digest.update(data)
+        return digest.hexdigest()
+
+    def _copy_url_verified(
+        self, url: str, path: str, size: Optional[int], sha256: Optional[str], task_id: Optional[TaskID]
+    ) -> bool:
+        self._copy_url(url, path, task_id)
+        if self.done_event.is_set() or not os.path.exists(path):
+            return False
+        if size is not None and os.path.getsize(path) != size:
+            self.progress.console.log(f"{path} is {os.path.getsize(path)} bytes, expected {size}")
+            return False
+        if sha256 is not None and self._sha256(path) != sha256:
+            self.progress.console.log(f"{path} does not match the expected sha256 {sha256}")
+            return False
+        return True
+
+    def _plan(
+        self, url: str, path: str, size: int, validator: Optional[str], task_id: Optional[TaskID]
+    ) -> tuple[list[tuple[int, int]], dict]:
+        """
+        Segments of a ranged download of `url` and its progress state, resumed from the `.progress` sidecar file of a
+        previous attempt, `path` being preallocated otherwise.
+        """
+        segments = [(start, min(start + self.segment_size, size) - 1) for start in range(0, size, self.segment_size)]
+        progress_path = f"{path}{PROGRESS_SUFFIX}"
+        done = self._load_progress(progress_path, url, size, validator)
+        if not done or not os.path.exists(path):
+            done = set()
+            with open(path, "wb") as dest_file:
+                dest_file.truncate(size)
+        state = {
+            "url": url,
+            "size": size,
+            "validator": validator,
+            "segment_size": self.segment_size,
+            "done": sorted(done),
+        }
+        self._save_progress(progress_path, state)
+
+        if task_id is not None:
+            resumed = sum(end - start + 1 for index, (start, end) in enumerate(segments) if index in done)
+            self.progress.update(task_id, total=size, completed=resumed)
+            self.progress.start_task(task_id)
+        if done:
+            self.progress.console.log(f"Resuming {url}: {len(done)}/{len(segments)} segments already downloaded")
+        return segments, state
+
+    def _copy_segments(
+        self, url: str, path: str, segments: list[tuple[int, int]], state: dict, task_id: Optional[TaskID]
+    ) -> bool:
+        """Write the segments not done yet in parallel, recording each one in the progress file. False if cancelled."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(self._copy_segment_with_retries, url, path, start, end, task_id): index
+                for index, (start, end) in enumerate(segments)
+                if index not in state["done"]
+            }
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    if self.done_event.is_set():
+                        return False
+                    state["done"].append(futures[future])
+                    self._save_progress(f"{path}{PROGRESS_SUFFIX}", state)
+            except Exception:
+                # segments not started yet are left for the next attempt
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+        return True
+
+    def _verify(self, path: str, size: int, sha256: Optional[str]) -> None:
+        """Check the size and digest of a ranged download, then drop its progress file."""
+        progress_path = f"{path}{PROGRESS_SUFFIX}"
+        if os.path.getsize(path) != size:
+            raise IOError(f"{path} is {os.path.getsize(path)} bytes, expected {size}")
+        if sha256 is not None and self._sha256(path) != sha256:
+            os.remove(progress_path)
+            raise IOError(f"{path} does not match the expected sha256 {sha256}")
+        os.remove(progress_path)
+
+    def download_url_ranged(
+        self, url: str, path: str, sha256: Optional[str] = None, task_id: Optional[TaskID] = None
+    ) -> bool:
+        """Download `url` to `path` as parallel HTTP Range segments, resuming from the `.progress` sidecar file.
+
+        Falls back to a single stream when the server does not answer ranged requests with the file size.
+
+        Args:
+            url: URL to download
+            path: Destination file, preallocated to the full size
+            sha256: Expected hex digest, checked once every segment is written
+            task_id: Progress task to advance
+
+        Returns:
+            True once the file is complete and verified
+        """
+        size = None
+        try:
+            size, accept_ranges, validator = self._probe(url)
+            if not accept_ranges or not size:
+                self.progress.console.log(f"{url} does not support ranged downloads, using a single stream")
+                return self._copy_url_verified(url, path, size, sha256, task_id)
+
+            segments, state = self._plan(url, path, size, validator, task_id)
+            if not self._copy_segments(url, path, segments, state, task_id):
+                return False
+            self._verify(path, size, sha256)
+            self.progress.console.log(f"Downloaded {path}")
+            return True
+
+        except RangeNotSupported:
+            self.progress.console.log(f"{url} ignored the Range header, using a single stream")
+            if os.path.exists(f"{path}{PROGRESS_SUFFIX}"):
+                os.remove(f"{path}{PROGRESS_SUFFIX}")
+            return self._copy_url_verified(url, path, size, sha256, task_id)
+        except Exception as e:
+            self.progress.console.log(f"Failed to download {url}: {e}")
+            return False
+
+    def download_urls(self, urls: List[str], dest_dir: str, ranged: bool = False) -> None:
         """Download multiple files to the given directory.
 
         Args:
             urls: List of URLs to download
             dest_dir: Destination directory for downloaded files
+            ranged: Download the files one after another, each one as parallel resumable Range segments
         """
         with self.progress:
+            if ranged:
+                for url in urls:
+                    filename = url.split("/")[-1]
+                    task_id = self.progress.add_task("download", filename=filename, start=False)
+                    self.progress.console.log(f"Starting ranged download for {url}")
+                    self.download_url_ranged(url, os.path.join(dest_dir, filename), task_id=task_id)
+                    if self.done_event.is_set():
+                        return
+                return
+
             with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
                 for url in urls:
                     filename = url.split("/")[-1]
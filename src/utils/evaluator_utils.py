@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, Iterable, List, Optional
 
 import numpy as np
 
@@ -100,11 +100,8 @@ class RetrievalEvaluator:
         Returns:
             float: Mean Average Precision score.
         """
-        ap_sum = 0.0
-        for retrieved, relevant in zip(retrievals, relevant_docs):
-            evaluator = RetrievalEvaluator(retrieved, relevant)
-            ap_sum += evaluator.average_precision()
-        return ap_sum / len(retrievals)
+        scores = BatchRetrievalEvaluator(retrievals, relevant_docs).average_precision()
+        return float(scores.mean()) if len(scores) else 0.0
 
     def reciprocal_rank(self) -> float:
         """
@@ -130,11 +127,8 @@ class RetrievalEvaluator:
         Returns:
             float: Mean Reciprocal Rank score.
         """
-        mrr_sum = 0.0
-        for retrieved, relevant in zip(retrievals, relevant_docs):
-            evaluator = RetrievalEvaluator(retrieved, relevant)
-            mrr_sum += evaluator.reciprocal_rank()
-        return mrr_sum / len(retrievals)
+        scores = BatchRetrievalEvaluator(retrievals, relevant_docs).reciprocal_rank()
+        return float(scores.mean()) if len(scores) else 0.0
 
     def dcg(self) -> float:
         """
@@ -143,9 +137,9 @@ class RetrievalEvaluator:
         Returns:
             float: Discounted Cumulative Gain score.
         """
-        gains = [1 if doc in self.relevant_set else 0 for doc in self.retrieved]
-        discounts = [np.log2(i + 2) for i in range(len(self.retrieved))]
-        return sum(g / d for g, d in zip(gains, discounts))
+        gains = np.fromiter((doc in self.relevant_set for doc in self.retrieved), dtype=bool, count=len(self.retrieved))
+        discounts = np.log2(np.arange(2, len(self.retrieved) + 2))
+        return float((gains / discounts).sum())
 
     def idcg(self, k: int) -> float:
         """
@@ -242,3 +236,141 @@ class RetrievalEvaluator:
         if self.num_relevant == 0:
             return 0.0
         return self.precision_at_k(self.num_relevant)
+
+
+class BatchRetrievalEvaluator:
+    """
+    Scores many queries at once, as `RetrievalEvaluator` would score each of them.
+
+    The retrievals are encoded once as a ragged array of relevance flags with per-query offsets, scattered into a
+    padded `(queries, depth)` boolean matrix. Every metric is then a handful of NumPy operations over all queries
+    and all `k` values, instead of a Python loop per query.
+    """
+
+    def __init__(self, retrievals: List[List[str]], relevant_docs: List[List[str]], max_k: Optional[int] = None):
+        """
+        Encode the relevance of every retrieved document.
+
+        Args:
+            retrievals (List[List[str]]): List of lists of retrieved document IDs for multiple queries.
+            relevant_docs (List[List[str]]): List of lists of relevant document IDs for multiple queries.
+            max_k (Optional[int]): Only keep the first `max_k` retrieved documents of each query, defaults to all.
+        """
+        if len(retrievals) != len(relevant_docs):
+            raise ValueError(f"Got {len(retrievals)} retrievals for {len(relevant_docs)} relevant lists")
+
+        lengths = np.fromiter((len(retrieved) for retrieved in retrievals), dtype=np.int64, count=len(retrievals))
+        self.depth = int(lengths.max(initial=0)) if max_k is None else max_k
+        self.lengths = np.minimum(lengths, self.depth)
+        self.num_relevant = np.fromiter((len(relevant) for relevant in relevant_docs), dtype=np.int64)
+
+        # ragged flags: `flags[offsets[q]:offsets[q + 1]]` are the flags of query `q`
+        offsets = np.concatenate(([0], np.cumsum(self.lengths)))
+        flags, first_flags = [], []
+        for retrieved, relevant in zip(retrievals, relevant_docs):
+            relevant_set = set(relevant)
+            top = retrieved[: self.depth]
+            query_flags = [doc in relevant_set for doc in top]
+            flags.extend(query_flags)
+            if len(set(top)) == len(top):
+                first_flags.extend(query_flags)
+            else:
+                # set-based metrics count a document retrieved twice once
+                seen = set()
+                for doc, is_relevant in zip(top, query_flags):
+                    first_flags.append(is_relevant and doc not in seen)
+                    seen.add(doc)
+        flags = np.array(flags, dtype=bool)
+        first_flags = np.array(first_flags, dtype=bool)
+
+        rows = np.repeat(np.arange(len(retrievals)), self.lengths)
+        columns = np.arange(offsets[-1]) - np.repeat(offsets[:-1], self.lengths)
+        self.relevance = np.zeros((len(retrievals), self.depth), dtype=bool)
+        self.relevance[rows, columns] = flags
+        self.first_relevance = np.zeros((len(retrievals), self.depth), dtype=bool)
+        self.first_relevance[rows, columns] = first_flags
+
+        self._unique_hits = np.cumsum(self.first_relevance, axis=1)
+        self._hits = np.cumsum(self.relevance, axis=1)
+        # precision at every relevant rank, the terms summed by average precision
+        self._precision_terms = np.cumsum(
+            np.where(self.relevance, self._hits / np.arange(1, self.depth + 1), 0.0), axis=1
+        )
+
+    @staticmethod
+    def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+    def _at(self, cumulative: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+        """Value of the per-query `cumulative` matrix after `ranks[q]` documents, 0 for a rank of 0."""
+        ranks = np.minimum(ranks, self.depth)
+        values = np.zeros(len(ranks), dtype=cumulative.dtype)
+        mask = ranks > 0
+        values[mask] = cumulative[mask, ranks[mask] - 1]
+        return values
+
+    def _ranks(self, k: int) -> np.ndarray:
+        return np.full(len(self.lengths), k, dtype=np.int64)
+
+    def hit_at_k(self, k: int) -> np.ndarray:
+        """1.0 for the queries with at least one relevant document in the top k, 0.0 otherwise."""
+        return (self._at(self._unique_hits, self._ranks(k)) > 0).astype(float)
+
+    def precision_at_k(self, k: int) -> np.ndarray:
+        return self._divide(self._at(self._unique_hits, self._ranks(k)), np.minimum(self.lengths, k))
+
+    def recall_at_k(self, k: int) -> np.ndarray:
+        return self._divide(self._at(self._unique_hits, self._ranks(k)), self.num_relevant)
+
+    def average_precision_at_k(self, k: int) -> np.ndarray:
+        return self._divide(self._at(self._precision_terms, self._ranks(k)), np.minimum(self.num_relevant, k))
+
+    def average_precision(self) -> np.ndarray:
+        return self._divide(self._at(self._precision_terms, self.lengths), self._at(self._hits, self.lengths))
+
+    def reciprocal_rank(self) -> np.ndarray:
+        if self.depth == 0:
+            return np.zeros(len(self.lengths))
+        first_hit = np.argmax(self.relevance, axis=1)
+        return np.where(self.relevance.any(axis=1), 1.0 / (first_hit + 1), 0.0)
+
+    def ndcg_at_k(self, k: int) -> np.ndarray:
+        """
+        nDCG@k with binary gains, a document retrieved twice earning its gain once.
+
+        Unlike `RetrievalEvaluator.ndcg`, the DCG is also cut at k, so scores stay within [0, 1].
+        """
+        discounts = 1.0 / np.log2(np.arange(2, max(self.depth, k) + 2))
+        dcg = self._at(np.cumsum(self.first_relevance * discounts[: self.depth], axis=1), self._ranks(k))
+        ideal = np.concatenate(([0.0], np.cumsum(discounts)))[np.minimum(self.num_relevant, k)]
+        return self._divide(dcg, ideal)
+
+    def r_precision(self) -> np.ndarray:
+        ranks = np.minimum(self.num_relevant, self.lengths)
+        return self._divide(self._at(self._unique_hits, ranks), ranks)
+
+    def evaluate(self, ks: Iterable[int] = (1, 3, 5, 10)) -> Dict[str, np.ndarray]:
+        """
+        Per-query scores of every metric, for every k.
+
+        Returns:
+            Dict[str, np.ndarray]: Arrays of one score per query, keyed by metric name, e.g. `"ndcg@10"`.
+        """
+        results = {
+            "average_precision": self.average_precision(),
+            "reciprocal_rank": self.reciprocal_rank(),
+            "r_precision": self.r_precision(),
+        }
+        for k in ks:
+            results[f"hit@{k}"] = self.hit_at_k(k)
+            results[f"precision@{k}"] = self.precision_at_k(k)
+            results[f"recall@{k}"] = self.recall_at_k(k)
+            results[f"average_precision@{k}"] = self.average_precision_at_k(k)
+            results[f"ndcg@{k}"] = self.ndcg_at_k(k)
+        return results
+
+    def summarize(self, ks: Iterable[int] = (1, 3, 5, 10)) -> Dict[str, float]:
+        """
+        Mean of every metric over all queries, `"average_precision"` being the MAP and `"reciprocal_rank"` the MRR.
+        """
+        return {name: float(scores.mean()) if len(scores) else 0.0 for name, scores in self.evaluate(ks).items()}
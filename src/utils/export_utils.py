@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import logging
+import zlib
+from typing import AsyncIterator, Awaitable, Callable, List, Type
+
+from pydantic import BaseModel
+
+from src import PROJECT_ENVS
+
+logger = logging.getLogger(__name__)
+
+GZIP_LEVEL = 6
+# gzip container instead of a raw zlib stream
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def ndjson_chunk(models: List[BaseModel]) -> bytes:
+    """One JSON document per line."""
+    return b"".join(model.model_dump_json().encode() + b"\n" for model in models)
+
+
+def csv_header(schema: Type[BaseModel]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(schema.model_fields)
+    return buffer.getvalue().encode()
+
+
+def csv_chunk(models: List[BaseModel]) -> bytes:
+    """CSV rows in the field order of the schema, nested values (lists, dicts) written as JSON."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for model in models:
+        writer.writerow(
+            json.dumps(value) if isinstance(value, (dict, list)) else value
+            for value in model.model_dump(mode="json").values()
+        )
+    return buffer.getvalue().encode()
+
+
+async def export_chunks(
+    batches: AsyncIterator[List[BaseModel]],
+    schema: Type[BaseModel],
+    format: str,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    name: str,
+) -> AsyncIterator[bytes]:
+    """
+    `batches` of `schema` models written as NDJSON or CSV chunks, stopping as soon as `is_disconnected` returns true.
+    `name` labels the logs of the export.
+    """
+    if format == "csv":
+        yield csv_header(schema)
+    exported = 0
+    try:
+        async for batch in batches:
+            if await is_disconnected():
+                logger.info(f"Export of {name} cancelled after {exported} rows")
+                return
+            exported += len(batch)
+            yield csv_chunk(batch) if format == "csv" else ndjson_chunk(batch)
+    except Exception as e:
+        # the status is already sent, aborting the response is the only way to tell the client
+        logger.error(f"Error exporting {name}: {e}", exc_info=PROJECT_ENVS.DEBUG)
+        raise
+    logger.info(f"Exported {exported} rows of {name}")
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = GZIP_LEVEL) -> AsyncIterator[bytes]:
+    """Compress a stream of chunks on the fly, each input chunk is flushed so the client receives data as it comes."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -1,23 +1,68 @@
+import asyncio
 import json
 import os.path
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
 from pathlib import Path
 from threading import Event
+from typing import Callable, Optional
 
 import boto3
 import requests
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from rich.progress import BarColumn, DownloadColumn, Progress, TextColumn, TimeRemainingColumn, TransferSpeedColumn
 
 from src import logging
+from src.utils.video_utils import Mp4DurationProbe
 
 logger = logging.getLogger(__name__)
 
+MB = 1024 * 1024
+TRANSFER_PART_SIZE = 16 * MB
+TRANSFER_MAX_CONCURRENCY = 4
+TRANSFER_MAX_WORKERS = 4
+STREAM_READ_TIMEOUT = 60
+
+
+class TransferCancelled(Exception):
+    """Raised inside a transfer thread once the transfer is cancelled, which aborts the multipart upload."""
+
+
+class _ProbedStream:
+    """Read-only file object over an HTTP stream, counting bytes and feeding an `Mp4DurationProbe` as they pass."""
+
+    def __init__(self, raw, probe: Mp4DurationProbe, is_cancelled: Callable[[], bool]):
+        self.raw = raw
+        self.probe = probe
+        self.is_cancelled = is_cancelled
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if self.is_cancelled():
+            raise TransferCancelled()
+        data = self.raw.read(size)
+        self.size += len(data)
+        if not self.probe.done:
+            self.probe.feed(data)
+        return data
+
 
 class AWSUtils:
-    """Manages AWS operations including S3, Secrets Manager, and SSM Parameter Store."""
+    """
+    Manages AWS operations including S3, Secrets Manager, and SSM Parameter Store.
+
+    S3 transfers run on a bounded thread pool of `max_workers` threads, so awaiting them never blocks the event
+    loop. Each one is a concurrent multipart transfer, stopped by `done_event` or by cancelling the awaiting task.
+    """
 
-    def __init__(self, region: str = "us-east-1", account_id: str = "641949442254"):
+    def __init__(
+        self,
+        region: str = "us-east-1",
+        account_id: str = "641949442254",
+        max_workers: int = TRANSFER_MAX_WORKERS,
+        endpoint_url: Optional[str] = None,
+    ):
         self.region = region
         self.account_id = account_id
         self.progress = Progress(
@@ -32,14 +77,62 @@ class AWSUtils:
             TimeRemainingColumn(),
         )
         self.done_event = Event()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3-transfer")
 
-        # Initialize AWS clients
-        self.s3_client = boto3.client("s3", region_name=self.region)
-        self.s3_resource = boto3.resource("s3", region_name=self.region)
+        # Initialize AWS clients, `endpoint_url` points S3 at a local stand-in (moto server, minio, ...)
+        self.s3_client = boto3.client("s3", region_name=self.region, endpoint_url=endpoint_url)
+        self.s3_resource = boto3.resource("s3", region_name=self.region, endpoint_url=endpoint_url)
         self.ssm_client = boto3.client("ssm", region_name=self.region)
         self.secrets_client = boto3.client("secretsmanager", region_name=self.region)
 
-    async def download_file_s3(self, bucket: str, filename: str, dest_dir: str) -> None:
+    @staticmethod
+    def transfer_config(
+        part_size: int = TRANSFER_PART_SIZE, max_concurrency: int = TRANSFER_MAX_CONCURRENCY
+    ) -> TransferConfig:
+        config = TransferConfig(
+            multipart_threshold=part_size, multipart_chunksize=part_size, max_concurrency=max_concurrency
+        )
+        # bounds the parts read ahead of the upload threads for non-seekable streams
+        config.max_in_memory_upload_chunks = max_concurrency
+        return config
+
+    async def _run_transfer(self, transfer: Callable[[Callable[[], bool]], object]):
+        """
+        Run `transfer(is_cancelled)` on the executor.
+
+        Cancelling the awaiting task flags the transfer as cancelled, so its thread stops at the next chunk instead
+        of running to completion unobserved.
+        """
+        cancelled = Event()
+
+        def is_cancelled() -> bool:
+            return cancelled.is_set() or self.done_event.is_set()
+
+        future = asyncio.get_running_loop().run_in_executor(self.executor, transfer, is_cancelled)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    @staticmethod
+    def _progress_callback(is_cancelled: Callable[[], bool], on_progress: Optional[Callable[[int], None]] = None):
+        def callback(bytes_transferred: int) -> None:
+            if is_cancelled():
+                raise TransferCancelled()
+            if on_progress is not None:
+                on_progress(bytes_transferred)
+
+        return callback
+
+    async def download_file_s3(
+        self,
+        bucket: str,
+        filename: str,
+        dest_dir: str,
+        part_size: int = TRANSFER_PART_SIZE,
+        max_concurrency: int = TRANSFER_MAX_CONCURRENCY,
+    ) -> None:
         """Download a file from S3 to a local file with progress tracking."""
         with self.progress:
             file = filename.split("/")[-1]
@@ -47,44 +140,90 @@ class AWSUtils:
             task_id = self.progress.add_task("download", filename=file, start=False)
             self.progress.console.log(f"Starting download for s3://{bucket}/{filename}")
 
-            try:
-                total_size = self.s3_client.head_object(Bucket=bucket, Key=filename)["ContentLength"]
-                if task_id is not None:
-                    self.progress.update(task_id, total=total_size)
-
-                def download_chunk(bytes_transferred):
-                    if task_id is not None:
-                        self.progress.update(task_id, advance=bytes_transferred)
+            def advance(bytes_transferred: int) -> None:
+                self.progress.update(task_id, advance=bytes_transferred)
 
+            def download(is_cancelled: Callable[[], bool]) -> None:
+                total_size = self.s3_client.head_object(Bucket=bucket, Key=filename)["ContentLength"]
+                self.progress.update(task_id, total=total_size)
                 with open(path, "wb") as dest_file:
-                    if task_id is not None:
-                        self.progress.start_task(task_id)
+                    self.progress.start_task(task_id)
                     self.s3_client.download_fileobj(
                         Bucket=bucket,
                         Key=filename,
                         Fileobj=dest_file,
-                        Callback=download_chunk,
+                        Callback=self._progress_callback(is_cancelled, advance),
+                        Config=self.transfer_config(part_size, max_concurrency),
                     )
-                    if self.done_event.is_set():
-                        return
+
+            try:
+                await self._run_transfer(download)
                 self.progress.console.log(f"Downloaded {path}")
+            except TransferCancelled:
+                self.progress.console.log(f"Cancelled download of s3://{bucket}/{filename}")
             except Exception as e:
                 self.progress.console.log(f"Failed to download s3://{bucket}/{filename}: {e}")
 
-    async def upload_file_s3(self, bucket: str, filename: str, path: str | Path) -> str:
+    async def upload_file_s3(
+        self,
+        bucket: str,
+        filename: str,
+        path: str | Path,
+        part_size: int = TRANSFER_PART_SIZE,
+        max_concurrency: int = TRANSFER_MAX_CONCURRENCY,
+    ) -> str:
         """Upload a local file to S3."""
-        self.s3_resource.meta.client.upload_file(Bucket=bucket, Key=filename, Filename=str(path))
+
+        def upload(is_cancelled: Callable[[], bool]) -> None:
+            self.s3_client.upload_file(
+                Bucket=bucket,
+                Key=filename,
+                Filename=str(path),
+                Callback=self._progress_callback(is_cancelled),
+                Config=self.transfer_config(part_size, max_concurrency),
+            )
+
+        await self._run_transfer(upload)
         return f"s3://{bucket}/{filename}"
 
     async def upload_stream_file_s3(
-        self, bucket: str, filename: str, url: str, content_type: str = "video/mp4"
-    ) -> None:
-        """Upload a file to S3 from a URL stream."""
+        self,
+        bucket: str,
+        filename: str,
+        url: str,
+        content_type: str = "video/mp4",
+        part_size: int = TRANSFER_PART_SIZE,
+        max_concurrency: int = TRANSFER_MAX_CONCURRENCY,
+    ) -> dict:
+        """
+        Stream a file from a URL into S3 with a concurrent multipart upload.
+
+        At most `max_concurrency` parts of `part_size` bytes are held in memory, whatever the file size. Returns the
+        S3 path, the size and, for MP4s, the duration in seconds.
+        """
         logger.info(f"Uploading file:{filename} to s3:{url}")
-        with closing(requests.get(url, stream=True)) as r:
-            self.s3_resource.meta.client.upload_fileobj(
-                r.raw, bucket, filename, ExtraArgs={"ContentType": content_type}
-            )
+
+        def upload(is_cancelled: Callable[[], bool]) -> dict:
+            with closing(requests.get(url, stream=True, timeout=STREAM_READ_TIMEOUT)) as r:
+                r.raise_for_status()
+                r.raw.decode_content = True
+                stream = _ProbedStream(r.raw, Mp4DurationProbe(), is_cancelled)
+                self.s3_client.upload_fileobj(
+                    stream,
+                    bucket,
+                    filename,
+                    ExtraArgs={"ContentType": content_type},
+                    Callback=self._progress_callback(is_cancelled),
+                    Config=self.transfer_config(part_size, max_concurrency),
+                )
+            return {"path": f"s3://{bucket}/{filename}", "size": stream.size, "duration": stream.probe.duration}
+
+        return await self._run_transfer(upload)
+
+    def close(self) -> None:
+        """Stop pending transfers and release the executor threads."""
+        self.done_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
     def get_aws_secret(self, secret_name: str) -> dict:
         """Retrieve a secret from AWS Secrets Manager."""
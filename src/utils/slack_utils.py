@@ -1,5 +1,14 @@
+import atexit
 import json
 import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from queue import Empty, Full, Queue
+from time import monotonic, sleep
+from typing import Optional
 
 import requests
 
@@ -8,30 +17,222 @@ from src.constants import Envs, LogLevels
 
 logger = logging.getLogger(__name__)
 
+SLACK_MAX_QUEUE = 1000
+# Slack allows about one message per second per webhook, with short bursts
+SLACK_RATE = 1.0
+SLACK_BURST = 5
+SLACK_COALESCE_WINDOW = 30.0
+SLACK_TIMEOUT = 10
+SLACK_RETRY_AFTER = 1.0
+SLACK_MAX_RETRY_AFTER = 60.0
+
+
+def retry_after(value: Optional[str]) -> float:
+    """Seconds to wait from a `Retry-After` header, in seconds or an HTTP date, `SLACK_RETRY_AFTER` if invalid."""
+    if not value:
+        return SLACK_RETRY_AFTER
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return SLACK_RETRY_AFTER
+    return min(SLACK_MAX_RETRY_AFTER, max(0.0, seconds))
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second, holding at most `capacity` tokens."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            sleep(wait)
+
+
+@dataclass
+class SlackMetrics:
+    """Counters collected by `SlackNotifier`."""
+
+    enqueued: int = 0
+    sent: int = 0
+    failed: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    spilled: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def incr(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class _Coalesced:
+    message: str
+    level: LogLevels
+    metadata: Optional[dict]
+    help_link: Optional[str]
+    window_end: float
+    count: int = 0
+
 
 class SlackNotifier:
-    def __init__(self, webhook_url: str, default_metadata: dict = None):
+    def __init__(
+        self,
+        webhook_url: str,
+        default_metadata: dict = None,
+        background: bool = True,
+        max_queue: int = SLACK_MAX_QUEUE,
+        rate: float = SLACK_RATE,
+        burst: int = SLACK_BURST,
+        coalesce_window: float = SLACK_COALESCE_WINDOW,
+        spill_path: Optional[Path] = None,
+    ):
         """
         Initialize a generic Slack notifier.
 
+        Messages are posted by a background thread over a persistent HTTP session, at most `rate` per second.
+        The same message posted again within `coalesce_window` seconds is counted instead of sent, and sent once
+        with its occurrence count when the window closes. When the queue is full, messages are appended to
+        `spill_path` as JSON lines, or dropped, but the caller never blocks.
+
         Args:
             webhook_url: Slack webhook URL for sending messages
             default_metadata: Optional default metadata to include in all messages
+            background: Post from a background thread, otherwise on the caller's thread
+            max_queue: Maximum number of messages waiting to be sent
+            rate: Maximum messages per second sent to the webhook
+            burst: Messages that can be sent at once before `rate` applies
+            coalesce_window: Seconds during which duplicates of a message are coalesced
+            spill_path: Optional JSON lines file receiving the messages that do not fit in the queue
         """
         self.webhook_url = webhook_url
         self.default_metadata = default_metadata or {}
+        self.background = background
+        self.coalesce_window = coalesce_window
+        self.spill_path = spill_path
+        self.metrics = SlackMetrics()
+        self.session = requests.Session()
+        self.session.headers["Content-Type"] = "application/json"
+
+        self._bucket = TokenBucket(rate, burst)
+        self._queue: Queue = Queue(maxsize=max_queue)
+        self._recent: dict[tuple, _Coalesced] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # close is registered on the first start only, a restarted notifier must not be closed twice at exit
+        self._atexit_registered = False
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._dispatch, name="slack-notifier", daemon=True)
+                self._thread.start()
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush the pending coalesced counts and queued messages, then stop the background thread."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self.session.close()
+
+    def _dispatch(self) -> None:
+        while True:
+            try:
+                payload = self._queue.get(timeout=min(1.0, self.coalesce_window))
+            except Empty:
+                payload = None
+            try:
+                if payload is not None:
+                    self._bucket.acquire()
+                    self._send_to_slack(payload)
+                self._flush_coalesced(force=self._stopping.is_set())
+            except Exception:
+                # the thread must survive, the messages queued after it would never be sent
+                logger.exception("Slack notifier failed to dispatch a message")
+            if self._stopping.is_set() and self._queue.empty():
+                return
+
+    def _flush_coalesced(self, force: bool = False) -> None:
+        """Queue one summary message for each closed window that saw duplicates."""
+        now = monotonic()
+        with self._lock:
+            closed = [key for key, entry in self._recent.items() if force or entry.window_end <= now]
+            entries = [self._recent.pop(key) for key in closed]
+        for entry in entries:
+            if entry.count:
+                message = f"{entry.message}\n(repeated {entry.count} more times in {self.coalesce_window:.0f}s)"
+                self._enqueue(self._build_payload(message, entry.level, entry.metadata, entry.help_link))
+
+    def _enqueue(self, payload: dict) -> None:
+        try:
+            self._queue.put_nowait(payload)
+            self.metrics.incr("enqueued")
+        except Full:
+            self._spill(payload)
+
+    def _spill(self, payload: dict) -> None:
+        if self.spill_path is None:
+            self.metrics.incr("dropped")
+            logger.warning(f"Slack queue is full, dropping message: {payload['text']}")
+            return
+        try:
+            with self._lock, open(self.spill_path, "a") as f:
+                f.write(json.dumps(payload) + "\n")
+            self.metrics.incr("spilled")
+        except OSError as e:
+            self.metrics.incr("dropped")
+            logger.warning(f"Slack queue is full and spilling failed, dropping message: {e}")
 
     def _send_to_slack(self, payload: dict):
         if PROJECT_ENVS.ENV_STATE == Envs.PROD.value:
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(self.webhook_url, headers=headers, data=json.dumps(payload))
+            try:
+                response = self.session.post(self.webhook_url, data=json.dumps(payload), timeout=SLACK_TIMEOUT)
+                if response.status_code == 429:
+                    sleep(retry_after(response.headers.get("Retry-After")))
+                    response = self.session.post(self.webhook_url, data=json.dumps(payload), timeout=SLACK_TIMEOUT)
+            except requests.RequestException as e:
+                self.metrics.incr("failed")
+                logger.warning(f"Failed to send message to Slack: {e}")
+                return
             if response.status_code == 200:
+                self.metrics.incr("sent")
                 logger.debug("Message sent to Slack successfully.")
             else:
+                self.metrics.incr("failed")
                 logger.warning(
                     f"Failed to send message to Slack. Status code: {response.status_code}, Response: {response.text}"
                 )
         else:
+            self.metrics.incr("sent")
             logger.info(payload)
 
     def post_message(
@@ -42,6 +243,28 @@ class SlackNotifier:
         help_link: str = None,
     ):
         """Post an error message to Slack."""
+        if not self.background:
+            self._send_to_slack(self._build_payload(message, level, metadata, help_link))
+            return
+
+        self._start()
+        key = (message, level, json.dumps(metadata, sort_keys=True, default=str), help_link)
+        with self._lock:
+            entry = self._recent.get(key)
+            if entry is not None:
+                entry.count += 1
+                self.metrics.incr("coalesced")
+                return
+            self._recent[key] = _Coalesced(message, level, metadata, help_link, monotonic() + self.coalesce_window)
+        self._enqueue(self._build_payload(message, level, metadata, help_link))
+
+    def _build_payload(
+        self,
+        message: str,
+        level: LogLevels,
+        metadata: Optional[dict] = None,
+        help_link: Optional[str] = None,
+    ) -> dict:
         combined_metadata = {**self.default_metadata, **(metadata or {})}
         metadata_text = "\n".join(f"*{k}:* {v}" for k, v in combined_metadata.items())
         log_lvl_msg = f":{level.value}: "
@@ -77,11 +300,10 @@ class SlackNotifier:
                 }
             )
 
-        payload = {
+        return {
             "text": message,
             "blocks": blocks,
         }
-        self._send_to_slack(payload)
 
 
 if __name__ == "__main__":
@@ -97,3 +319,4 @@ if __name__ == "__main__":
         level=LogLevels.ERROR,
         help_link="https://example.com/help",
     )
+    notifier.close()
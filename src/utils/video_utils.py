@@ -0,0 +1,92 @@
+import logging
+import struct
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_MOOV_BYTES = 64 * 1024 * 1024
+
+
+class Mp4DurationProbe:
+    """
+    Reads the duration of an MP4 from its `moov/mvhd` box while the file streams by.
+
+    Top-level boxes are skipped as they pass, only the `moov` box is buffered, so the probe works whether the
+    `moov` is at the start (fast start) or the end of the file. `duration` stays None for anything else.
+    """
+
+    def __init__(self, max_moov_bytes: int = MAX_MOOV_BYTES):
+        self.max_moov_bytes = max_moov_bytes
+        self.duration: Optional[float] = None
+        self.done = False
+        self._header = bytearray()
+        self._skip = 0
+        self._moov: Optional[bytearray] = None
+        self._moov_remaining = 0
+
+    def feed(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view and not self.done:
+            if self._skip:
+                size = min(self._skip, len(view))
+                self._skip -= size
+                view = view[size:]
+            elif self._moov is not None:
+                size = min(self._moov_remaining, len(view))
+                self._moov += view[:size]
+                self._moov_remaining -= size
+                view = view[size:]
+                if not self._moov_remaining:
+                    self.duration = self._parse_mvhd(bytes(self._moov))
+                    self.done = True
+            else:
+                view = self._read_header(view)
+
+    def _read_header(self, view: memoryview) -> memoryview:
+        needed = 16 if len(self._header) >= 8 and struct.unpack(">I", self._header[:4])[0] == 1 else 8
+        size = min(needed - len(self._header), len(view))
+        self._header += view[:size]
+        view = view[size:]
+        if len(self._header) < needed:
+            return view
+
+        box_size, box_type = struct.unpack(">I4s", self._header[:8])
+        header_size = 8
+        if box_size == 1 and needed == 8:
+            # 64-bit `largesize` follows the type
+            return view
+        if box_size == 1:
+            box_size = struct.unpack(">Q", self._header[8:16])[0]
+            header_size = 16
+        self._header.clear()
+
+        if box_size < header_size or not box_type.isalnum():
+            # `size == 0` (box runs to end of file) or not an MP4 at all
+            self.done = True
+        elif box_type == b"moov":
+            if box_size - header_size > self.max_moov_bytes:
+                logger.warning(f"MP4 moov box of {box_size} bytes is too large to probe")
+                self.done = True
+            else:
+                self._moov = bytearray()
+                self._moov_remaining = box_size - header_size
+        else:
+            self._skip = box_size - header_size
+        return view
+
+    @staticmethod
+    def _parse_mvhd(moov: bytes) -> Optional[float]:
+        offset = 0
+        while offset + 8 <= len(moov):
+            box_size, box_type = struct.unpack(">I4s", moov[offset : offset + 8])
+            if box_type == b"mvhd":
+                version = moov[offset + 8]
+                if version == 1:
+                    timescale, duration = struct.unpack(">IQ", moov[offset + 28 : offset + 40])
+                else:
+                    timescale, duration = struct.unpack(">II", moov[offset + 20 : offset + 28])
+                return duration / timescale if timescale else None
+            if box_size < 8:
+                return None
+            offset += box_size
+        return None
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils.download_utils import PROGRESS_SUFFIX, DownloadUtils
+
+CONTENT = os.urandom(100_000)
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves `CONTENT`, refusing HEAD like presigned S3 GET URLs, and Range requests unless `ranges` is set."""
+
+    ranges = True
+    requests: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_error(405)
+
+    def do_GET(self):
+        self.requests.append(self.headers["Range"])
+        start, end = 0, len(CONTENT) - 1
+        if self.ranges and self.headers["Range"]:
+            first, _, last = self.headers["Range"].removeprefix("bytes=").partition("-")
+            start, end = int(first), min(int(last), end)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(CONTENT)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(CONTENT[start : end + 1])
+
+
+@contextmanager
+def _serve(ranges: bool):
+    handler = type("Handler", (_Handler,), {"ranges": ranges, "requests": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/video.mp4", handler.requests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_download_url_ranged_without_head(ranges, tmp_path):
+    path = str(tmp_path / "video.mp4")
+    with _serve(ranges) as (url, requests):
+        assert DownloadUtils(segment_size=16_384).download_url_ranged(url, path, sha256=SHA256)
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    assert not os.path.exists(f"{path}{PROGRESS_SUFFIX}")
+    # the probe, then 7 segments or a single stream
+    assert len(requests) == (1 + 7 if ranges else 1 + 1)
+
+
+def test_download_url_ranged_resumes(tmp_path):
+    path = str(tmp_path / "video.mp4")
+    downloader = DownloadUtils(segment_size=16_384)
+    with _serve(ranges=True) as (url, requests):
+        _, state = downloader._plan(url, path, len(CONTENT), '"v1"', None)
+        with open(path, "r+b") as f:
+            f.write(CONTENT[: 3 * 16_384])
+        state["done"] = [0, 1, 2]
+        downloader._save_progress(f"{path}{PROGRESS_SUFFIX}", state)
+
+        assert downloader.download_url_ranged(url, path, sha256=SHA256)
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    # the probe, then the 4 segments left, in any order
+    assert requests[0] == "bytes=0-0"
+    assert sorted(requests[1:], key=lambda header: int(header[6:].partition("-")[0])) == [
+        "bytes=49152-65535",
+        "bytes=65536-81919",
+        "bytes=81920-98303",
+        "bytes=98304-99999",
+    ]
@@ -0,0 +1,100 @@
+import socket
+from contextlib import contextmanager
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from src.infrastructure.email import EmailOutbox, EmailSMTP
+from src.infrastructure.email.base import EmailMessage
+
+
+def _message(index: int) -> EmailMessage:
+    return EmailMessage(
+        subject=f"Recording {index} is ready",
+        from_email="sales@acme.com",
+        to_emails=[f"user_{index}@customer.com"],
+        html="<p>Your recording is ready</p>",
+    )
+
+
+class _Handler:
+    """SMTP stand-in keeping the delivered messages and the session they came on, answering with `responses` first."""
+
+    def __init__(self, *responses: str):
+        self.responses = list(responses)
+        self.delivered: list[tuple[tuple, bytes]] = []
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.responses:
+            return self.responses.pop(0)
+        self.delivered.append((session.peer, envelope.content))
+        return "250 OK"
+
+    @property
+    def sessions(self) -> int:
+        return len({peer for peer, _ in self.delivered})
+
+
+@contextmanager
+def _smtp_server(*responses: str):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = _Handler(*responses)
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        yield EmailSMTP("127.0.0.1", port, username="", password="", use_tls=False, timeout=5), handler
+    finally:
+        controller.stop()
+
+
+def test_send_many_uses_one_session():
+    with _smtp_server() as (transport, handler):
+        assert transport.send_many([_message(index) for index in range(3)]) == [True, True, True]
+    assert len(handler.delivered) == 3
+    assert handler.sessions == 1
+
+
+def test_send_many_continues_after_a_rejected_message():
+    with _smtp_server("550 mailbox unavailable") as (transport, handler):
+        assert transport.send_many([_message(index) for index in range(3)]) == [False, True, True]
+    assert b"user_1@customer.com" in handler.delivered[0][1]
+
+
+def test_outbox_delivers_over_pooled_sessions():
+    with _smtp_server() as (transport, handler):
+        outbox = EmailOutbox(transport, workers=2).start()
+        assert outbox.send_many([_message(index) for index in range(20)]) == 20
+        outbox.stop(timeout=10)
+    assert len(handler.delivered) == 20
+    # each worker opened at most one session for all of its messages
+    assert handler.sessions <= 2
+    assert outbox.stats() == {
+        "enqueued": 20,
+        "dropped": 0,
+        "sent": 20,
+        "failed": 0,
+        "retries": 0,
+        "connections": handler.sessions,
+        "queue_depth": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "response, sent, retries, failed",
+    [("451 try again later", 1, 1, 0), ("550 mailbox unavailable", 0, 0, 1)],
+)
+def test_outbox_retries_transient_errors_only(response, sent, retries, failed):
+    with _smtp_server(response) as (transport, handler):
+        outbox = EmailOutbox(transport, workers=1, backoff=0.0).start()
+        assert outbox.send(_message(0))
+        outbox.stop(timeout=10)
+    assert len(handler.delivered) == sent
+    assert (outbox.metrics.sent, outbox.metrics.retries, outbox.metrics.failed) == (sent, retries, failed)
+
+
+def test_outbox_drops_messages_when_full():
+    outbox = EmailOutbox(EmailSMTP("127.0.0.1", 1, username="", password="", use_tls=False), max_queue=1)
+    assert outbox.send_many([_message(0), _message(1)]) == 1
+    assert (outbox.metrics.enqueued, outbox.metrics.dropped, outbox.queue_depth) == (1, 1, 1)
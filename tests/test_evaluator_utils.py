@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.utils.evaluator_utils import BatchRetrievalEvaluator, RetrievalEvaluator
+
+KS = (1, 3, 5, 10)
+
+
+def loop_scores(retrievals, relevant_docs):
+    """The metrics `BatchRetrievalEvaluator` vectorizes, computed by `RetrievalEvaluator` one query at a time."""
+    scores = {"average_precision": [], "reciprocal_rank": [], "r_precision": []}
+    for retrieved, relevant in zip(retrievals, relevant_docs):
+        evaluator = RetrievalEvaluator(retrieved, relevant)
+        scores["average_precision"].append(evaluator.average_precision())
+        scores["reciprocal_rank"].append(evaluator.reciprocal_rank())
+        scores["r_precision"].append(evaluator.r_precision())
+        for k in KS:
+            scores.setdefault(f"precision@{k}", []).append(evaluator.precision_at_k(k))
+            scores.setdefault(f"recall@{k}", []).append(evaluator.recall_at_k(k))
+            scores.setdefault(f"average_precision@{k}", []).append(evaluator.average_precision_at_k(k))
+    return scores
+
+
+def random_retrievals(seed, n_queries=200, corpus=50):
+    rng = np.random.default_rng(seed)
+    retrievals = [[f"doc_{i}" for i in rng.choice(corpus, rng.integers(0, 15))] for _ in range(n_queries)]
+    relevant_docs = [[f"doc_{i}" for i in rng.choice(corpus, rng.integers(0, 10), replace=False)] for _ in retrievals]
+    return retrievals, relevant_docs
+
+
+@pytest.mark.parametrize(
+    "retrievals, relevant_docs",
+    [
+        random_retrievals(0),
+        random_retrievals(1),
+        ([[]], [["a"]]),
+        ([[], []], [[], ["a", "b"]]),
+        ([["a", "b"], []], [["b"], ["a"]]),
+        ([["a"]], [[]]),
+    ],
+)
+def test_batch_evaluator_matches_retrieval_evaluator(retrievals, relevant_docs):
+    batch_scores = BatchRetrievalEvaluator(retrievals, relevant_docs).evaluate(KS)
+    for name, scores in loop_scores(retrievals, relevant_docs).items():
+        np.testing.assert_allclose(batch_scores[name], scores, err_msg=name)
+
+
+def test_mean_metrics_of_empty_retrievals():
+    assert RetrievalEvaluator.mean_reciprocal_rank([[]], [["a"]]) == 0.0
+    assert RetrievalEvaluator.mean_average_precision([[]], [["a"]]) == 0.0
+    assert RetrievalEvaluator.mean_reciprocal_rank([], []) == 0.0
+    assert RetrievalEvaluator.mean_average_precision([], []) == 0.0
+    assert BatchRetrievalEvaluator([], []).summarize(KS)["reciprocal_rank"] == 0.0
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.infrastructure.metrics import InMemoryMetricsSink, Instrumentation, fingerprint
+from src.infrastructure.metrics.instrumentation import (
+    COMMIT_DURATION,
+    QUERY_DURATION,
+    REPOSITORY_DURATION,
+    SLOW_QUERIES,
+)
+
+
+@pytest.fixture
+def sink():
+    return InMemoryMetricsSink()
+
+
+@pytest.fixture
+def instrumentation(sink):
+    instrumentation = Instrumentation(sink=sink, slow_query_ms=60_000)
+    yield instrumentation
+    # the session listeners are global, they must not outlive the test
+    for name, listener in [
+        ("before_commit", instrumentation._before_commit),
+        ("after_commit", instrumentation._after_commit),
+        ("after_soft_rollback", instrumentation._after_soft_rollback),
+    ]:
+        if event.contains(Session, name, listener):
+            event.remove(Session, name, listener)
+
+
+@pytest.fixture
+def engine(instrumentation):
+    engine = sa.create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(sa.text("CREATE TABLE deal (id TEXT PRIMARY KEY, name TEXT)"))
+    instrumentation.instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+def _repository(instrumentation: Instrumentation, engine):
+    """A repository in the style of `BaseRepository`, which logs and swallows database errors."""
+
+    class DealRepository:
+        model_table = SimpleNamespace(__tablename__="deal")
+
+        def __init__(self):
+            self.db_session = Session(engine)
+
+        @instrumentation.traced("create")
+        def create(self, deal_id: str):
+            self.db_session.execute(sa.text("INSERT INTO deal VALUES (:id, 'Deal')"), {"id": deal_id})
+            self.db_session.commit()
+
+        @instrumentation.traced("get")
+        def get(self, deal_id: str):
+            try:
+                return self.db_session.execute(sa.text("SELECT name FROM dael WHERE id = :id"), {"id": deal_id})
+            except SQLAlchemyError:
+                self.db_session.rollback()
+                return None
+
+        @instrumentation.traced("list")
+        async def list(self):
+            raise RuntimeError("connection lost")
+
+    return DealRepository()
+
+
+def test_traced_call_records_repository_query_and_commit_timings(sink, instrumentation, engine):
+    _repository(instrumentation, engine).create("deal_1")
+    assert len(sink.values(REPOSITORY_DURATION, "table:deal", "operation:create", "outcome:ok")) == 1
+    assert len(sink.values(QUERY_DURATION, "table:deal", "operation:create", "statement:insert", "outcome:ok")) == 1
+    assert len(sink.values(COMMIT_DURATION, "table:deal", "operation:create", "outcome:ok")) == 1
+    assert all(value >= 0 for value in sink.values(REPOSITORY_DURATION))
+
+
+def test_swallowed_database_error_is_an_error_outcome(sink, instrumentation, engine):
+    assert _repository(instrumentation, engine).get("deal_1") is None
+    assert len(sink.values(REPOSITORY_DURATION, "table:deal", "operation:get", "outcome:error")) == 1
+    assert len(sink.values(QUERY_DURATION, "operation:get", "statement:select", "outcome:error")) == 1
+
+
+def test_async_call_raising_is_an_error_outcome(sink, instrumentation, engine):
+    with pytest.raises(RuntimeError):
+        asyncio.run(_repository(instrumentation, engine).list())
+    assert len(sink.values(REPOSITORY_DURATION, "table:deal", "operation:list", "outcome:error")) == 1
+
+
+def test_slow_query_logs_its_fingerprint(sink, instrumentation, engine, caplog):
+    instrumentation.slow_query_ms = 0
+    with caplog.at_level(logging.WARNING, logger="src.infrastructure.metrics.instrumentation"):
+        _repository(instrumentation, engine).create("deal_1")
+    assert sink.values(SLOW_QUERIES, "table:deal", "operation:create") == [1]
+    [record] = [record for record in caplog.records if record.message.startswith("Slow query")]
+    assert record.query == "INSERT INTO deal VALUES (...)"
+    assert (record.parameters, record.table, record.operation) == (1, "deal", "create")
+
+
+def test_fingerprint_collapses_values():
+    assert fingerprint("INSERT INTO org (id, name) VALUES (%(id_m0)s, %(name_m0)s), (%(id_m1)s, %(name_m1)s)") == (
+        "INSERT INTO org (id, name) VALUES (...)"
+    )
+    assert fingerprint("SELECT * FROM deal WHERE id = $1::VARCHAR AND amount > 10") == (
+        "SELECT * FROM deal WHERE id = ? AND amount > ?"
+    )
@@ -0,0 +1,81 @@
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.infrastructure.email import _mailgun
+from src.infrastructure.email._mailgun import EmailMailgun
+from src.infrastructure.email.base import EmailMessage
+
+MESSAGE = EmailMessage(subject="Hello", from_email="sales@acme.com", to_emails=["lead@customer.com"], html="<p>Hi</p>")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Mailgun stand-in answering the messages endpoint with the next of `responses`, a status or a delay."""
+
+    responses: list = []
+    bodies: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.bodies.append(self.rfile.read(int(self.headers["Content-Length"])))
+        response = self.responses.pop(0) if self.responses else 200
+        if isinstance(response, float):
+            time.sleep(response)
+            response = 200
+        body = b'{"id": "<message@acme.com>", "message": "Queued. Thank you."}'
+        self.send_response(response)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(_mailgun, "MAILGUN_BACKOFF", 0.0)
+
+
+@contextmanager
+def _mailgun_server(*responses):
+    handler = type("Handler", (_Handler,), {"responses": list(responses), "bodies": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        mailgun = EmailMailgun("key", "acme.com", api_url=f"http://127.0.0.1:{server.server_port}/v3", timeout=0.5)
+        yield mailgun, handler.bodies
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_send_email_retries_rate_limits():
+    with _mailgun_server(429, 429) as (mailgun, bodies):
+        assert mailgun.send_email(MESSAGE)
+    assert len(bodies) == 3
+    assert b"lead@customer.com" in bodies[-1]
+
+
+def test_send_email_does_not_retry_server_errors():
+    with _mailgun_server(500) as (mailgun, bodies):
+        assert not mailgun.send_email(MESSAGE)
+    assert len(bodies) == 1
+
+
+def test_send_email_does_not_retry_read_timeouts():
+    # the message reached Mailgun, sending it again could deliver it twice
+    with _mailgun_server(1.0) as (mailgun, bodies):
+        assert not mailgun.send_email(MESSAGE)
+    assert len(bodies) == 1
+
+
+def test_send_email_retries_connection_errors(caplog):
+    with _mailgun_server() as (mailgun, _):
+        pass
+    # the server is closed, nothing listens on its port any more
+    assert not mailgun.send_email(MESSAGE)
+    assert sum("Retrying Mailgun request" in record.message for record in caplog.records) == mailgun.max_retries
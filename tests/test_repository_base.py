@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from src.repository.base import INSERTED_FLAG, MAX_BIND_PARAMETERS
+from src.repository.deal import AsyncDealRepository
+from src.repository.org import AsyncOrgRepository
+from src.repository.user import AsyncUserRepository
+from src.schema.deal import DealSchema
+from src.schema.org import OrgSchema
+from src.schema.user import UserSchema
+
+
+def _bind_parameters(repository, rows: list[dict]) -> int:
+    return len(repository._upsert_statement(rows).returning(INSERTED_FLAG).compile(dialect=asyncpg.dialect()).params)
+
+
+@pytest.mark.parametrize(
+    "repository, model",
+    [
+        (AsyncUserRepository(None), lambda i: UserSchema(id=f"user_{i}", org_id="acme", email=f"user_{i}@acme.com")),
+        (AsyncDealRepository(None), lambda i: DealSchema(id=f"deal_{i}", org_id="acme", name=f"Deal {i}")),
+        (AsyncOrgRepository(None), lambda i: OrgSchema(id=f"org_{i}", name=f"Org {i}", domain=f"org{i}.com")),
+    ],
+)
+def test_upsert_chunk_fits_the_bind_parameter_limit(repository, model):
+    chunk_size = repository._upsert_chunk_size(5_000)
+    assert chunk_size < 5_000
+    rows = repository._upsert_rows([model(i) for i in range(chunk_size + 1)])
+    assert len(rows) == chunk_size + 1
+    assert _bind_parameters(repository, rows[:chunk_size]) <= MAX_BIND_PARAMETERS
+    # one more row would be refused by asyncpg
+    assert _bind_parameters(repository, rows) > MAX_BIND_PARAMETERS
+
+
+def test_upsert_chunk_size_keeps_smaller_chunks():
+    assert AsyncUserRepository(None)._upsert_chunk_size(100) == 100
+    assert AsyncUserRepository(None)._upsert_chunk_size(1) == 1
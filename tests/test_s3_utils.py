@@ -0,0 +1,100 @@
+import asyncio
+import os
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.utils.s3_utils import MB, AWSUtils, TransferCancelled
+
+BUCKET = "recordings"
+# the smallest part S3 accepts, the content spans 3 parts
+PART_SIZE = 5 * MB
+CONTENT = os.urandom(2 * PART_SIZE + 1024)
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        aws = AWSUtils()
+        yield aws
+        aws.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(CONTENT)))
+        self.end_headers()
+        self.wfile.write(CONTENT)
+
+
+@contextmanager
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/video.bin"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _parts(aws: AWSUtils, key: str) -> int:
+    return aws.s3_client.head_object(Bucket=BUCKET, Key=key, PartNumber=1).get("PartsCount", 1)
+
+
+def test_upload_and_download_multipart(aws, tmp_path):
+    source = tmp_path / "video.bin"
+    source.write_bytes(CONTENT)
+    path = asyncio.run(aws.upload_file_s3(BUCKET, "org_1/video.bin", source, part_size=PART_SIZE))
+    assert path == f"s3://{BUCKET}/org_1/video.bin"
+    assert _parts(aws, "org_1/video.bin") == 3
+
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    asyncio.run(aws.download_file_s3(BUCKET, "org_1/video.bin", str(dest), part_size=PART_SIZE))
+    assert (dest / "video.bin").read_bytes() == CONTENT
+
+
+def test_upload_stream_does_not_block_the_event_loop(aws):
+    async def main() -> tuple[dict, int]:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticker = asyncio.create_task(tick())
+        with _serve() as url:
+            uploaded = await aws.upload_stream_file_s3(BUCKET, "org_1/stream.bin", url, part_size=PART_SIZE)
+        ticker.cancel()
+        return uploaded, ticks
+
+    uploaded, ticks = asyncio.run(main())
+    assert uploaded == {"path": f"s3://{BUCKET}/org_1/stream.bin", "size": len(CONTENT), "duration": None}
+    assert aws.s3_client.get_object(Bucket=BUCKET, Key="org_1/stream.bin")["Body"].read() == CONTENT
+    # the loop kept running while the transfer was on the executor
+    assert ticks > 1
+
+
+def test_upload_cancelled_by_done_event(aws, tmp_path):
+    source = tmp_path / "video.bin"
+    source.write_bytes(CONTENT)
+    aws.done_event.set()
+    with pytest.raises(TransferCancelled):
+        asyncio.run(aws.upload_file_s3(BUCKET, "org_1/video.bin", source, part_size=PART_SIZE))
+    assert aws.s3_client.list_objects_v2(Bucket=BUCKET).get("KeyCount") == 0
+    # the aborted multipart upload leaves no parts behind
+    assert not aws.s3_client.list_multipart_uploads(Bucket=BUCKET).get("Uploads")